@@ -4,6 +4,8 @@ from fastapi.security import HTTPBasic, HTTPBasicCredentials, APIKeyHeader
 from app.config import API_KEY, USER_CREDENTIALS
 from typing import Optional
 
+from app.server_timing import current_timings
+
 # If you want to hash passwords, you can install passlib and do:
 # from passlib.context import CryptContext
 # pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -18,6 +20,17 @@ def get_current_user(
     api_key: Optional[str] = Depends(api_key_header),
     credentials: Optional[HTTPBasicCredentials] = Depends(security_basic),
 ):
+    timings = current_timings()
+    if timings is None:
+        return _authenticate(api_key, credentials)
+    # FastAPI reads and decodes the request body before resolving dependencies
+    timings.mark("request")
+    try:
+        return _authenticate(api_key, credentials)
+    finally:
+        timings.mark("auth")
+
+def _authenticate(api_key: Optional[str], credentials: Optional[HTTPBasicCredentials]) -> dict:
     # 1) If an API key is provided, validate it.
     if api_key:
         if api_key == API_KEY:
@@ -45,4 +58,13 @@ def get_current_user(
             headers={"WWW-Authenticate": "Basic"},
         )
     
-    return {"username": credentials.username, "role": user_data["role"]}
\ No newline at end of file
+    return {"username": credentials.username, "role": user_data["role"]}
+
+def require_admin(user: dict = Depends(get_current_user)) -> dict:
+    """Dependency for admin-only endpoints."""
+    if user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin role required",
+        )
+    return user
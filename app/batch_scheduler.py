@@ -0,0 +1,82 @@
+# app/batch_scheduler.py
+# Schedules many orders against one config snapshot and one "now" instant.
+# Shared per-snapshot work (keyword automata, product match cache, hub rule engine, calendars)
+# is reused across every item; failures are reported per item instead of failing the batch.
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from pydantic import ValidationError
+
+from app import process_backend
+from app.config_snapshot import ConfigSnapshot, get_config_snapshot
+from app.models import ScheduleRequest
+from app.schedule_logic import process_order
+from app.serialization import response_content
+from app.server_timing import mark, note_config
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_BATCH_MAX_ITEMS = int(os.getenv("SCHEDULE_BATCH_MAX_ITEMS", "10000"))
+
+
+def schedule_item(index: int, item: Any, snapshot: ConfigSnapshot, now: datetime) -> Dict[str, Any]:
+    """
+    Validate and schedule one raw order. Returns a ScheduleBatchItem-shaped dict
+    (index, orderId, result, error) with the result already converted to plain JSON types.
+    """
+    order_id = item.get("orderId") if isinstance(item, dict) else None
+    try:
+        req = ScheduleRequest.parse_obj(item)
+    except ValidationError as e:
+        return {"index": index, "orderId": order_id, "result": None, "error": f"Invalid order: {e}"}
+    finally:
+        mark("validate")
+    try:
+        result = process_order(req, snapshot=snapshot, now=now)
+    except Exception as e:
+        logger.error("Error processing batch item %s (OrderID: %s): %s", index, order_id or 'N/A', e)
+        return {"index": index, "orderId": order_id, "result": None, "error": str(e)}
+    if not result:
+        return {"index": index, "orderId": order_id, "result": None, "error": "Unable to schedule order."}
+    return {"index": index, "orderId": order_id, "result": response_content(result), "error": None}
+
+
+def iter_schedule(items: Iterable[Any], snapshot: ConfigSnapshot, now: datetime, start_index: int = 0) -> Iterator[Dict[str, Any]]:
+    for offset, item in enumerate(items):
+        yield schedule_item(start_index + offset, item, snapshot, now)
+
+
+def schedule_items(items: List[Any], start_index: int, snapshot: ConfigSnapshot, now: datetime) -> List[Dict[str, Any]]:
+    """Chunk function for the process pool (and the in-process path)."""
+    return list(iter_schedule(items, snapshot, now, start_index))
+
+
+def _schedule_all(items: List[Any], snapshot: ConfigSnapshot, now: datetime) -> List[Dict[str, Any]]:
+    pool = process_backend.scheduling_pool
+    # Batches that fit in one chunk are not worth the round trip to a worker
+    if pool is not None and len(items) > process_backend.SCHEDULE_PROCESS_CHUNK_ITEMS:
+        with pool.lease(snapshot) as lease:
+            if lease is not None:
+                return [result for chunk in lease.map_chunks(schedule_items, items, now) for result in chunk]
+    return schedule_items(items, 0, snapshot, now)
+
+
+def schedule_batch(items: Iterable[Any], snapshot: Optional[ConfigSnapshot] = None, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Schedule every order in `items`; returns a ScheduleBatchResponse-shaped dict."""
+    if snapshot is None:
+        snapshot = get_config_snapshot()
+    note_config(snapshot)
+    if now is None:
+        now = datetime.now(timezone.utc)
+    results = _schedule_all(list(items), snapshot, now)
+    failed = sum(1 for r in results if r["error"] is not None)
+    logger.info("Batch scheduled %s orders against config version %s (%s failed)", len(results), snapshot.version, failed)
+    return {
+        "configVersion": snapshot.version,
+        "processedAt": now.isoformat(),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
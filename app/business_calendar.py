@@ -0,0 +1,157 @@
+# app/business_calendar.py
+# Per-hub business-day calendars compiled from cmyk_hubs.json Closed_Dates plus weekends.
+# Within a rolling horizon around today, "adjust start forward" and "add N business days"
+# are array lookups instead of a day-by-day walk with string comparisons.
+import logging
+import os
+import threading
+from array import array
+from datetime import date, timedelta
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from app.config_snapshot import ConfigSnapshot, register_index
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_HORIZON_YEARS = int(os.getenv("CALENDAR_HORIZON_YEARS", "3"))
+
+
+def parse_closed_dates(closed_dates: Iterable) -> FrozenSet[date]:
+    """
+    Closed dates that `str(day) in closed_dates` could ever match: only exact 'YYYY-MM-DD'
+    strings. Anything else is ignored, exactly as the string comparison ignores it.
+    """
+    parsed = set()
+    for value in closed_dates:
+        if not isinstance(value, str):
+            continue
+        try:
+            day = date.fromisoformat(value)
+        except ValueError:
+            continue
+        if str(day) == value:
+            parsed.add(day)
+    return frozenset(parsed)
+
+
+class BusinessCalendar:
+    """
+    Business days (Mon-Fri, not closed) for one hub.
+    For every day in [start, end) the calendar stores the next business day on or after it and,
+    for business days, their rank; a sorted list of business-day ordinals then turns
+    "add N business days" into an index offset. Dates outside the horizon use the day-by-day walk.
+    """
+
+    def __init__(self, closed_dates: Iterable, start: date, end: date):
+        self.closed = parse_closed_dates(closed_dates)
+        self.start_ordinal = start.toordinal()
+        self.end_ordinal = end.toordinal()
+
+        span = self.end_ordinal - self.start_ordinal
+        self._business_ordinals = array("l")
+        self._rank = array("l", [-1]) * span           # position in _business_ordinals, or -1
+        self._next_business = array("l", [-1]) * span  # offset of next business day on/after, or -1
+        for offset in range(span):
+            ordinal = self.start_ordinal + offset
+            if self._is_business_day(date.fromordinal(ordinal)):
+                self._rank[offset] = len(self._business_ordinals)
+                self._business_ordinals.append(ordinal)
+        next_offset = -1
+        for offset in range(span - 1, -1, -1):
+            if self._rank[offset] >= 0:
+                next_offset = offset
+            self._next_business[offset] = next_offset
+
+    def _is_business_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self.closed
+
+    def is_business_day(self, day: date) -> bool:
+        return self._is_business_day(day)
+
+    def _walk(self, start_date: date, days_to_add: int) -> Tuple[date, date]:
+        current_date = start_date
+        while not self._is_business_day(current_date):
+            current_date += timedelta(days=1)
+        adjusted_start_date = current_date
+        if days_to_add <= 0:
+            return adjusted_start_date, adjusted_start_date
+        days_counted = 0
+        while days_counted < days_to_add:
+            current_date += timedelta(days=1)
+            if self._is_business_day(current_date):
+                days_counted += 1
+        return adjusted_start_date, current_date
+
+    def add_business_days(self, start_date: date, days_to_add: int) -> Tuple[date, date]:
+        """
+        Same result as schedule_logic.add_business_days: the first business day on or after
+        start_date, and the date days_to_add business days after it.
+        """
+        offset = start_date.toordinal() - self.start_ordinal
+        if 0 <= offset < len(self._next_business):
+            next_offset = self._next_business[offset]
+            if next_offset >= 0:
+                adjusted_start_date = date.fromordinal(self.start_ordinal + next_offset)
+                if days_to_add <= 0:
+                    return adjusted_start_date, adjusted_start_date
+                position = self._rank[next_offset] + days_to_add
+                if position < len(self._business_ordinals):
+                    return adjusted_start_date, date.fromordinal(self._business_ordinals[position])
+        logger.debug("[BusinessCalendar] %s + %s outside calendar horizon; walking day by day", start_date, days_to_add)
+        return self._walk(start_date, days_to_add)
+
+
+class HubCalendars:
+    """
+    BusinessCalendars for every hub in cmyk_hubs.json, keyed like get_closed_dates_for_state.
+    The horizon rolls: once today is more than a quarter of the way past the build date,
+    the calendars are rebuilt around the new date on the next lookup.
+    """
+
+    def __init__(self, cmyk_hubs: List[Dict], today: Optional[date] = None):
+        self.exact = True
+        self._closed_by_hub: Dict[str, list] = {}
+        for entry in cmyk_hubs:
+            hub = entry.get("Hub")
+            if not isinstance(hub, str):
+                self.exact = False
+                continue
+            # First entry wins, as in the linear scan
+            self._closed_by_hub.setdefault(hub.lower(), entry.get("Closed_Dates", []))
+        self._lock = threading.Lock()
+        self._build(today or date.today())
+
+    def _build(self, today: date) -> None:
+        start = today - timedelta(days=366)
+        end = today + timedelta(days=366 * CALENDAR_HORIZON_YEARS)
+        calendars: Dict[str, Optional[BusinessCalendar]] = {}
+        for hub, closed_dates in self._closed_by_hub.items():
+            # Non-list Closed_Dates behave differently under `in`; leave those to the caller's fallback
+            calendars[hub] = BusinessCalendar(closed_dates, start, end) if isinstance(closed_dates, list) else None
+        # Published together so readers never see calendars from two horizons
+        self._state = (calendars, BusinessCalendar([], start, end), today + timedelta(days=92 * CALENDAR_HORIZON_YEARS))
+        logger.debug("Built business calendars for %s hubs (%s to %s)", len(calendars), start, end)
+
+    def get(self, chosen_hub: str, today: Optional[date] = None) -> Optional[BusinessCalendar]:
+        """
+        Calendar for `chosen_hub`, or None when only the original closed-date scan can answer
+        exactly. Matching is case-sensitive on chosen_hub, as in get_closed_dates_for_state.
+        """
+        if not self.exact:
+            return None
+        today = today or date.today()
+        if today > self._state[2]:
+            with self._lock:
+                if today > self._state[2]:
+                    self._build(today)
+        calendars, no_closures, _ = self._state
+        if chosen_hub in calendars:
+            return calendars[chosen_hub]
+        return no_closures
+
+
+def get_business_calendar(snapshot: ConfigSnapshot, chosen_hub: str) -> Optional[BusinessCalendar]:
+    return snapshot.index("business_calendars").get(chosen_hub)
+
+
+register_index("business_calendars", lambda snapshot: HubCalendars(snapshot.cmyk_hubs))
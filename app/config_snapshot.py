@@ -0,0 +1,170 @@
+# app/config_snapshot.py
+# Immutable bundle of every configuration file plus the indexes derived from them.
+# A request grabs one snapshot up front and passes it down, so a save from the admin UI
+# mid-request can never mix two config generations into one response.
+import logging
+import threading
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, List, Optional
+
+from app import data_manager
+
+logger = logging.getLogger(__name__)
+
+# name -> builder(snapshot). Modules register the structures they derive from raw config
+# at import time; every new snapshot builds all of them before it is published.
+_index_builders: Dict[str, Callable[["ConfigSnapshot"], Any]] = {}
+
+
+def register_index(name: str, builder: Callable[["ConfigSnapshot"], Any]) -> None:
+    """
+    Register a derived structure that is built once per config snapshot.
+    Builders may call snapshot.index() for other registered structures.
+    """
+    _index_builders[name] = builder
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    All ten configuration files at a single config version.
+    The raw data is shared with the data_manager cache and must not be mutated.
+    Optional rule files that failed to load are None; their consumers fall back to defaults.
+    """
+    version: int
+    cmyk_hubs: List[Dict]
+    hub_data: List[Dict]
+    product_info: Dict[str, Dict]
+    product_keywords: List[Dict]
+    production_groups: List[Dict]
+    hub_rules: Dict
+    finishing_rules: Optional[Dict]
+    imposing_rules: Optional[List[Dict]]
+    preflight_rules: Optional[List[Dict]]
+    preflight_profiles: Optional[List[Dict]]
+    _indexes: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _index_errors: Dict[str, Exception] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _index_lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False, compare=False)
+
+    def index(self, name: str) -> Any:
+        """Return the derived structure registered under `name`, building it on first use."""
+        try:
+            return self._indexes[name]
+        except KeyError:
+            pass
+        error = self._index_errors.get(name)
+        if error is not None:
+            raise error
+        with self._index_lock:
+            if name not in self._indexes:
+                self._build_index(name)
+        error = self._index_errors.get(name)
+        if error is not None:
+            raise error
+        return self._indexes[name]
+
+    def _build_index(self, name: str) -> None:
+        try:
+            self._indexes[name] = _index_builders[name](self)
+        except Exception as e:
+            # Stored so every caller sees the same failure without rebuilding
+            logger.error(f"Failed to build config index '{name}' for version {self.version}: {e}")
+            self._index_errors[name] = e
+
+    def raw_files(self) -> Dict[str, Any]:
+        """The raw configuration data, as passed to the constructor (without version or indexes)."""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init and f.name != "version"}
+
+    def build_indexes(self) -> None:
+        """Eagerly build every registered index so requests never pay compile cost inline."""
+        with self._index_lock:
+            for name in list(_index_builders):
+                if name not in self._indexes and name not in self._index_errors:
+                    self._build_index(name)
+
+
+def _load_optional(getter: Callable[[], Any], context: str) -> Any:
+    """Load a rules file whose consumers already degrade to a default action on failure."""
+    try:
+        return getter()
+    except Exception as e:
+        logger.error(f"Failed to load {context} for config snapshot: {e}")
+        return None
+
+
+def _load_files() -> Dict[str, Any]:
+    return {
+        "cmyk_hubs": data_manager.get_cmyk_hubs_data(),
+        "hub_data": data_manager.get_hub_data(),
+        "product_info": data_manager.get_product_info_data(),
+        "product_keywords": data_manager.get_product_keywords_data(),
+        "production_groups": data_manager.get_production_groups_data(),
+        "hub_rules": data_manager.get_hub_rules_data(),
+        "finishing_rules": _load_optional(data_manager.get_finishing_rules_data, "finishing rules"),
+        "imposing_rules": _load_optional(data_manager.get_imposing_rules_data, "imposing rules"),
+        "preflight_rules": _load_optional(data_manager.get_preflight_rules_data, "preflight rules"),
+        "preflight_profiles": _load_optional(data_manager.get_preflight_profiles_data, "preflight profiles"),
+    }
+
+
+def build_config_snapshot() -> ConfigSnapshot:
+    """Load every file at one consistent config version and build all registered indexes."""
+    for _ in range(5):
+        version = data_manager.get_config_version()
+        files = _load_files()
+        if data_manager.get_config_version() == version:
+            break
+        logger.info("Config changed while building snapshot; retrying")
+    snapshot = ConfigSnapshot(version=version, **files)
+    snapshot.build_indexes()
+    logger.info(f"Built config snapshot version {version}")
+    return snapshot
+
+
+_current_snapshot: Optional[ConfigSnapshot] = None
+_swap_lock = threading.Lock()
+# Set while a ConfigWatcher rebuilds snapshots in the background; requests then serve the
+# published snapshot as-is and never wait for a rebuild after the first one
+_background_refresh = False
+
+
+def set_background_refresh(enabled: bool) -> None:
+    global _background_refresh
+    _background_refresh = enabled
+
+
+def refresh_config_snapshot() -> ConfigSnapshot:
+    """Rebuild and publish the snapshot if the config version moved on; returns the current one."""
+    global _current_snapshot
+    with _swap_lock:
+        snapshot = _current_snapshot
+        if snapshot is None or snapshot.version != data_manager.get_config_version():
+            snapshot = build_config_snapshot()
+            _current_snapshot = snapshot
+    return snapshot
+
+
+def get_config_snapshot() -> ConfigSnapshot:
+    """
+    Return the current snapshot, rebuilding it first if the config version moved on.
+    The new snapshot is published with a single reference swap; concurrent callers share one rebuild.
+    """
+    snapshot = _current_snapshot
+    if snapshot is not None and (_background_refresh or snapshot.version == data_manager.get_config_version()):
+        return snapshot
+    return refresh_config_snapshot()
+
+
+def peek_config_snapshot() -> Optional[ConfigSnapshot]:
+    """
+    The current snapshot if it is known to be up to date without touching the filesystem,
+    otherwise None (a disk check or rebuild is due; use get_config_snapshot off the event loop,
+    e.g. schedule_runner.get_config_snapshot_async).
+    """
+    snapshot = _current_snapshot
+    if snapshot is not None and _background_refresh:
+        return snapshot
+    version = data_manager.peek_config_version()
+    if snapshot is not None and version is not None and snapshot.version == version:
+        return snapshot
+    return None
@@ -0,0 +1,86 @@
+# app/config_watcher.py
+# Keeps every worker process on the latest configuration without per-request disk checks.
+# A daemon thread polls the shared generation stamp (rewritten by any worker's save) and the
+# cached config files every CONFIG_WATCH_INTERVAL seconds, or immediately after a save in this
+# process. On a change it drops the affected cached files, rebuilds the config snapshot in the
+# background and publishes it with one reference swap; requests keep serving the previous
+# snapshot until then.
+import logging
+import os
+import threading
+from typing import Optional
+
+from app import config_snapshot, data_manager
+
+logger = logging.getLogger(__name__)
+
+CONFIG_WATCH_ENABLED = os.getenv("CONFIG_WATCH_ENABLED", "1").lower() in ("1", "true", "yes")
+CONFIG_WATCH_INTERVAL = float(os.getenv("CONFIG_WATCH_INTERVAL_SECONDS", "1.0"))
+
+
+class ConfigWatcher:
+    def __init__(self, interval: float = CONFIG_WATCH_INTERVAL):
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._generation: Optional[str] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._generation = data_manager.read_config_generation()
+        # The first snapshot is built before requests stop checking the version themselves
+        config_snapshot.refresh_config_snapshot()
+        data_manager.add_generation_listener(self._wake.set)
+        data_manager.set_disk_checks_external(True)
+        config_snapshot.set_background_refresh(True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Config watcher started (interval {self.interval}s, stamp {data_manager.config_generation_path()})")
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        data_manager.remove_generation_listener(self._wake.set)
+        data_manager.set_disk_checks_external(False)
+        config_snapshot.set_background_refresh(False)
+        logger.info("Config watcher stopped")
+
+    def poll(self) -> bool:
+        """Run one check; returns True if a new snapshot was published."""
+        generation = data_manager.read_config_generation()
+        if generation != self._generation:
+            self._generation = generation
+            if generation != data_manager.published_config_generation():
+                # Another worker saved. Its writes may not change our cached file signatures if they
+                # landed within the same mtime tick, so reload everything
+                logger.info("Config generation changed in another process; reloading configuration")
+                data_manager.invalidate_config_cache()
+        data_manager.check_config_files()
+        before = config_snapshot.peek_config_snapshot()
+        snapshot = config_snapshot.refresh_config_snapshot()
+        if snapshot is not before:
+            logger.info(f"Published config snapshot version {snapshot.version}")
+            return True
+        return False
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.poll()
+            except Exception as e:
+                # Keep serving the last good snapshot and try again on the next tick
+                logger.error(f"Config watcher failed to refresh configuration: {e}")
+
+
+config_watcher = ConfigWatcher()
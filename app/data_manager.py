@@ -1,15 +1,25 @@
 import json
+import os
+import threading
+import time
 from pathlib import Path
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Tuple
 
 # Set up logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
 # Data directory is one level up from 'app/'
 DATA_DIR = Path(__file__).parent.parent / "data"
 
+# How long (seconds) a cached file is trusted before its mtime/size/inode is re-checked.
+# Saves made through this module invalidate immediately regardless of this interval.
+CONFIG_STAT_INTERVAL = float(os.getenv("CONFIG_STAT_INTERVAL_SECONDS", "1.0"))
+
+# Stamp file rewritten after every save so other worker processes notice the change.
+# Relative paths are resolved against DATA_DIR.
+CONFIG_GENERATION_FILE = os.getenv("CONFIG_GENERATION_FILE", ".config_generation")
+
 def validate_json_structure(data: Any, required_fields: List[str], context: str) -> None:
     """Validate that all required fields exist in the data structure"""
     if isinstance(data, dict):
@@ -60,13 +70,170 @@ def save_json_file(filepath: Path, data: Any, context: str) -> None:
         error_msg = f"Error saving {context} file: {str(e)}"
         logger.error(error_msg)
         raise
+    finally:
+        # Even a failed write may have truncated the file, so never keep serving the old copy
+        invalidate_config_cache(filepath.name)
+        publish_config_generation()
+
+# ---------- Config Cache ----------
+# Every getter below parses and validates its file once, then serves the same object
+# until the file changes on disk or is saved through this module. Returned data is
+# shared between callers and must be treated as read-only; copy it before mutating.
+
+class _CacheEntry:
+    __slots__ = ("data", "signature", "checked_at")
+
+    def __init__(self, data: Any, signature: Optional[Tuple[int, int, int, int]], checked_at: float):
+        self.data = data
+        self.signature = signature
+        self.checked_at = checked_at
+
+_cache: Dict[str, _CacheEntry] = {}
+_cache_lock = threading.RLock()
+_config_version = 0
+_last_version_check = 0.0
+# Set while a ConfigWatcher thread owns the disk checks; requests then never stat config files
+_disk_checks_external = False
+_generation_listeners: List[Callable[[], None]] = []
+_published_generation: Optional[str] = None
+
+def _file_signature(filepath: Path) -> Optional[Tuple[int, int, int, int]]:
+    """Cheap change detector for a data file: (inode, device, size, mtime_ns), or None if missing."""
+    try:
+        st = filepath.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_dev, st.st_size, st.st_mtime_ns)
+
+def _bump_config_version() -> None:
+    global _config_version
+    with _cache_lock:
+        _config_version += 1
+
+def _get_cached(filename: str, loader: Callable[[Path], Any]) -> Any:
+    """Return the parsed data for `filename`, re-running `loader` only if the file changed."""
+    entry = _cache.get(filename)
+    now = time.monotonic()
+    if entry is not None and now - entry.checked_at < CONFIG_STAT_INTERVAL:
+        return entry.data
+
+    with _cache_lock:
+        filepath = DATA_DIR / filename
+        signature = _file_signature(filepath)
+        entry = _cache.get(filename)
+        if entry is not None and entry.signature == signature:
+            entry.checked_at = now
+            return entry.data
+
+        data = loader(filepath)
+        if signature is None:
+            # The loader may have created a default file
+            signature = _file_signature(filepath)
+        if entry is not None:
+            logger.info(f"Config file {filename} changed on disk; reloaded")
+            _bump_config_version()
+        _cache[filename] = _CacheEntry(data, signature, now)
+        return data
+
+def invalidate_config_cache(filename: Optional[str] = None) -> None:
+    """Drop one cached file (or all of them) and bump the config version."""
+    with _cache_lock:
+        if filename is None:
+            _cache.clear()
+        else:
+            _cache.pop(filename, None)
+        _bump_config_version()
+
+def check_config_files() -> int:
+    """Re-check every cached file against disk now, dropping changed ones. Returns the config version."""
+    global _last_version_check
+    with _cache_lock:
+        now = time.monotonic()
+        _last_version_check = now
+        for filename, entry in list(_cache.items()):
+            if _file_signature(DATA_DIR / filename) != entry.signature:
+                logger.info(f"Config file {filename} changed on disk; dropping cached copy")
+                _cache.pop(filename, None)
+                _bump_config_version()
+            else:
+                entry.checked_at = now
+    return _config_version
+
+def get_config_version() -> int:
+    """
+    Monotonically increasing version of the loaded configuration.
+    Cached files are re-checked against disk at most once per CONFIG_STAT_INTERVAL,
+    so calling this on every request does not touch the filesystem in between.
+    While a ConfigWatcher runs, it does the checks and this never touches the filesystem.
+    """
+    if not _disk_checks_external and time.monotonic() - _last_version_check >= CONFIG_STAT_INTERVAL:
+        with _cache_lock:
+            if time.monotonic() - _last_version_check >= CONFIG_STAT_INTERVAL:
+                check_config_files()
+    return _config_version
+
+def peek_config_version() -> Optional[int]:
+    """
+    The config version as of the last disk check, or None if a check is due.
+    Never touches the filesystem, so it is safe to call from the event loop.
+    """
+    if not _disk_checks_external and time.monotonic() - _last_version_check >= CONFIG_STAT_INTERVAL:
+        return None
+    return _config_version
+
+def set_disk_checks_external(enabled: bool) -> None:
+    """Hand the periodic disk checks to a background watcher (or take them back)."""
+    global _disk_checks_external
+    _disk_checks_external = enabled
+
+# ---------- Config Generation ----------
+# The generation stamp is the cross-process signal: a save in any worker rewrites it, and every
+# worker's ConfigWatcher reloads when the content differs from what it last saw.
+
+def config_generation_path() -> Path:
+    return DATA_DIR / CONFIG_GENERATION_FILE
+
+def read_config_generation() -> Optional[str]:
+    try:
+        return config_generation_path().read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+def publish_config_generation() -> None:
+    """Write a new generation stamp (atomically) and wake this process's listeners."""
+    global _published_generation
+    path = config_generation_path()
+    stamp = f"{time.time_ns()} {os.getpid()} {_config_version}"
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_text(stamp, encoding="utf-8")
+        os.replace(tmp_path, path)
+        _published_generation = stamp
+    except OSError as e:
+        logger.error(f"Failed to publish config generation to {path}: {e}")
+    for listener in list(_generation_listeners):
+        listener()
+
+def published_config_generation() -> Optional[str]:
+    """The last stamp written by this process, whose change is already applied locally."""
+    return _published_generation
+
+def add_generation_listener(listener: Callable[[], None]) -> None:
+    _generation_listeners.append(listener)
+
+def remove_generation_listener(listener: Callable[[], None]) -> None:
+    if listener in _generation_listeners:
+        _generation_listeners.remove(listener)
 
 # ---------- Product Info ----------
 def get_product_info_data() -> Dict:
+    return _get_cached("product_info.json", _load_product_info_data)
+
+def _load_product_info_data(filepath: Path) -> Dict:
     required_fields = ["Product_ID", "Product_Group", "Product_Category", "Cutoff",
                       "Days_to_produce", "Production_Hub", "Start_days"]
     
-    data = load_json_file(DATA_DIR / "product_info.json", "product info")
+    data = load_json_file(filepath, "product info")
     
     try:
         # Validate each product entry
@@ -82,9 +249,12 @@ def save_product_info_data(data: Dict):
 
 # ---------- CMYK Hubs ----------
 def get_cmyk_hubs_data() -> List[Dict]:
+    return _get_cached("cmyk_hubs.json", _load_cmyk_hubs_data)
+
+def _load_cmyk_hubs_data(filepath: Path) -> List[Dict]:
     required_fields = ["Hub", "CMHKhubID", "State", "Next_Best", "Timezone"]
     
-    data = load_json_file(DATA_DIR / "cmyk_hubs.json", "CMYK hubs")
+    data = load_json_file(filepath, "CMYK hubs")
     
     try:
         validate_json_structure(data, required_fields, "CMYK hubs")
@@ -106,9 +276,12 @@ def save_cmyk_hubs_data(data: List[Dict]):
 
 # ---------- Product Keywords ----------
 def get_product_keywords_data() -> List[Dict]:
+    return _get_cached("product_keywords.json", _load_product_keywords_data)
+
+def _load_product_keywords_data(filepath: Path) -> List[Dict]:
     required_fields = ["Product_ID", "Match_All", "Match_Any", "Exclude_All"]
     
-    data = load_json_file(DATA_DIR / "product_keywords.json", "product keywords")
+    data = load_json_file(filepath, "product keywords")
     
     try:
         validate_json_structure(data, required_fields, "product keywords")
@@ -129,9 +302,12 @@ def save_product_keywords_data(data: List[Dict]):
 
 # ---------- Hub Data / Postcodes ----------
 def get_hub_data() -> List[Dict]:
+    return _get_cached("hub_data.json", _load_hub_data)
+
+def _load_hub_data(filepath: Path) -> List[Dict]:
     required_fields = ["hubName", "hubId", "postcode"]
     
-    data = load_json_file(DATA_DIR / "hub_data.json", "hub data")
+    data = load_json_file(filepath, "hub data")
     
     try:
         validate_json_structure(data, required_fields, "hub data")
@@ -150,11 +326,58 @@ def save_hub_data(data: List[Dict]):
     save_json_file(DATA_DIR / "hub_data.json", data, "hub data")
 
 
+# ---------- Hub Rules ----------
+def get_hub_rules_data() -> Dict:
+    """Load hub selection rules from hub_rules.json ({"rules": [...], "equipment": {...}})"""
+    return _get_cached("hub_rules.json", _load_hub_rules_data)
+
+def _load_hub_rules_data(filepath: Path) -> Dict:
+    context = "hub rules"
+
+    # A missing hub rules file simply means no rules apply
+    if not filepath.exists():
+        logger.warning(f"{context} file not found at {filepath}; using empty rule set.")
+        return {"rules": [], "equipment": {}}
+
+    data = load_json_file(filepath, context)
+    if not isinstance(data, dict) or not isinstance(data.get("rules", []), list):
+        logger.error(f"Invalid structure in {context} file: Expected a dictionary with a 'rules' list.")
+        raise ValueError(f"Invalid structure in {context} file.")
+    return data
+
+def save_hub_rules_data(data: Dict):
+    save_json_file(DATA_DIR / "hub_rules.json", data, "hub rules")
+
+
+# ---------- Finishing Rules ----------
+def get_finishing_rules_data() -> Dict:
+    """Load finishing rules from finishing_rules.json ({"keywordRules": [...], "centerRules": [...]})"""
+    return _get_cached("finishing_rules.json", _load_finishing_rules_data)
+
+def _load_finishing_rules_data(filepath: Path) -> Dict:
+    data = load_json_file(filepath, "finishing rules")
+
+    try:
+        validate_json_structure(data, ["keywordRules", "centerRules"], "finishing rules")
+        for field in ["keywordRules", "centerRules"]:
+            if not isinstance(data[field], list):
+                raise ValueError(f"'{field}' must be an array in finishing rules")
+        return data
+    except Exception as e:
+        logger.error(f"Invalid finishing rules data structure: {str(e)}")
+        raise
+
+def save_finishing_rules_data(data: Dict):
+    save_json_file(DATA_DIR / "finishing_rules.json", data, "finishing rules")
+
+
 # ---------- Imposing Rules ----------
 def get_imposing_rules_data() -> List[Dict]:
     """Load imposing rules from imposing_rules.json"""
+    return _get_cached("imposing_rules.json", _load_imposing_rules_data)
+
+def _load_imposing_rules_data(filepath: Path) -> List[Dict]:
     required_fields = ["id", "description", "priority", "enabled", "orderCriteria", "imposingAction"]
-    filepath = DATA_DIR / "imposing_rules.json"
     context = "imposing rules"
 
     # Create the file with default structure if it doesn't exist
@@ -197,8 +420,10 @@ def save_imposing_rules_data(rules: List[Dict]):
 # ---------- NEW: Preflight Profiles ----------
 def get_preflight_profiles_data() -> List[Dict]:
     """Load preflight profiles from preflight_profiles.json"""
+    return _get_cached("preflight_profiles.json", _load_preflight_profiles_data)
+
+def _load_preflight_profiles_data(filepath: Path) -> List[Dict]:
     required_fields = ["id", "description"]
-    filepath = DATA_DIR / "preflight_profiles.json"
     context = "preflight profiles"
 
     # Create the file with default structure if it doesn't exist
@@ -244,8 +469,10 @@ def save_preflight_profiles_data(profiles: List[Dict]):
 # ---------- NEW: Preflight Rules ----------
 def get_preflight_rules_data() -> List[Dict]:
     """Load preflight rules from preflight_rules.json"""
+    return _get_cached("preflight_rules.json", _load_preflight_rules_data)
+
+def _load_preflight_rules_data(filepath: Path) -> List[Dict]:
     required_fields = ["id", "description", "priority", "enabled", "orderCriteria", "preflightProfileId"]
-    filepath = DATA_DIR / "preflight_rules.json"
     context = "preflight rules"
 
     # Create the file with default structure if it doesn't exist
@@ -288,9 +515,12 @@ def save_preflight_rules_data(rules: List[Dict]):
 
 # ---------- Production Groups ----------
 def get_production_groups_data() -> List[Dict]:
+    return _get_cached("production_groups.json", _load_production_groups_data)
+
+def _load_production_groups_data(filepath: Path) -> List[Dict]:
     required_fields = ["id", "name", "Match_All", "Match_Any", "Exclude_All"]
     
-    data = load_json_file(DATA_DIR / "production_groups.json", "production groups")
+    data = load_json_file(filepath, "production groups")
     
     try:
         validate_json_structure(data, required_fields, "production groups")
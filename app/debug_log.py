@@ -0,0 +1,117 @@
+# app/debug_log.py
+# In-memory capture of recent log records for the /debug-logs page.
+# Records go into a fixed-size ring without taking a lock: a global counter hands out sequence
+# numbers and each record lands in slot seq % capacity. Records are stored raw and only
+# formatted when read, so capture costs the request path one counter step and one list store.
+# Messages are rendered from the record's args at read time, so an argument mutated after the
+# call is shown in its later state.
+import itertools
+import logging
+import os
+from contextvars import ContextVar, Token
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.logging_config import parse_level
+
+logger = logging.getLogger(__name__)
+
+DEBUG_LOG_CAPACITY = int(os.getenv("DEBUG_LOG_CAPACITY", "1000"))
+DEBUG_LOG_LEVEL = os.getenv("DEBUG_LOG_LEVEL", "DEBUG")
+
+# Order being scheduled in the current thread / task, attached to every captured record
+_current_order_id: ContextVar[Optional[str]] = ContextVar("debug_log_order_id", default=None)
+
+
+def bind_order_id(order_id: Optional[str]) -> Token:
+    return _current_order_id.set(order_id)
+
+
+def reset_order_id(token: Token) -> None:
+    _current_order_id.reset(token)
+
+
+class DebugLogBuffer:
+    """Lock-free ring of (seq, record, orderId). Older entries are overwritten once full."""
+
+    def __init__(self, capacity: int = DEBUG_LOG_CAPACITY):
+        self.capacity = max(1, capacity)
+        self._slots: List[Optional[Tuple[int, logging.LogRecord, Optional[str]]]] = [None] * self.capacity
+        # next() on itertools.count is atomic under the GIL, so every record gets a unique seq
+        self._counter = itertools.count(1)
+
+    def append(self, record: logging.LogRecord) -> None:
+        seq = next(self._counter)
+        self._slots[seq % self.capacity] = (seq, record, _current_order_id.get())
+
+    def clear(self) -> None:
+        self._slots = [None] * self.capacity
+
+    def entries(self, since: Optional[int] = None, level: Optional[int] = None,
+                order_id: Optional[str] = None, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Entries with seq > since (oldest first), at or above `level` and for `order_id`,
+        formatted now. Returns (entries, cursor); pass the cursor back as `since` for the next page.
+        """
+        since = since or 0
+        slots = [slot for slot in list(self._slots) if slot is not None and slot[0] > since]
+        slots.sort(key=lambda slot: slot[0])
+        cursor = since
+        results = []
+        for seq, record, record_order_id in slots:
+            if limit is not None and len(results) >= limit:
+                break
+            cursor = seq
+            if level is not None and record.levelno < level:
+                continue
+            if order_id is not None and record_order_id != order_id:
+                continue
+            results.append(self._format(seq, record, record_order_id))
+        return results, cursor
+
+    @staticmethod
+    def _format(seq: int, record: logging.LogRecord, order_id: Optional[str]) -> Dict[str, Any]:
+        try:
+            message = record.getMessage()
+        except Exception as e:
+            message = f"{record.msg!r} (unformattable: {e})"
+        return {
+            "seq": seq,
+            "timestamp": datetime.fromtimestamp(record.created).strftime('%Y-%m-%d %H:%M:%S'),
+            "level": record.levelname,
+            "logger": record.name,
+            "orderId": order_id,
+            "message": message,
+        }
+
+
+class DebugCaptureHandler(logging.Handler):
+    """Feeds a DebugLogBuffer. Has its own level and skips the per-handler lock."""
+
+    def __init__(self, buffer: DebugLogBuffer, level: int = logging.DEBUG):
+        super().__init__(level)
+        self.buffer = buffer
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.level or not self.filter(record):
+            return False
+        self.buffer.append(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.buffer.append(record)
+
+
+debug_log_buffer = DebugLogBuffer()
+
+
+def install_debug_capture(target: Optional[logging.Logger] = None) -> DebugCaptureHandler:
+    """Attach the capture handler to `target` (the root logger by default)."""
+    try:
+        level = parse_level(DEBUG_LOG_LEVEL)
+    except ValueError as e:
+        logger.error("Ignoring DEBUG_LOG_LEVEL: %s", e)
+        level = logging.DEBUG
+    handler = DebugCaptureHandler(debug_log_buffer, level)
+    (target or logging.getLogger()).addHandler(handler)
+    return handler
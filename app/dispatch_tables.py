@@ -0,0 +1,254 @@
+# app/dispatch_tables.py
+# Precomputed run and dispatch dates per product x hub.
+# Given the hub-local date and whether the order arrived before the product's cutoff, the
+# cutoff status, effective run date and production start date (process_order Step 5) depend only
+# on the product's Start_days and its Modified_run_date overrides for that hub; the adjusted
+# start and dispatch dates (Step 7) then depend only on the hub's business calendar and the total
+# production days. Each table holds both for every day in a rolling window, so a request is one
+# list index.
+# Tables are keyed by their inputs rather than by product, so products with the same start days
+# and overrides share one table, and a config change only rebuilds the tables whose inputs moved.
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from app.business_calendar import BusinessCalendar, get_business_calendar
+from app.config_snapshot import ConfigSnapshot, register_index
+from app.product_catalog import ProductRecord, get_product_catalog
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_TABLE_DAYS = int(os.getenv("DISPATCH_TABLE_DAYS", "60"))
+DISPATCH_TABLE_MAX_PRODUCTION_DAYS = int(os.getenv("DISPATCH_TABLE_MAX_PRODUCTION_DAYS", "20"))
+
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+BEFORE_EFFECTIVE_RUN = "Before Cutoff (Scheduled for Effective Run)"
+BEFORE_CUTOFF = "Before Cutoff"
+AFTER_CUTOFF = "After Cutoff"
+EFFECTIVE_RUN_PASSED = "After Cutoff (Effective Run Date Passed)"
+
+
+class RunDates(NamedTuple):
+    cutoff_status: str
+    effective_run_date: date      # The run date the cutoff was checked against
+    calculated_start_date: date   # Production start, before weekend/holiday adjustment
+
+
+class DayEntry(NamedTuple):
+    run: RunDates
+    # (adjusted start date, dispatch date) indexed by total production days
+    dispatch: Tuple[Tuple[date, date], ...]
+
+
+# ---------- Step 5 ----------
+
+def start_weekdays(allowed_start_days: Iterable[str]) -> FrozenSet[int]:
+    """Weekday numbers (Monday = 0) named in Start_days; unknown names are ignored."""
+    allowed = set(allowed_start_days)
+    return frozenset(i for i, name in enumerate(DAY_NAMES) if name in allowed)
+
+
+def last_natural_run_date(day: date, weekdays: FrozenSet[int]) -> date:
+    """Most recent allowed start day on or before `day` (`day` itself if none in the past week)."""
+    current = day
+    for _ in range(7):
+        if current.weekday() in weekdays:
+            return current
+        current -= timedelta(days=1)
+    return day
+
+
+def next_natural_run_date(day: date, weekdays: FrozenSet[int]) -> date:
+    """Next allowed start day on or after `day`."""
+    if not weekdays:
+        raise ValueError("Product has no valid Start_days")
+    current = day
+    while current.weekday() not in weekdays:
+        current += timedelta(days=1)
+    return current
+
+
+def run_date_overrides(modified_run_dates: Iterable, hub: str) -> Dict[date, date]:
+    """
+    Modified_run_date entries ([original, new, [hubs]]) that apply to `hub`, as original -> new.
+    The first entry for a date wins, as in a linear scan; malformed entries are skipped.
+    """
+    overrides: Dict[date, date] = {}
+    hub = hub.lower()
+    for entry in modified_run_dates or []:
+        if not isinstance(entry, list) or len(entry) < 3:
+            logger.warning("Skipping malformed override entry: %s", entry)
+            continue
+        original, new, hubs = entry[0], entry[1], entry[2]
+        if not original or not new or not isinstance(hubs, list):
+            logger.warning("Skipping override due to missing/invalid data: %s", entry)
+            continue
+        try:
+            original_date = datetime.strptime(original, "%Y-%m-%d").date()
+            new_date = datetime.strptime(new, "%Y-%m-%d").date()
+        except (ValueError, TypeError) as e:
+            logger.warning("Skipping override due to parsing error (%s): %s", e, entry)
+            continue
+        if hub in (h.lower() for h in hubs if isinstance(h, str)):
+            overrides.setdefault(original_date, new_date)
+    return overrides
+
+
+def resolve_run_dates(today: date, before_cutoff: bool, weekdays: FrozenSet[int],
+                      overrides: Mapping[date, date]) -> RunDates:
+    """
+    Step 5: the run date the cutoff applies to and the resulting production start date.
+    An override moving the last run to today or later takes precedence, then one moving the next
+    run. Missing the cutoff moves to the next natural run after the missed one (itself overridable).
+    """
+    last_natural = last_natural_run_date(today, weekdays)
+    next_natural = next_natural_run_date(today, weekdays)
+
+    moved_last = overrides.get(last_natural)
+    if moved_last is not None and moved_last >= today:
+        effective, natural = moved_last, last_natural
+    elif next_natural in overrides:
+        effective, natural = overrides[next_natural], next_natural
+    else:
+        effective, natural = next_natural, next_natural
+
+    if today < effective:
+        return RunDates(BEFORE_EFFECTIVE_RUN, effective, effective)
+    if today == effective and before_cutoff:
+        return RunDates(BEFORE_CUTOFF, effective, effective)
+    following = next_natural_run_date(natural + timedelta(days=1), weekdays)
+    status = AFTER_CUTOFF if today == effective else EFFECTIVE_RUN_PASSED
+    return RunDates(status, effective, overrides.get(following, following))
+
+
+# ---------- Tables ----------
+
+# (start weekdays, overrides, hub closed dates, first day)
+TableKey = Tuple[FrozenSet[int], Tuple[Tuple[date, date], ...], FrozenSet[date], date]
+
+
+class DispatchTable:
+    """DayEntry pairs (before cutoff, after cutoff) for `days` consecutive hub-local dates."""
+
+    def __init__(self, weekdays: FrozenSet[int], overrides: Mapping[date, date], calendar: BusinessCalendar,
+                 first_day: date, days: int = DISPATCH_TABLE_DAYS, max_production_days: int = DISPATCH_TABLE_MAX_PRODUCTION_DAYS):
+        self.first_ordinal = first_day.toordinal()
+        rows: Dict[date, Tuple[Tuple[date, date], ...]] = {}
+
+        def entry(run: RunDates) -> DayEntry:
+            row = rows.get(run.calculated_start_date)
+            if row is None:
+                start = run.calculated_start_date
+                row = rows[start] = tuple(calendar.add_business_days(start, n) for n in range(max_production_days + 1))
+            return DayEntry(run, row)
+
+        self.days: List[Tuple[DayEntry, DayEntry]] = []
+        for offset in range(days):
+            today = first_day + timedelta(days=offset)
+            before = entry(resolve_run_dates(today, True, weekdays, overrides))
+            after_run = resolve_run_dates(today, False, weekdays, overrides)
+            self.days.append((before, before if after_run == before.run else entry(after_run)))
+
+    def entry(self, today: date, before_cutoff: bool) -> Optional[DayEntry]:
+        offset = today.toordinal() - self.first_ordinal
+        if 0 <= offset < len(self.days):
+            return self.days[offset][0 if before_cutoff else 1]
+        return None
+
+
+# Tables shared across snapshots; anything not used by the newest snapshot is dropped
+_table_store: Dict[TableKey, DispatchTable] = {}
+_store_lock = threading.Lock()
+
+
+class DispatchTables:
+    """
+    Per-snapshot lookup of DispatchTables by (product ID, hub). Tables for every product's
+    production hubs are built with the snapshot (in the background when the config watcher
+    refreshes it); other pairs are built on first use. The window starts the day before the
+    build date and rolls forward in a background thread once half of it has passed.
+    """
+
+    def __init__(self, snapshot: ConfigSnapshot, today: Optional[date] = None):
+        self._snapshot = snapshot
+        self._catalog = get_product_catalog(snapshot)
+        self._lock = threading.Lock()
+        self._rolling = False
+        self._tables: Dict[Tuple[int, str], Optional[DispatchTable]] = {}
+        self._first_day = (today or date.today()) - timedelta(days=1)
+        self._build_all()
+
+    def _table(self, product: ProductRecord, hub: str) -> Optional[DispatchTable]:
+        calendar = get_business_calendar(self._snapshot, hub)
+        if calendar is None:
+            return None
+        overrides = run_date_overrides(product.raw.get("Modified_run_date", []), hub)
+        # Keyed by closed dates, not the calendar object, so tables survive unrelated config changes
+        key = (start_weekdays(product.start_days), tuple(sorted(overrides.items())), calendar.closed, self._first_day)
+        table = _table_store.get(key)
+        if table is None:
+            weekdays, overrides, _, first_day = key
+            try:
+                table = DispatchTable(weekdays, dict(overrides), calendar, first_day)
+            except ValueError as e:
+                logger.warning("No dispatch table for product %s at hub %s: %s", product.product_id, hub, e)
+                return None
+            with _store_lock:
+                table = _table_store.setdefault(key, table)
+        return table
+
+    def _build_all(self) -> None:
+        tables: Dict[Tuple[int, str], Optional[DispatchTable]] = {}
+        for product in self._catalog:
+            for hub in product.production_hubs:
+                tables[(product.product_id, hub)] = self._table(product, hub)
+        self._tables = tables
+        with _store_lock:
+            used = {id(table) for table in tables.values() if table is not None}
+            reused = len(_table_store)
+            for key in [key for key, table in _table_store.items() if id(table) not in used]:
+                del _table_store[key]
+            reused -= len(_table_store)
+        logger.info("Dispatch tables ready for %s product/hub pairs from %s (%s distinct tables, %s dropped)",
+                    len(tables), self._first_day, len(_table_store), reused)
+
+    def _roll(self, today: date) -> None:
+        try:
+            self._first_day = today - timedelta(days=1)
+            self._build_all()
+        finally:
+            self._rolling = False
+
+    def entry(self, product: ProductRecord, hub: str, today: date, before_cutoff: bool) -> Optional[DayEntry]:
+        """The precomputed Step 5/7 result, or None when the date or product/hub is not covered."""
+        key = (product.product_id, hub)
+        try:
+            table = self._tables[key]
+        except KeyError:
+            table = self._tables[key] = self._table(product, hub)
+        if table is None:
+            return None
+        if today.toordinal() - self._first_day.toordinal() >= DISPATCH_TABLE_DAYS // 2:
+            self._maybe_roll()
+        return table.entry(today, before_cutoff)
+
+    def _maybe_roll(self) -> None:
+        # Requests can ask about any date (timeOffsetHours); only the server date moves the window
+        server_today = date.today()
+        if server_today.toordinal() - self._first_day.toordinal() < DISPATCH_TABLE_DAYS // 2 or self._rolling:
+            return
+        with self._lock:
+            if self._rolling:
+                return
+            self._rolling = True
+        threading.Thread(target=self._roll, args=(server_today,), name="dispatch-table-roll", daemon=True).start()
+
+
+def get_dispatch_tables(snapshot: ConfigSnapshot) -> DispatchTables:
+    return snapshot.index("dispatch_tables")
+
+
+register_index("dispatch_tables", DispatchTables)
@@ -0,0 +1,183 @@
+# app/finishing_engine.py
+# Finishing rules compiled once per config snapshot.
+# Every keyword / excludeKeyword term is resolved in a single automaton scan of the description
+# (one case-insensitive and one case-sensitive vocabulary), rule conditions are pre-normalised,
+# and center rules are looked up by centerId instead of scanned.
+import logging
+from typing import Dict, FrozenSet, List, Optional
+
+from app.keyword_automaton import KeywordAutomaton
+from app.models import CenterRule, FinishingRule, FinishingRules, RuleConditions, ScheduleRequest
+
+logger = logging.getLogger(__name__)
+
+
+class _Vocabulary:
+    """Collects terms for one automaton; masks are resolved after compilation."""
+
+    def __init__(self):
+        self.terms: List[str] = []
+        self.automaton: Optional[KeywordAutomaton] = None
+
+    def add(self, terms: List[str]) -> List[str]:
+        self.terms.extend(terms)
+        return terms
+
+    def compile(self) -> None:
+        self.automaton = KeywordAutomaton(self.terms)
+
+    def scan(self, text: str) -> int:
+        return self.automaton.scan(text) if self.terms else 0
+
+
+class CompiledConditions:
+    """RuleConditions with list/string values normalised once. Mirrors check_rule_conditions."""
+    __slots__ = ("production_hubs", "quantity_less_than", "quantity_greater_than", "quantity_greater_or_equal",
+                 "product_id_equal", "product_id_not_equal", "product_id_in", "group_not_contains", "hub_overrides")
+
+    def __init__(self, conditions: RuleConditions):
+        # Falsy values (None, 0, empty lists) disable a check, as in the original truthiness tests
+        self.production_hubs: Optional[FrozenSet[str]] = (
+            frozenset(h.lower() for h in conditions.productionHubIs) if conditions.productionHubIs else None
+        )
+        self.quantity_less_than = conditions.quantityLessThan or None
+        self.quantity_greater_than = conditions.quantityGreaterThan or None
+        self.quantity_greater_or_equal = conditions.quantityGreaterOrEqual or None
+        self.product_id_equal = conditions.productIdEqual or None
+        self.product_id_not_equal = conditions.productIdNotEqual or None
+        self.product_id_in = conditions.productIdIn or None
+        self.group_not_contains = conditions.productGroupNotContains.lower() if conditions.productGroupNotContains else None
+        self.hub_overrides: Optional[Dict[str, int]] = conditions.hubOverrides or None
+
+    def matches(self, product_obj: dict, total_qty: int, chosen_hub_lower: str) -> bool:
+        if self.production_hubs is not None and chosen_hub_lower not in self.production_hubs:
+            return False
+        if self.quantity_less_than is not None and total_qty >= self.quantity_less_than:
+            return False
+        if self.quantity_greater_than is not None and total_qty <= self.quantity_greater_than:
+            return False
+        if self.quantity_greater_or_equal is not None and total_qty < self.quantity_greater_or_equal:
+            return False
+        if self.product_id_equal is not None and product_obj["Product_ID"] != self.product_id_equal:
+            return False
+        if self.product_id_not_equal is not None and product_obj["Product_ID"] == self.product_id_not_equal:
+            return False
+        if self.product_id_in is not None and product_obj["Product_ID"] not in self.product_id_in:
+            return False
+        if self.group_not_contains is not None and self.group_not_contains in product_obj["Product_Group"].lower():
+            return False
+        return True
+
+
+class CompiledKeywordRule:
+    __slots__ = ("id", "description", "add_days", "case_sensitive", "keyword_mask", "match_all", "exclude_mask", "conditions")
+
+    def __init__(self, rule: FinishingRule, vocabulary: _Vocabulary):
+        self.id = rule.id
+        self.description = rule.description
+        self.add_days = rule.addDays
+        self.case_sensitive = rule.caseSensitive
+        self.match_all = rule.matchType == "all"
+        self.conditions = CompiledConditions(rule.conditions) if rule.conditions else None
+        # Without keywords the rule matches regardless of excludeKeywords, as in check_keywords
+        if rule.keywords:
+            normalise = (lambda k: k) if rule.caseSensitive else str.lower
+            self.keyword_mask = vocabulary.add([normalise(k) for k in rule.keywords])
+            self.exclude_mask = vocabulary.add([normalise(k) for k in (rule.excludeKeywords or [])])
+        else:
+            self.keyword_mask = None
+            self.exclude_mask = []
+
+    def resolve(self, automaton: KeywordAutomaton) -> None:
+        if self.keyword_mask is not None:
+            self.keyword_mask = automaton.mask(self.keyword_mask)
+        self.exclude_mask = automaton.mask(self.exclude_mask)
+
+    def keywords_match(self, hits: int) -> bool:
+        if self.keyword_mask is None:
+            return True
+        if hits & self.exclude_mask:
+            return False
+        if self.match_all:
+            return hits & self.keyword_mask == self.keyword_mask
+        return bool(hits & self.keyword_mask)
+
+
+class CompiledCenterRule:
+    __slots__ = ("id", "description", "add_days", "case_sensitive", "exclude_mask")
+
+    def __init__(self, rule: CenterRule, vocabulary: _Vocabulary):
+        self.id = rule.id
+        self.description = rule.description
+        self.add_days = rule.addDays
+        self.case_sensitive = rule.caseSensitive
+        normalise = (lambda k: k) if rule.caseSensitive else str.lower
+        self.exclude_mask = vocabulary.add([normalise(k) for k in (rule.excludeKeywords or [])])
+
+    def resolve(self, automaton: KeywordAutomaton) -> None:
+        self.exclude_mask = automaton.mask(self.exclude_mask)
+
+
+class FinishingEngine:
+    """Enabled finishing rules in evaluation order, with shared keyword automata."""
+
+    def __init__(self, rules: FinishingRules):
+        self._lower = _Vocabulary()
+        self._exact = _Vocabulary()
+
+        self.keyword_rules: List[CompiledKeywordRule] = [
+            CompiledKeywordRule(rule, self._exact if rule.caseSensitive else self._lower)
+            for rule in rules.keywordRules if rule.enabled
+        ]
+        self.center_rules: Dict[int, List[CompiledCenterRule]] = {}
+        for rule in rules.centerRules:
+            if rule.enabled:
+                vocabulary = self._exact if rule.caseSensitive else self._lower
+                self.center_rules.setdefault(rule.centerId, []).append(CompiledCenterRule(rule, vocabulary))
+
+        self._lower.compile()
+        self._exact.compile()
+        for compiled in self.keyword_rules:
+            compiled.resolve(self._exact.automaton if compiled.case_sensitive else self._lower.automaton)
+        for center_rules in self.center_rules.values():
+            for compiled in center_rules:
+                compiled.resolve(self._exact.automaton if compiled.case_sensitive else self._lower.automaton)
+        logger.debug(
+            "Compiled finishing engine: %s keyword rules, %s center rules",
+            len(self.keyword_rules), sum(len(r) for r in self.center_rules.values()),
+        )
+
+    def calculate(self, req: ScheduleRequest, product_obj: dict, chosen_hub: str) -> int:
+        """Sum of matching keyword and center rule days (excluding additionalProductionDays)."""
+        description = req.description
+        hits_lower = self._lower.scan(description.lower())
+        hits_exact = self._exact.scan(description)
+        total_qty = req.misOrderQTY * req.kinds
+        chosen_hub_lower = chosen_hub.lower()
+        finishing_days = 0
+
+        for rule in self.keyword_rules:
+            if rule.conditions is not None and not rule.conditions.matches(product_obj, total_qty, chosen_hub_lower):
+                continue
+            if not rule.keywords_match(hits_exact if rule.case_sensitive else hits_lower):
+                continue
+            base_days = rule.add_days
+            if rule.conditions is not None and rule.conditions.hub_overrides:
+                hub_days = rule.conditions.hub_overrides.get(req.misCurrentHub.lower())
+                if hub_days is not None:
+                    logger.debug("Applying hubOverride for rule '%s' in hub '%s': %s days instead of %s", rule.id, req.misCurrentHub.lower(), hub_days, base_days)
+                    base_days = hub_days
+            finishing_days += base_days
+            logger.debug("Rule '%s' applied: %s (+%s days)", rule.id, rule.description, base_days)
+
+        if req.centerId is not None:
+            for rule in self.center_rules.get(req.centerId, ()):
+                if (hits_exact if rule.case_sensitive else hits_lower) & rule.exclude_mask:
+                    logger.debug("[calculate_finishing_days] Center rule '%s' skipped: Found excluded keyword.", rule.id)
+                    continue
+                finishing_days += rule.add_days
+                logger.debug("[calculate_finishing_days] Center rule '%s' matched request centerId %s: %s (%s days)", rule.id, req.centerId, rule.description, rule.add_days)
+        else:
+            logger.debug("[calculate_finishing_days] No centerId provided in request (or value is None), skipping Center Rules evaluation.")
+
+        return finishing_days
@@ -0,0 +1,196 @@
+# app/hub_rule_engine.py
+# Hub selection rules compiled once per config snapshot into per-hub predicate lists.
+# Validating a hub candidate touches only that hub's enabled rules, with keyword and product
+# group sets already lowercased and start/end dates already parsed.
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from app.models import HubSelectionRule
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DateWindow:
+    """A rule's startDate/endDate parsed once. Mirrors hub_selection.check_dates."""
+    start: Optional[date] = None
+    end: Optional[date] = None
+    always: bool = True   # Neither date set
+    never: bool = False   # A set date failed to parse
+
+    @classmethod
+    def from_rule(cls, rule) -> "DateWindow":
+        rule_id = getattr(rule, "id", "Unknown Rule")
+        start_str = getattr(rule, "startDate", None)
+        end_str = getattr(rule, "endDate", None)
+        if not start_str and not end_str:
+            return cls()
+        start = end = None
+        never = False
+        for label, value in (("startDate", start_str), ("endDate", end_str)):
+            if not value:
+                continue
+            try:
+                parsed = datetime.strptime(value, "%Y-%m-%d").date()
+            except (ValueError, TypeError):
+                logger.warning("Invalid %s format '%s' for rule %s. Treating as invalid.", label, value, rule_id)
+                never = True
+                continue
+            if label == "startDate":
+                start = parsed
+            else:
+                end = parsed
+        return cls(start=start, end=end, always=False, never=never)
+
+    def is_active(self, today: date) -> bool:
+        if self.always:
+            return True
+        if self.never:
+            return False
+        if self.start is not None and today < self.start:
+            return False
+        if self.end is not None and today > self.end:
+            return False
+        return True
+
+
+class HubRuleOrder:
+    """Per-request order fields, normalised once and shared by every rule evaluation."""
+    __slots__ = ("desc_lower", "width", "height", "quantity", "product_id", "product_group_lower", "print_type")
+
+    def __init__(self, description: str, width: float, height: float, quantity: int,
+                 product_id: int, product_group: Optional[str], print_type: int):
+        self.desc_lower = description.lower()
+        self.width = width
+        self.height = height
+        self.quantity = quantity
+        self.product_id = product_id
+        self.product_group_lower = product_group.lower() if product_group is not None else None
+        self.print_type = print_type
+
+
+class CompiledHubRule:
+    """
+    One enabled HubSelectionRule as a predicate. excludes() returns the exclusion reason
+    ("Size", "Order Criteria", "Size AND Order Criteria") or None, with the same semantics as
+    the original per-rule evaluation in validate_hub_rules.
+    """
+    __slots__ = (
+        "id", "priority", "window", "size_defined", "size_limits", "order_defined", "criteria_defined",
+        "min_quantity", "max_quantity", "product_ids", "keywords", "print_types", "product_groups",
+        "exclude_keywords", "exclude_product_groups", "exclude_product_ids", "reason",
+    )
+
+    def __init__(self, rule: HubSelectionRule):
+        self.id = rule.id
+        self.priority = rule.priority
+        self.window = DateWindow.from_rule(rule)
+
+        size = rule.sizeConstraints
+        self.size_defined = size is not None
+        # None means the constraint can never be exceeded (missing or partial limits)
+        self.size_limits: Optional[Tuple[float, float]] = None
+        if size is not None and size.maxWidth is not None and size.maxHeight is not None:
+            self.size_limits = (size.maxWidth, size.maxHeight)
+        elif size is not None and (size.maxWidth is not None or size.maxHeight is not None):
+            logger.warning("Partial size constraints defined for rule %s; treating as always fitting.", rule.id)
+
+        criteria = rule.orderCriteria
+        self.order_defined = criteria is not None
+        c = criteria
+        self.min_quantity = c.minQuantity if c else None
+        self.max_quantity = c.maxQuantity if c else None
+        self.product_ids: Optional[FrozenSet[int]] = frozenset(c.productIds) if c and c.productIds else None
+        self.keywords: Optional[Tuple[str, ...]] = tuple(kw.lower() for kw in c.keywords) if c and c.keywords else None
+        self.print_types: Optional[FrozenSet[int]] = frozenset(c.printTypes) if c and c.printTypes else None
+        self.product_groups: Optional[FrozenSet[str]] = frozenset(pg.lower() for pg in c.productGroups) if c and c.productGroups else None
+        self.exclude_keywords: Optional[Tuple[str, ...]] = tuple(kw.lower() for kw in c.excludeKeywords) if c and c.excludeKeywords else None
+        self.exclude_product_groups: Optional[FrozenSet[str]] = frozenset(pg.lower() for pg in c.excludeProductGroups) if c and c.excludeProductGroups else None
+        self.exclude_product_ids: Optional[FrozenSet[int]] = frozenset(c.excludeProductIds) if c and c.excludeProductIds else None
+        # Order criteria only count as met if at least one of these was configured
+        self.criteria_defined = bool(c) and (
+            self.min_quantity is not None or self.max_quantity is not None or self.product_ids is not None
+            or self.keywords is not None or self.print_types is not None or self.product_groups is not None
+            or self.exclude_keywords is not None or self.exclude_product_groups is not None
+        )
+
+        if self.size_defined and self.order_defined:
+            self.reason = "Size AND Order Criteria"
+        elif self.size_defined:
+            self.reason = "Size"
+        elif self.order_defined:
+            self.reason = "Order Criteria"
+        else:
+            self.reason = None
+
+    def _size_exceeded(self, order: HubRuleOrder) -> bool:
+        if self.size_limits is None:
+            return False
+        max1, max2 = self.size_limits
+        w, h = order.width, order.height
+        return not ((w <= max1 and h <= max2) or (w <= max2 and h <= max1))
+
+    def _order_criteria_met(self, order: HubRuleOrder) -> bool:
+        if not self.criteria_defined:
+            return False
+        if self.min_quantity is not None and order.quantity < self.min_quantity:
+            return False
+        if self.product_ids is not None and order.product_id not in self.product_ids:
+            return False
+        if self.keywords is not None and not any(kw in order.desc_lower for kw in self.keywords):
+            return False
+        if self.print_types is not None and order.print_type not in self.print_types:
+            return False
+        if self.product_groups is not None and order.product_group_lower not in self.product_groups:
+            return False
+        if self.exclude_keywords is not None and any(kw in order.desc_lower for kw in self.exclude_keywords):
+            return False
+        if self.exclude_product_groups is not None and order.product_group_lower in self.exclude_product_groups:
+            return False
+        # With maxQuantity set, the order criteria only apply once the quantity exceeds it
+        return self.max_quantity is None or order.quantity > self.max_quantity
+
+    def excludes(self, order: HubRuleOrder) -> Optional[str]:
+        if self.reason is None:
+            return None
+        if self.size_defined and not self._size_exceeded(order):
+            return None
+        if self.order_defined and not self._order_criteria_met(order):
+            return None
+        if self.exclude_product_ids is not None and order.product_id in self.exclude_product_ids:
+            logger.info("Rule '%s' would exclude the hub, BUT exclusion overridden by excludeProductIds for Product ID %s.", self.id, order.product_id)
+            return None
+        return self.reason
+
+
+class HubRuleEngine:
+    """Enabled hub rules grouped by lowercase hubId, each list in priority order (highest first)."""
+
+    def __init__(self, sorted_rules: List[HubSelectionRule]):
+        self.rule_count = len(sorted_rules)
+        self._by_hub: Dict[str, List[CompiledHubRule]] = {}
+        for rule in sorted_rules:
+            if not rule.enabled:
+                continue
+            self._by_hub.setdefault(rule.hubId.lower(), []).append(CompiledHubRule(rule))
+        logger.debug("Compiled hub rule engine: %s enabled rules across %s hubs", sum(len(r) for r in self._by_hub.values()), len(self._by_hub))
+
+    def rules_for(self, hub: str) -> List[CompiledHubRule]:
+        return self._by_hub.get(hub.lower(), [])
+
+    def excluding_rule(self, hub: str, order: HubRuleOrder, today: Optional[date] = None) -> Optional[Tuple[str, str]]:
+        """Return (rule_id, reason) for the first active rule that excludes `hub`, or None if it passes."""
+        rules = self._by_hub.get(hub.lower())
+        if not rules:
+            return None
+        today = today or datetime.now().date()
+        for rule in rules:
+            if not rule.window.is_active(today):
+                logger.debug("Skipping rule %s for hub %s (outside valid date range).", rule.id, hub)
+                continue
+            reason = rule.excludes(order)
+            if reason is not None:
+                return rule.id, reason
+        return None
@@ -26,7 +26,7 @@ def resolve_hub_details(current_hub: Optional[str] = None, current_hub_id: Optio
         found_hub = next((h for h in cmyk_hubs if h["CMHKhubID"] == current_hub_id), None)
         if found_hub:
             if found_hub["Hub"].lower() != current_hub.lower():
-                logger.warning(f"Hub name mismatch: Provided '{current_hub}' doesn't match ID {current_hub_id} ('{found_hub['Hub']}'). Using ID's value.")
+                logger.warning("Hub name mismatch: Provided '%s' doesn't match ID %s ('%s'). Using ID's value.", current_hub, current_hub_id, found_hub['Hub'])
             return found_hub["Hub"].lower(), current_hub_id
             
     # Case 2: Only hub name provided
@@ -42,7 +42,7 @@ def resolve_hub_details(current_hub: Optional[str] = None, current_hub_id: Optio
             return found_hub["Hub"].lower(), current_hub_id
             
     # Case 4: Neither provided or no matches found
-    logger.warning(f"Unable to resolve hub details (hub='{current_hub}', id={current_hub_id}). Using defaults.")
+    logger.warning("Unable to resolve hub details (hub='%s', id=%s). Using defaults.", current_hub, current_hub_id)
     return DEFAULT_HUB, DEFAULT_HUB_ID
 
 def get_hub_name(hub_id: int, cmyk_hubs: list) -> str:
@@ -4,11 +4,11 @@ import logging
 from typing import List, Optional
 
 from app.models import ScheduleRequest, OrderMatchingCriteria, ImposingRule
-from app.data_manager import get_imposing_rules_data, get_product_info_data
 from app.hub_selection import check_dates # Reuse date checking logic
+from app.config_snapshot import ConfigSnapshot, get_config_snapshot, register_index
+from app.product_catalog import get_product_catalog
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
 DEFAULT_IMPOSING_ACTION = 0 # 0 = No Impose
 
@@ -29,38 +29,38 @@ def check_order_criteria(criteria: OrderMatchingCriteria, req: ScheduleRequest,
 
     # Quantity (No change)
     if criteria.maxQuantity is not None and total_quantity > criteria.maxQuantity:
-        logger.debug(f"Criteria Check Failed: Quantity {total_quantity} > maxQuantity {criteria.maxQuantity}")
+        logger.debug("Criteria Check Failed: Quantity %s > maxQuantity %s", total_quantity, criteria.maxQuantity)
         return False
     if criteria.minQuantity is not None and total_quantity < criteria.minQuantity:
-        logger.debug(f"Criteria Check Failed: Quantity {total_quantity} < minQuantity {criteria.minQuantity}")
+        logger.debug("Criteria Check Failed: Quantity %s < minQuantity %s", total_quantity, criteria.minQuantity)
         return False
 
     # Keywords (No change)
     if criteria.keywords:
         if not any(kw.lower() in desc_lower for kw in criteria.keywords):
-            logger.debug(f"Criteria Check Failed: None of keywords {criteria.keywords} found in description.")
+            logger.debug("Criteria Check Failed: None of keywords %s found in description.", criteria.keywords)
             return False
     if criteria.excludeKeywords:
         if any(kw.lower() in desc_lower for kw in criteria.excludeKeywords):
-            logger.debug(f"Criteria Check Failed: Found excluded keyword from {criteria.excludeKeywords} in description.")
+            logger.debug("Criteria Check Failed: Found excluded keyword from %s in description.", criteria.excludeKeywords)
             return False
 
     # --- MODIFIED: Product IDs check uses the passed integer 'order_product_id' ---
     if criteria.productIds:
         # Pydantic ensures criteria.productIds contains integers
         if order_product_id is None or order_product_id not in criteria.productIds:
-            logger.debug(f"Criteria Check Failed: Order Product ID '{order_product_id}' not in required list {criteria.productIds}")
+            logger.debug("Criteria Check Failed: Order Product ID '%s' not in required list %s", order_product_id, criteria.productIds)
             return False
         else:
-             logger.debug(f"Criteria Check Passed: Order Product ID '{order_product_id}' is in required list {criteria.productIds}")
+             logger.debug("Criteria Check Passed: Order Product ID '%s' is in required list %s", order_product_id, criteria.productIds)
 
     if criteria.excludeProductIds:
         # Pydantic ensures criteria.excludeProductIds contains integers
         if order_product_id is not None and order_product_id in criteria.excludeProductIds:
-            logger.debug(f"Criteria Check Failed: Order Product ID '{order_product_id}' is in excluded list {criteria.excludeProductIds}")
+            logger.debug("Criteria Check Failed: Order Product ID '%s' is in excluded list %s", order_product_id, criteria.excludeProductIds)
             return False
         else:
-             logger.debug(f"Criteria Check Passed: Order Product ID '{order_product_id}' is not in excluded list {criteria.excludeProductIds}")
+             logger.debug("Criteria Check Passed: Order Product ID '%s' is not in excluded list %s", order_product_id, criteria.excludeProductIds)
     # --- End Product IDs modification ---
 
     # --- MODIFIED: Product Groups check uses the passed string 'product_group' ---
@@ -69,30 +69,30 @@ def check_order_criteria(criteria: OrderMatchingCriteria, req: ScheduleRequest,
         # Convert criteria product groups to lowercase for comparison
         criteria_groups_lower = [pg.lower() for pg in criteria.productGroups]
         if product_group_lower not in criteria_groups_lower:
-            logger.debug(f"Criteria Check Failed: Product Group '{product_group_lower}' not in required list {criteria.productGroups}")
+            logger.debug("Criteria Check Failed: Product Group '%s' not in required list %s", product_group_lower, criteria.productGroups)
             return False
     if criteria.excludeProductGroups:
         # Convert criteria excluded product groups to lowercase for comparison
         criteria_exclude_groups_lower = [pg.lower() for pg in criteria.excludeProductGroups]
         if product_group_lower in criteria_exclude_groups_lower:
-            logger.debug(f"Criteria Check Failed: Product Group '{product_group_lower}' is in excluded list {criteria.excludeProductGroups}")
+            logger.debug("Criteria Check Failed: Product Group '%s' is in excluded list %s", product_group_lower, criteria.excludeProductGroups)
             return False
     # --- End Product Groups modification ---
 
     # Print Types (No change)
     if criteria.printTypes:
         if req.printType not in criteria.printTypes:
-            logger.debug(f"Criteria Check Failed: Print Type {req.printType} not in {criteria.printTypes}")
+            logger.debug("Criteria Check Failed: Print Type %s not in %s", req.printType, criteria.printTypes)
             return False
 
     # Price checks
     if criteria.priceLessThan is not None:
         if req.orderPrice is None or req.orderPrice >= criteria.priceLessThan:
-            logger.debug(f"Criteria Check Failed: Order Price {req.orderPrice} is not less than {criteria.priceLessThan}")
+            logger.debug("Criteria Check Failed: Order Price %s is not less than %s", req.orderPrice, criteria.priceLessThan)
             return False
     if criteria.priceGreaterThan is not None:
         if req.orderPrice is None or req.orderPrice <= criteria.priceGreaterThan:
-            logger.debug(f"Criteria Check Failed: Order Price {req.orderPrice} is not greater than {criteria.priceGreaterThan}")
+            logger.debug("Criteria Check Failed: Order Price %s is not greater than %s", req.orderPrice, criteria.priceGreaterThan)
             return False
 
     # Chosen Production Hubs check
@@ -101,10 +101,10 @@ def check_order_criteria(criteria: OrderMatchingCriteria, req: ScheduleRequest,
         chosen_hub_lower = chosen_production_hub.lower()
         allowed_hubs_lower = [h.lower() for h in criteria.chosenProductionHubs]
         if chosen_hub_lower not in allowed_hubs_lower:
-            logger.debug(f"Criteria Check Failed: Chosen Production Hub '{chosen_hub_lower}' not in allowed list {allowed_hubs_lower}")
+            logger.debug("Criteria Check Failed: Chosen Production Hub '%s' not in allowed list %s", chosen_hub_lower, allowed_hubs_lower)
             return False
         else:
-            logger.debug(f"Criteria Check Passed: Chosen Production Hub '{chosen_hub_lower}' is in allowed list {allowed_hubs_lower}")
+            logger.debug("Criteria Check Passed: Chosen Production Hub '%s' is in allowed list %s", chosen_hub_lower, allowed_hubs_lower)
 
 
     # If we passed all checks
@@ -112,8 +112,18 @@ def check_order_criteria(criteria: OrderMatchingCriteria, req: ScheduleRequest,
     return True
 
 
+def _build_sorted_imposing_rules(snapshot: ConfigSnapshot) -> List[ImposingRule]:
+    if snapshot.imposing_rules is None:
+        raise ValueError("imposing rules could not be loaded")
+    rules: List[ImposingRule] = [ImposingRule(**r) for r in snapshot.imposing_rules]
+    rules.sort(key=lambda x: x.priority, reverse=True)
+    return rules
+
+register_index("imposing_rules", _build_sorted_imposing_rules)
+
+
 # MODIFIED: Added chosen_hub argument
-def determine_imposing_action(req: ScheduleRequest, product_id: int, chosen_hub: str) -> int:
+def determine_imposing_action(req: ScheduleRequest, product_id: int, chosen_hub: str, snapshot: Optional[ConfigSnapshot] = None) -> int:
     """
     Determines the SynergyImpose action based on matching imposing rules.
     Args:
@@ -123,43 +133,42 @@ def determine_imposing_action(req: ScheduleRequest, product_id: int, chosen_hub:
     Returns:
         int: The imposing action (0, 1, or 2). Defaults to 0.
     """
-    logger.debug(f"Determining imposing action for OrderID: {req.orderId}, ProductID: {product_id}")
+    logger.debug("Determining imposing action for OrderID: %s, ProductID: %s", req.orderId, product_id)
+    if snapshot is None:
+        snapshot = get_config_snapshot()
 
     try:
-        rules_data = get_imposing_rules_data()
-        rules: List[ImposingRule] = [ImposingRule(**r) for r in rules_data]
-        logger.debug(f"Loaded {len(rules)} imposing rules.")
+        # Parsed and sorted by priority once per config version
+        rules: List[ImposingRule] = snapshot.index("imposing_rules")
+        logger.debug("Loaded %s imposing rules.", len(rules))
     except Exception as e:
-        logger.error(f"Failed to load or parse imposing rules: {e}. Using default action.")
+        logger.error("Failed to load or parse imposing rules: %s. Using default action.", e)
         return DEFAULT_IMPOSING_ACTION
 
-    rules.sort(key=lambda x: x.priority, reverse=True)
-
     # --- MODIFIED: Fetch product group needed for the check function ---
-    all_product_info = get_product_info_data()
-    product_obj = all_product_info.get(str(product_id)) # Still need product_obj for group
-    order_product_group: Optional[str] = product_obj.get("Product_Group") if product_obj else None
-    if not product_obj:
-        logger.warning(f"Product object not found for Product ID {product_id} when checking imposing rules. Product Group checks may fail.")
+    product = get_product_catalog(snapshot).get(product_id)
+    order_product_group: Optional[str] = product.product_group if product else None
+    if product is None:
+        logger.warning("Product object not found for Product ID %s when checking imposing rules. Product Group checks may fail.", product_id)
     # --- End modification ---
 
     for rule in rules:
-        logger.debug(f"Evaluating imposing rule ID: {rule.id}, Priority: {rule.priority}")
+        logger.debug("Evaluating imposing rule ID: %s, Priority: %s", rule.id, rule.priority)
 
         if not rule.enabled:
-            logger.debug(f"Skipping rule {rule.id} (disabled).")
+            logger.debug("Skipping rule %s (disabled).", rule.id)
             continue
 
         if not check_dates(rule):
-            logger.debug(f"Skipping rule {rule.id} (outside valid date range).")
+            logger.debug("Skipping rule %s (outside valid date range).", rule.id)
             continue
 
         # --- MODIFIED: Pass product_id, product_group, AND chosen_hub ---
         if check_order_criteria(rule.orderCriteria, req, product_id, order_product_group, chosen_hub):
-             logger.info(f"Imposing rule {rule.id} matched. Setting action to {rule.imposingAction}.")
+             logger.info("Imposing rule %s matched. Setting action to %s.", rule.id, rule.imposingAction)
              return rule.imposingAction
         else:
-             logger.debug(f"Rule {rule.id} did not match order criteria.")
+             logger.debug("Rule %s did not match order criteria.", rule.id)
 
 
     logger.debug("No imposing rules matched. Using default action.")
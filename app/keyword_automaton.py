@@ -0,0 +1,153 @@
+# app/keyword_automaton.py
+# Aho-Corasick matching for the Match_All / Exclude_All / Match_Any keyword entries used by
+# product_keywords.json and production_groups.json.
+# The whole keyword vocabulary is compiled into one automaton; a description is scanned once to
+# produce a hit bitmask and every entry's keyword groups become bitmask tests against it.
+import logging
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordAutomaton:
+    """
+    Multi-pattern substring matcher. Patterns are matched exactly as given, so callers
+    lowercase both patterns and text to keep the `kw.lower() in desc.lower()` semantics.
+    Each distinct pattern is assigned one bit; scan() returns the OR of the bits found.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.bits: Dict[str, int] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[int] = [0]
+        self._always = 0  # The empty pattern is a substring of every text
+
+        for pattern in patterns:
+            if pattern in self.bits:
+                continue
+            bit = 1 << len(self.bits)
+            self.bits[pattern] = bit
+            if not pattern:
+                self._always |= bit
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(0)
+                state = nxt
+            self._out[state] |= bit
+
+        # Breadth-first fail links; outputs inherit from their fail state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def scan(self, text: str) -> int:
+        """Return the bitmask of every pattern that occurs in `text`."""
+        goto, fail, out = self._goto, self._fail, self._out
+        hits = self._always
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            hits |= out[state]
+        return hits
+
+    def mask(self, patterns: Iterable[str]) -> int:
+        m = 0
+        for p in patterns:
+            m |= self.bits[p]
+        return m
+
+
+def _lower_all(keywords) -> List[str]:
+    return [kw.lower() for kw in (keywords or [])]
+
+
+class KeywordRuleSet:
+    """
+    Compiled, ordered list of keyword entries (dicts with Match_All, Exclude_All, Match_Any).
+    matches() yields the entries whose keyword groups pass, in their original order, with the
+    same semantics as product_matcher.match_all / exclude_all / match_any.
+    """
+
+    def __init__(self, entries: List[Dict]):
+        self.entries = entries
+        compiled = []
+        vocabulary: List[str] = []
+        for entry in entries:
+            match_all = _lower_all(entry.get("Match_All"))
+            exclude_all = _lower_all(entry.get("Exclude_All"))
+            match_any = [_lower_all(group) for group in (entry.get("Match_Any") or [])]
+            vocabulary.extend(match_all)
+            vocabulary.extend(exclude_all)
+            for group in match_any:
+                vocabulary.extend(group)
+            compiled.append((match_all, exclude_all, match_any))
+
+        self.automaton = KeywordAutomaton(vocabulary)
+
+        # Candidate index: each entry with a non-empty Match_All keyword is anchored on its rarest
+        # one, so a scan only has to evaluate entries whose anchor was actually hit.
+        frequency: Dict[str, int] = {}
+        for match_all, _, _ in compiled:
+            for kw in set(match_all):
+                frequency[kw] = frequency.get(kw, 0) + 1
+
+        self._tests: List[Tuple[int, int, Tuple[int, ...]]] = []
+        self._anchored: Dict[int, List[int]] = {}
+        self._unanchored: List[int] = []
+        for index, (match_all, exclude_all, match_any) in enumerate(compiled):
+            mask = self.automaton.mask
+            self._tests.append((mask(match_all), mask(exclude_all), tuple(mask(group) for group in match_any)))
+            anchors = [kw for kw in match_all if kw]
+            if anchors:
+                anchor = min(anchors, key=lambda kw: frequency[kw])
+                self._anchored.setdefault(self.automaton.bits[anchor], []).append(index)
+            else:
+                self._unanchored.append(index)
+
+        logger.debug("Compiled keyword rule set: %s entries, %s distinct keywords", len(entries), len(self.automaton.bits))
+
+    def _candidates(self, hits: int) -> List[int]:
+        candidates = list(self._unanchored)
+        anchored = self._anchored
+        remaining = hits
+        while remaining:
+            low = remaining & -remaining
+            indexes = anchored.get(low)
+            if indexes:
+                candidates.extend(indexes)
+            remaining ^= low
+        candidates.sort()
+        return candidates
+
+    def matches(self, description: str) -> Iterator[Dict]:
+        """Yield entries whose keyword groups match `description`, in configured order."""
+        hits = self.automaton.scan(description.lower())
+        tests = self._tests
+        for index in self._candidates(hits):
+            all_mask, exclude_mask, any_masks = tests[index]
+            if hits & all_mask != all_mask:
+                continue
+            if hits & exclude_mask:
+                continue
+            if any(not hits & group for group in any_masks):
+                continue
+            yield self.entries[index]
@@ -0,0 +1,81 @@
+# app/logging_config.py
+# Log levels for the application, configurable per module at start-up and at runtime.
+# Module loggers (app.schedule_logic, app.hub_selection, ...) carry no level of their own and
+# inherit from the "app" logger unless overridden, so one setting quiets the whole hot path.
+#
+#   LOG_LEVEL=INFO                                       root and "app" level
+#   LOG_LEVELS=app.hub_selection=DEBUG,app.data_manager=WARNING   per-logger overrides
+import logging
+import os
+import threading
+from typing import Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+APP_LOGGER = "app"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+
+_levels_lock = threading.Lock()
+
+
+def parse_level(level) -> int:
+    """Level name or number -> logging level. Raises ValueError for unknown names."""
+    if isinstance(level, int) and not isinstance(level, bool):
+        return level
+    if isinstance(level, str):
+        value = logging.getLevelName(level.strip().upper())
+        if isinstance(value, int):
+            return value
+    raise ValueError(f"Unknown log level: {level!r}")
+
+
+def parse_level_overrides(spec: str) -> Dict[str, int]:
+    """Parse 'logger=LEVEL,logger=LEVEL' (as in LOG_LEVELS)."""
+    overrides: Dict[str, int] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, sep, level = part.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Invalid log level override {part.strip()!r}; expected logger=LEVEL")
+        overrides[name.strip()] = parse_level(level)
+    return overrides
+
+
+def configure_logging() -> None:
+    """Apply LOG_LEVEL and LOG_LEVELS. Called once at application start-up."""
+    level = parse_level(LOG_LEVEL)
+    logging.basicConfig(level=level)
+    logging.getLogger().setLevel(level)
+    logging.getLogger(APP_LOGGER).setLevel(level)
+    try:
+        overrides = parse_level_overrides(LOG_LEVELS)
+    except ValueError as e:
+        logger.error("Ignoring LOG_LEVELS: %s", e)
+        overrides = {}
+    set_log_levels(overrides)
+
+
+def set_log_levels(levels: Mapping[str, Optional[object]]) -> Dict[str, str]:
+    """
+    Set the level of each named logger ("root" for the root logger). A None level clears the
+    override so the logger inherits again. Every level is validated before any is applied.
+    """
+    parsed = {name: (None if level is None else parse_level(level)) for name, level in levels.items()}
+    with _levels_lock:
+        for name, level in parsed.items():
+            target = logging.getLogger() if name == "root" else logging.getLogger(name)
+            target.setLevel(logging.NOTSET if level is None else level)
+            logger.info("Log level for '%s' set to %s", name, logging.getLevelName(target.getEffectiveLevel()))
+    return get_log_levels()
+
+
+def get_log_levels() -> Dict[str, str]:
+    """Effective level of the root logger and of every application logger created so far."""
+    levels = {"root": logging.getLevelName(logging.getLogger().getEffectiveLevel())}
+    names = [name for name in logging.root.manager.loggerDict
+             if name == APP_LOGGER or name.startswith(APP_LOGGER + ".")]
+    for name in sorted(names):
+        levels[name] = logging.getLevelName(logging.getLogger(name).getEffectiveLevel())
+    return levels
@@ -1,23 +1,28 @@
 #main.py
 #main.py is the main application file that defines the FastAPI application and the routes.
+import asyncio
 import logging
 import uuid
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, HTTPException, Query, Response
 from datetime import datetime
-from collections import deque
-import threading
 from fastapi import HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+import copy
 import json
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 import pytz
 
 # >>> NEW IMPORTS FOR AUTH <<<
-from fastapi import Depends
-from app.auth import get_current_user
+from fastapi import Body, Depends
+from app.auth import get_current_user, require_admin
+from app.logging_config import configure_logging, get_log_levels, parse_level, set_log_levels
+from app.debug_log import debug_log_buffer, install_debug_capture
+from app.metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, registry as metrics_registry
+from app.server_timing import ServerTimingMiddleware, mark as mark_timing
+from app.profiler import PROFILER_INTERVAL_MS, PROFILER_MAX_SECONDS, ProfilerBusy, begin_profile, end_profile
 
 from app.data_manager import get_production_groups_data, save_production_groups_data
 
@@ -28,15 +33,30 @@ from app.data_manager import (
     get_hub_data, save_hub_data,
     get_imposing_rules_data, save_imposing_rules_data,
     get_preflight_profiles_data, save_preflight_profiles_data,
-    get_preflight_rules_data, save_preflight_rules_data
-    
+    get_preflight_rules_data, save_preflight_rules_data,
+    get_hub_rules_data, save_hub_rules_data,
+    get_finishing_rules_data, save_finishing_rules_data
 )
-from app.models import ScheduleRequest, ScheduleResponse
-from app.schedule_logic import process_order
+from app.models import ScheduleRequest, ScheduleResponse, ScheduleBatchResponse, ScheduleForecastRequest, ScheduleForecastResponse
+from app import process_backend
+from app.config_watcher import CONFIG_WATCH_ENABLED, config_watcher
+from app.batch_scheduler import SCHEDULE_BATCH_MAX_ITEMS, schedule_batch
+from app.schedule_forecast import SCHEDULE_FORECAST_MAX_HOURS, forecast_order
+from app.serialization import dumps as dumps_json, response_content
+from app.schedule_runner import get_config_snapshot_async, run_process_order
+from app.schedule_stream import NDJSONStreamingResponse, stream_schedule
+
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse with the same bytes, rendered by app.serialization.dumps (orjson when installed)."""
 
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
 
-## 1) Set up the basic logging configuration using the root logger.
-logging.basicConfig(level=logging.DEBUG)
+
+## 1) Set up logging (levels from LOG_LEVEL / LOG_LEVELS) using the root logger.
+configure_logging()
 logger = logging.getLogger()  # Use the root logger so all logs propagate
 
 # 2) Initialize FastAPI with a global dependency for security
@@ -69,33 +89,92 @@ app = FastAPI(
     openapi_tags=tags_metadata
 )
 
-# Basic logging setup
-logging.basicConfig(level=logging.DEBUG)
-logger = logging.getLogger()  # Use the root logger so all logs propagate
+# Request counts and latency per route for /metrics
+app.add_middleware(MetricsMiddleware)
+# Server-Timing / X-Config-Version on the scheduling endpoints (SERVER_TIMING_ENABLED)
+app.add_middleware(ServerTimingMiddleware)
 
-# 3) Create thread-safe containers for debug logs
-debug_messages = deque(maxlen=1000)
-debug_lock = threading.Lock()
-
-# 4) Define the DebugHandler
-class DebugHandler(logging.Handler):
-    def emit(self, record):
-        log_entry = {
-            'timestamp': datetime.fromtimestamp(record.created).strftime('%Y-%m-%d %H:%M:%S'),
-            'level': record.levelname,
-            'message': record.getMessage()
-        }
-        with debug_lock:
-            debug_messages.append(log_entry)
+# 3) Capture recent log records for /debug-logs (DEBUG_LOG_CAPACITY, DEBUG_LOG_LEVEL)
+install_debug_capture(logger)
+
+@app.on_event("startup")
+def start_config_watcher():
+    if CONFIG_WATCH_ENABLED:
+        config_watcher.start()
 
-# 5) Attach the DebugHandler to the root logger
-logger.addHandler(DebugHandler())
+@app.on_event("shutdown")
+def shutdown_background_workers():
+    config_watcher.stop()
+    if process_backend.scheduling_pool is not None:
+        process_backend.scheduling_pool.shutdown()
 
 @app.get("/debug-logs")
-async def get_debug_logs():
-    """Return the latest debug messages"""
-    with debug_lock:
-        return list(debug_messages)
+def get_debug_logs(
+    response: Response,
+    since: Optional[int] = Query(None, description="Only entries with seq greater than this cursor."),
+    level: Optional[str] = Query(None, description="Minimum level, e.g. INFO."),
+    orderId: Optional[str] = Query(None, description="Only entries logged while scheduling this order."),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of entries to return."),
+):
+    """
+    Return captured log entries, oldest first. The X-Next-Since header holds the cursor
+    to pass as `since` on the next poll.
+    """
+    try:
+        min_level = parse_level(level) if level else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    entries, cursor = debug_log_buffer.entries(since=since, level=min_level, order_id=orderId, limit=limit)
+    response.headers["X-Next-Since"] = str(cursor)
+    return entries
+
+@app.get("/metrics", tags=["Internal"])
+def metrics_endpoint():
+    """Prometheus text exposition: per-stage scheduling histograms, request counts, cache hit ratios."""
+    return Response(metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+@app.get("/admin/log-levels", tags=["Internal"])
+def read_log_levels(user: dict = Depends(require_admin)):
+    """Effective log level of the root logger and every application logger."""
+    return get_log_levels()
+
+@app.put("/admin/log-levels", tags=["Internal"])
+def update_log_levels(
+    levels: Dict[str, Optional[str]] = Body(..., example={"app": "INFO", "app.hub_selection": "DEBUG"}),
+    user: dict = Depends(require_admin),
+):
+    """Set logger levels at runtime (e.g. {"app": "INFO"}); null clears a logger's own level."""
+    try:
+        return set_log_levels(levels)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/admin/profile", tags=["Internal"], response_class=PlainTextResponse)
+async def run_profile(
+    seconds: float = Query(10.0, gt=0, le=PROFILER_MAX_SECONDS, description="How long to sample for."),
+    interval_ms: float = Query(PROFILER_INTERVAL_MS, ge=1, le=1000, description="Sampling interval."),
+    scope: str = Query("app", regex="^(app|all)$", description="'app' keeps only app.* frames."),
+    output: str = Query("collapsed", regex="^(collapsed|functions)$",
+                        description="'collapsed' stacks (flamegraph input) or per-function totals."),
+    user: dict = Depends(require_admin),
+):
+    """
+    Sample every thread in this worker process for `seconds` and return the aggregated stacks.
+    The event loop keeps serving requests while the profile runs.
+    """
+    try:
+        profiler = begin_profile(interval_ms / 1000.0, app_only=(scope == "app"))
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        end_profile(profiler)
+    if profiler.error is not None:
+        raise HTTPException(status_code=500, detail=f"Profiler failed: {profiler.error!r}")
+    logger.info("Profile finished: %s samples over %.1fs by %s", profiler.sample_count, seconds, user.get("username"))
+    body = profiler.collapsed() if output == "collapsed" else profiler.by_function()
+    return PlainTextResponse(body, headers={"X-Profile-Samples": str(profiler.sample_count)})
 
 # Mount static folder for CSS, images, etc.
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
@@ -167,8 +246,8 @@ async def save_hubs(request: Request):
         # Save CMYK hubs data
         save_cmyk_hubs_data(hubs_data)
         
-        # Get existing hub data
-        current_hub_data = get_hub_data()
+        # Get existing hub data (copied, the cached list is shared)
+        current_hub_data = copy.deepcopy(get_hub_data())
         
         # Update hub data with new postcodes
         for hub_name, postcode in postcode_data.items():
@@ -206,9 +285,7 @@ async def save_finishing_rule(request: Request):
         data = await request.json()
         logger.debug(f"Received rule data: {data}")
         
-        rules_path = Path("data/finishing_rules.json")
-        with open(rules_path, "r") as f:
-            rules = json.load(f)
+        rules = copy.deepcopy(get_finishing_rules_data())
             
         rule_type = data.get("type")
         new_rule = data.get("rule")
@@ -234,8 +311,7 @@ async def save_finishing_rule(request: Request):
                 rules["centerRules"].append(new_rule)
         
         # Save updated rules
-        with open(rules_path, "w", encoding='utf-8') as f:
-            json.dump(rules, f, indent=2, ensure_ascii=False)
+        save_finishing_rules_data(rules)
             
         return JSONResponse({
             "success": True,
@@ -269,9 +345,7 @@ async def product_keywords(request: Request):
 async def save_keywords(request: Request):
     try:
         keywords_data = await request.json()
-        keywords_path = Path("data/product_keywords.json")
-        with open(keywords_path, "w") as f:
-            json.dump(keywords_data, f, indent=2)
+        save_product_keywords_data(keywords_data)
         return JSONResponse({"success": True, "message": "Keywords saved successfully"})
     except Exception as e:
         return JSONResponse(
@@ -282,15 +356,9 @@ async def save_keywords(request: Request):
 @app.get("/hub-rules", response_class=HTMLResponse)
 async def hub_rules(request: Request):
     try:
-        rules_path = Path("data/hub_rules.json")
-        if rules_path.exists():
-            with open(rules_path, "r") as f:
-                data = json.load(f)
-                rules = data.get("rules", [])
-                equipment = data.get("equipment", {})
-        else:
-            rules = []
-            equipment = {}
+        data = get_hub_rules_data()
+        rules = data.get("rules", [])
+        equipment = data.get("equipment", {})
         
         # Load hubs data from cmyk_hubs.json
         hubs = get_cmyk_hubs_data()
@@ -334,20 +402,15 @@ async def save_hub_rule(request: Request):
                 "message": error_msg
             }, status_code=400)
 
-        rules_path = Path("data/hub_rules.json")
-        
-        # Load existing data
-        data = {"rules": [], "equipment": {}}
-        if rules_path.exists():
-            try:
-                with open(rules_path, "r", encoding='utf-8') as f:
-                    data = json.load(f)
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON in hub_rules.json: {e}")
-                return JSONResponse({
-                    "success": False,
-                    "message": "Error reading rules file"
-                }, status_code=500)
+        # Load existing data (copied, the cached dict is shared)
+        try:
+            data = copy.deepcopy(get_hub_rules_data())
+        except (json.JSONDecodeError, ValueError) as e:
+            logger.error(f"Invalid JSON in hub_rules.json: {e}")
+            return JSONResponse({
+                "success": False,
+                "message": "Error reading rules file"
+            }, status_code=500)
 
         rules = data.get("rules", [])
         
@@ -368,8 +431,7 @@ async def save_hub_rule(request: Request):
         # Save rules
         try:
             data["rules"] = rules
-            with open(rules_path, "w", encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            save_hub_rules_data(data)
             
             logger.info(f"Successfully saved rule with ID: {rule_data['id']}")
             return JSONResponse({
@@ -406,17 +468,9 @@ async def save_hub_rule(request: Request):
 @app.post("/hub-rules/delete/{rule_id}")
 async def delete_hub_rule(rule_id: str):
     try:
-        rules_path = Path("data/hub_rules.json")
-        if not rules_path.exists():
-            return JSONResponse({
-                "success": False,
-                "message": "Rules file not found"
-            }, status_code=404)
-            
         try:
-            with open(rules_path, "r", encoding='utf-8') as f:
-                data = json.load(f)
-        except json.JSONDecodeError as e:
+            data = copy.deepcopy(get_hub_rules_data())
+        except (json.JSONDecodeError, ValueError) as e:
             logger.error(f"Invalid JSON in hub_rules.json: {e}")
             return JSONResponse({
                 "success": False,
@@ -434,8 +488,7 @@ async def delete_hub_rule(rule_id: str):
             }, status_code=404)
             
         try:
-            with open(rules_path, "w", encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            save_hub_rules_data(data)
             
             logger.info(f"Successfully deleted rule with ID: {rule_id}")
             return JSONResponse({
@@ -463,9 +516,7 @@ async def read_root(request: Request):
 @app.get("/finishing-rules", response_class=HTMLResponse)
 async def finishing_rules(request: Request):
     try:
-        rules_path = Path("data/finishing_rules.json")
-        with open(rules_path, "r") as f:
-            rules = json.load(f)
+        rules = get_finishing_rules_data()
         return templates.TemplateResponse(
             "finishing_rules.html",
             {"request": request, "rules": rules}
@@ -476,17 +527,14 @@ async def finishing_rules(request: Request):
 @app.post("/finishing-rules/delete/{rule_id}")
 async def delete_rule(rule_id: str):
     try:
-        rules_path = Path("data/finishing_rules.json")
-        with open(rules_path, "r") as f:
-            rules = json.load(f)
+        rules = copy.deepcopy(get_finishing_rules_data())
 
         # Try to remove from keyword rules
         rules["keywordRules"] = [r for r in rules["keywordRules"] if r["id"] != rule_id]
         # Try to remove from center rules
         rules["centerRules"] = [r for r in rules["centerRules"] if r["id"] != rule_id]
 
-        with open(rules_path, "w") as f:
-            json.dump(rules, f, indent=2)
+        save_finishing_rules_data(rules)
 
         return JSONResponse({"success": True, "message": "Rule deleted successfully"})
     except Exception as e:
@@ -712,32 +760,78 @@ async def delete_preflight_rule_endpoint(rule_id: str):
         return JSONResponse({"success": False, "message": f"Error deleting rule: {str(e)}"}, status_code=500)
 
 @app.post("/schedule", response_model=ScheduleResponse)
-def schedule_order(request_data: ScheduleRequest, request: Request):
-    """Process a scheduling request"""
+async def schedule_order(request_data: ScheduleRequest, request: Request):
+    """Process a scheduling request (on the event loop or threadpool, per SCHEDULE_EXECUTION_MODE)"""
+    mark_timing("validate")
     try:
         
         # --- TRY ACCESSING HERE ---
-        logger.debug(f"Attempting to access centerId directly on request_data object...")
+        logger.debug("Attempting to access centerId directly on request_data object...")
         cid = getattr(request_data, 'centerId', 'ATTRIBUTE_NOT_FOUND') # Use getattr for safety
-        logger.info(f"Value of request_data.centerId via getattr: {cid} (Type: {type(cid)})")
+        logger.info("Value of request_data.centerId via getattr: %s (Type: %s)", cid, type(cid))
         # You could even try a direct access here and let it raise the error if it occurs
         # logger.info(f"Direct access request_data.centerId: {request_data.centerId}")
         # --- END TRY ACCESSING HERE ---
         
-        result = process_order(request_data)
+        result = await run_process_order(request_data)
         if not result:
             logger.error("Unable to schedule order.")
             raise HTTPException(status_code=400, detail="Unable to schedule order.")
-        return result
+        # Already a valid ScheduleResponse: send it as is rather than re-validating it against response_model
+        return FastJSONResponse(response_content(result))
     except Exception as e:
-        logger.error(f"Error processing order: {str(e)}")
+        logger.error("Error processing order: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
     if not result:
         logger.error("Unable to schedule order.")
         raise HTTPException(status_code=400, detail="Unable to schedule order.")
-    logger.debug(f"Scheduling result: {result}")
+    logger.debug("Scheduling result: %s", result)
     return result
 
+@app.post("/schedule/batch", response_model=ScheduleBatchResponse, tags=["Scheduling"])
+def schedule_batch_orders(orders: List[Any] = Body(..., description="List of ScheduleRequest objects; items that are not valid orders are reported per item.")):
+    """
+    Schedule many orders in one call. Every order is evaluated against the same config
+    snapshot and the same server time; invalid or failing orders are reported per item.
+    """
+    if len(orders) > SCHEDULE_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch too large: {len(orders)} orders (max {SCHEDULE_BATCH_MAX_ITEMS}).")
+    mark_timing("validate")
+    # Results are plain dicts already; skip re-validating thousands of response models
+    return FastJSONResponse(schedule_batch(orders))
+
+@app.post("/schedule/forecast", response_model=ScheduleForecastResponse, tags=["Scheduling"])
+def schedule_forecast(request_data: ScheduleForecastRequest):
+    """
+    Forecast an order's dispatch date for every placement time over the next `horizonHours`.
+    The order is matched and routed once; the result lists consecutive intervals
+    ("orders placed between placedFrom and placedTo dispatch on dispatchDate").
+    """
+    if request_data.horizonHours > SCHEDULE_FORECAST_MAX_HOURS:
+        raise HTTPException(status_code=400, detail=f"horizonHours too large: {request_data.horizonHours} (max {SCHEDULE_FORECAST_MAX_HOURS}).")
+    mark_timing("validate")
+    try:
+        result = forecast_order(request_data.order, request_data.horizonHours)
+    except Exception as e:
+        logger.error("Error forecasting order: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    if not result:
+        raise HTTPException(status_code=400, detail="Unable to schedule order.")
+    return FastJSONResponse(result)
+
+@app.post("/schedule/stream", tags=["Scheduling"], response_class=NDJSONStreamingResponse)
+async def schedule_order_stream(request: Request):
+    """
+    Schedule a newline-delimited feed of ScheduleRequest objects. Results are streamed back as
+    newline-delimited ScheduleBatchItem objects, in input order, as each chunk completes.
+    All orders use the config snapshot and server time from the start of the stream.
+    """
+    snapshot = await get_config_snapshot_async()
+    return NDJSONStreamingResponse(
+        stream_schedule(request.stream(), snapshot),
+        headers={"X-Config-Version": str(snapshot.version)},
+    )
+
 @app.get("/schedule-overrides", response_class=HTMLResponse)
 async def schedule_overrides(request: Request):
     try:
@@ -808,7 +902,7 @@ async def update_product(request: Request, product_id: str):
         product_data = await request.json()
         logger.debug(f"Updating product with ID: {product_id} with data: {product_data}")
         
-        data = get_product_info_data()
+        data = copy.deepcopy(get_product_info_data())
         if product_id not in data:
             logger.error(f"Product with ID {product_id} not found.")
             raise HTTPException(status_code=404, detail="Product not found.")
@@ -846,7 +940,7 @@ async def create_new_product(request: Request):
     product_id = form_data.get("product_id")
     logger.debug(f"Creating new product with ID: {product_id}")
     
-    data = get_product_info_data()
+    data = copy.deepcopy(get_product_info_data())
     if product_id in data:
         logger.error(f"Product ID {product_id} already exists.")
         raise HTTPException(status_code=400, detail="Product ID already exists.")
@@ -873,7 +967,7 @@ async def create_new_product(request: Request):
 @app.get("/products/delete/{product_id}")
 async def delete_product(product_id: str):
     logger.debug(f"Deleting product with ID: {product_id}")
-    data = get_product_info_data()
+    data = copy.deepcopy(get_product_info_data())
     if product_id in data:
         del data[product_id]
         save_product_info_data(data)
@@ -0,0 +1,112 @@
+# app/match_cache.py
+# Bounded LRU memo of product matching results. MIS traffic repeats a small set of descriptions,
+# so the keyword scan, printType/hub checks and production group assignment are cached per
+# normalised description. Entries are stamped with the config data they were computed from.
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from app.config_snapshot import ConfigSnapshot
+from app.metrics import register_cache
+
+logger = logging.getLogger(__name__)
+
+MATCH_CACHE_SIZE = int(os.getenv("MATCH_CACHE_SIZE", "4096"))
+
+# (lowercased description after the BC / premium uncoated rewrites, printType, current hub ID,
+#  whether " BC" was appended — production groups are matched on the description before that)
+MatchKey = Tuple[str, int, Optional[int], bool]
+
+
+class ProductMatch(NamedTuple):
+    product_id: Optional[int]  # None = no keyword match (caller falls back to product 99)
+    production_groups: Tuple[str, ...]
+
+
+class MatchCache:
+    """
+    Thread-safe LRU cache of ProductMatch results.
+    Results depend on product_keywords.json, product_info.json and production_groups.json only,
+    so the cache is flushed when a snapshot carries different objects for any of them rather
+    than on every config version bump.
+    """
+
+    def __init__(self, maxsize: int = MATCH_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[MatchKey, ProductMatch]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stamp: Tuple = ()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _stamp_for(snapshot: ConfigSnapshot) -> Tuple:
+        # Holding the objects (not their ids) keeps the identity check safe from id reuse
+        return (snapshot.product_keywords, snapshot.product_info, snapshot.production_groups)
+
+    def _check_stamp(self, snapshot: ConfigSnapshot) -> bool:
+        """Flush if the snapshot's data differs from the cached stamp. Caller holds the lock."""
+        stamp = self._stamp_for(snapshot)
+        if len(self._stamp) == len(stamp) and all(a is b for a, b in zip(self._stamp, stamp)):
+            return True
+        if self._entries:
+            self.invalidations += 1
+            logger.info("Product match cache invalidated for config version %s (%s entries dropped)", snapshot.version, len(self._entries))
+        self._entries.clear()
+        self._stamp = stamp
+        return False
+
+    def get(self, snapshot: ConfigSnapshot, key: MatchKey) -> Optional[ProductMatch]:
+        if self.maxsize <= 0:
+            return None
+        with self._lock:
+            if self._check_stamp(snapshot):
+                match = self._entries.get(key)
+                if match is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return match
+            self.misses += 1
+            return None
+
+    def put(self, snapshot: ConfigSnapshot, key: MatchKey, match: ProductMatch) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._check_stamp(snapshot)
+            self._entries[key] = match
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stamp = ()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+product_match_cache = MatchCache()
+
+
+def _cache_stats() -> Tuple[int, int, int]:
+    stats = product_match_cache.stats()
+    return stats["hits"], stats["misses"], stats["size"]
+
+
+register_cache("product_match", _cache_stats)
@@ -0,0 +1,274 @@
+# app/metrics.py
+# Minimal in-process metrics rendered in the Prometheus text format at /metrics.
+# Counters and histograms are plain Python objects guarded by a per-metric lock; values that
+# already live elsewhere (cache statistics) are read through collector callbacks at scrape time.
+# Every worker process keeps its own registry, so scrape each worker (or aggregate by instance).
+import bisect
+import logging
+import os
+import threading
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").lower() in ("1", "true", "yes")
+
+# Seconds. Scheduling stages run in microseconds to milliseconds; HTTP requests up to seconds
+STAGE_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+REQUEST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"  # Starlette appends the charset
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines.extend(f"{self.name}{_label_text(self.label_names, labels)} {_number(value)}" for labels, value in values)
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (), buckets: Sequence[float] = STAGE_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (non-cumulative, last is +Inf), sum]
+        self._series: Dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][position] += 1
+            series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_label_text(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.label_names, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_label_text(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Read at scrape time from a callback returning {labels: value}."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], collect: Callable[[], Dict[Labels, float]],
+                 metric_type: str = "gauge"):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.collect = collect
+        self.metric_type = metric_type
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.metric_type}"]
+        try:
+            values = sorted(self.collect().items())
+        except Exception as e:
+            logger.error("Metrics collector %s failed: %s", self.name, e)
+            return lines
+        lines.extend(f"{self.name}{_label_text(self.label_names, labels)} {_number(value)}" for labels, value in values)
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[object] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+schedule_stage_seconds = registry.register(Histogram(
+    "schedule_stage_seconds", "Time spent in each process_order stage.", ["stage"], STAGE_BUCKETS))
+schedule_order_seconds = registry.register(Histogram(
+    "schedule_order_seconds", "Total process_order time per order.", [], STAGE_BUCKETS))
+schedule_orders_total = registry.register(Counter(
+    "schedule_orders_total", "Orders run through process_order, by outcome (scheduled, unscheduled, error).", ["outcome"]))
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route, method and status code.", ["path", "method", "status"]))
+http_request_seconds = registry.register(Histogram(
+    "http_request_seconds", "HTTP request latency by route and method.", ["path", "method"], REQUEST_BUCKETS))
+
+
+# ---------- Stage timing ----------
+
+class StageClock:
+    """Records the time between successive lap() calls as named stages."""
+    __slots__ = ("started", "_last", "laps")
+
+    def __init__(self):
+        self.started = self._last = perf_counter()
+        self.laps: List[Tuple[str, float]] = []
+
+    def lap(self, stage: str) -> None:
+        now = perf_counter()
+        self.laps.append((stage, now - self._last))
+        self._last = now
+
+    def total(self) -> float:
+        return self._last - self.started
+
+
+class _NullClock:
+    """Stand-in when metrics are disabled: lap() does nothing."""
+    __slots__ = ()
+    laps: Tuple = ()
+
+    def lap(self, stage: str) -> None:
+        pass
+
+    def total(self) -> float:
+        return 0.0
+
+
+NULL_CLOCK = _NullClock()
+
+
+def start_clock(force: bool = False):
+    """A StageClock when metrics are enabled (or `force`, e.g. for Server-Timing), else NULL_CLOCK."""
+    return StageClock() if METRICS_ENABLED or force else NULL_CLOCK
+
+
+def observe_order(clock, outcome: str) -> None:
+    """Record one process_order run: every stage lap, the total and the outcome."""
+    if clock is NULL_CLOCK or not METRICS_ENABLED:
+        return
+    for stage, seconds in clock.laps:
+        schedule_stage_seconds.observe(seconds, stage)
+    schedule_order_seconds.observe(clock.total())
+    schedule_orders_total.inc(outcome)
+
+
+# ---------- HTTP middleware ----------
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (it never buffers request or response bodies, so streaming endpoints
+    are unaffected) counting requests and timing them per route template.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: Optional[Dict[object, str]] = None
+
+    def _route_path(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if self._route_paths is None and "app" in scope:
+            routes = getattr(scope["app"], "routes", [])
+            self._route_paths = {getattr(r, "endpoint", None): getattr(r, "path", "") for r in routes}
+        if endpoint is not None and self._route_paths:
+            path = self._route_paths.get(endpoint)
+            if path:
+                return path
+        # Unmatched paths (404s, static files) share one label to keep cardinality bounded
+        return "/static" if scope.get("path", "").startswith("/static/") else "other"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        start = perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            path = self._route_path(scope)
+            http_requests_total.inc(path, scope["method"], str(status[0]))
+            http_request_seconds.observe(perf_counter() - start, path, scope["method"])
+
+
+# ---------- Cache statistics ----------
+
+# name -> callback returning (hits, misses, entries)
+_caches: Dict[str, Callable[[], Tuple[int, int, int]]] = {}
+
+
+def register_cache(name: str, stats: Callable[[], Tuple[int, int, int]]) -> None:
+    """Expose a cache's (hits, misses, entries) on /metrics, read at scrape time."""
+    _caches[name] = stats
+
+
+def _collect_caches(field: int) -> Dict[Labels, float]:
+    return {(name,): stats()[field] for name, stats in _caches.items()}
+
+
+def _collect_hit_ratios() -> Dict[Labels, float]:
+    ratios = {}
+    for name, stats in _caches.items():
+        hits, misses, _ = stats()
+        ratios[(name,)] = hits / (hits + misses) if hits + misses else 0.0
+    return ratios
+
+
+registry.register(Gauge("cache_hits_total", "Cache hits.", ["cache"], lambda: _collect_caches(0), "counter"))
+registry.register(Gauge("cache_misses_total", "Cache misses.", ["cache"], lambda: _collect_caches(1), "counter"))
+registry.register(Gauge("cache_entries", "Entries currently held.", ["cache"], lambda: _collect_caches(2)))
+registry.register(Gauge("cache_hit_ratio", "Hits / (hits + misses) since start-up.", ["cache"], _collect_hit_ratios))
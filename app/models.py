@@ -208,4 +208,40 @@ class ScheduleResponse(BaseModel):
    
     # Time Info <<< ADDED BLOCK
     actualProcessingTime: str = Field(..., description="Actual server time (incl. timezone) when the request was processed.")
-    simulatedProcessingTime: Optional[str] = Field(None, description="Simulated time (incl. timezone) used for calculation if timeOffsetHours was non-zero.")
\ No newline at end of file
+    simulatedProcessingTime: Optional[str] = Field(None, description="Simulated time (incl. timezone) used for calculation if timeOffsetHours was non-zero.")
+
+class ScheduleBatchItem(BaseModel):
+    """Outcome for one order in a /schedule/batch request: either a result or an error."""
+    index: int = Field(..., description="Position of the order in the submitted batch.")
+    orderId: Optional[str] = Field(None, description="orderId from the submitted order, if it could be read.")
+    result: Optional[ScheduleResponse] = Field(None, description="The schedule, if the order was processed successfully.")
+    error: Optional[str] = Field(None, description="Why the order could not be scheduled (validation or processing error).")
+
+class ScheduleBatchResponse(BaseModel):
+    """Output model for the /schedule/batch endpoint."""
+    configVersion: int = Field(..., description="Config version every order in the batch was evaluated against.")
+    processedAt: str = Field(..., description="The single server time (UTC, ISO format) used for every order in the batch.")
+    succeeded: int = Field(..., description="Number of orders scheduled successfully.")
+    failed: int = Field(..., description="Number of orders that returned an error.")
+    results: List[ScheduleBatchItem] = Field(..., description="One entry per submitted order, in submission order.")
+
+class ScheduleForecastRequest(BaseModel):
+    """Input model for the /schedule/forecast endpoint."""
+    order: ScheduleRequest = Field(..., description="The order to forecast. Its timeOffsetHours (if any) moves the start of the horizon.")
+    horizonHours: int = Field(336, gt=0, description="How many hours ahead of the (simulated) processing time to forecast.", example=336)
+
+class DispatchForecastInterval(BaseModel):
+    """Orders placed in [placedFrom, placedTo) get the same start and dispatch dates."""
+    placedFrom: str = Field(..., description="Start of the interval (hub-local time, ISO format, inclusive).")
+    placedTo: str = Field(..., description="End of the interval (hub-local time, ISO format, exclusive).")
+    adjustedStartDate: str = Field(..., description="Production start date (after weekend/holiday adjustment) for orders placed in the interval.")
+    dispatchDate: Optional[str] = Field(None, description="Dispatch date for orders placed in the interval (null for the fallback product).")
+
+class ScheduleForecastResponse(BaseModel):
+    """Output model for the /schedule/forecast endpoint."""
+    configVersion: int = Field(..., description="Config version the forecast was evaluated against.")
+    processedAt: str = Field(..., description="Server time (UTC, ISO format) the horizon is measured from.")
+    timezone: str = Field(..., description="Timezone of the chosen production hub; interval times are in this zone.")
+    horizonHours: int = Field(..., description="Length of the forecast horizon in hours.")
+    schedule: ScheduleResponse = Field(..., description="The full schedule for an order placed at the start of the horizon.")
+    intervals: List[DispatchForecastInterval] = Field(..., description="Consecutive placement intervals covering the horizon; adjacent intervals have different dates.")
@@ -0,0 +1,87 @@
+# app/postcode_index.py
+# Dense postcode -> hub lookup compiled once per config snapshot from hub_data.json.
+# Replaces re-splitting every hub's comma-separated postcode string on each request.
+import logging
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from app.config_snapshot import register_index
+
+logger = logging.getLogger(__name__)
+
+POSTCODE_SLOTS = 10000  # 0000-9999
+_UNASSIGNED = -1
+
+
+def is_canonical_postcode(postcode) -> bool:
+    """Exactly four ASCII digits - the only form the dense table answers directly."""
+    return isinstance(postcode, str) and len(postcode) == 4 and postcode.isascii() and postcode.isdigit()
+
+
+class PostcodeIndex:
+    """
+    One slot per four-digit postcode holding the index of the first hub_data entry that claims it,
+    so lookups keep the list-order precedence of the original linear scan.
+    Anything else (short/padded postcodes, or hub_data the compiler can't represent exactly)
+    is reported via handles() so callers use the original scan instead.
+    """
+
+    def __init__(self, hub_data: List[Dict]):
+        self._hubs: List[Tuple[str, int]] = []
+        self._slots = array("h", [_UNASSIGNED]) * POSTCODE_SLOTS
+        self.overlaps: Dict[Tuple[str, str], int] = {}
+        self.exact = True  # False if some entry can only be evaluated by the original scan
+
+        for entry_index, entry in enumerate(hub_data):
+            self._hubs.append((entry.get("hubName"), entry.get("hubId")))
+            range_string = entry.get("postcode")
+            if not isinstance(range_string, str):
+                logger.warning("hub_data entry '%s' has no postcode string; postcode index disabled", entry.get('hubName'))
+                self.exact = False
+                continue
+            for segment in range_string.split(","):
+                segment = segment.strip()
+                if "-" in segment:
+                    parts = segment.split("-")
+                    if len(parts) != 2:
+                        # The scan raises on these, so leave the behaviour to it
+                        logger.warning("Malformed postcode range '%s' for hub '%s'; postcode index disabled", segment, entry.get('hubName'))
+                        self.exact = False
+                        continue
+                    try:
+                        start, end = int(parts[0]), int(parts[1])
+                    except ValueError:
+                        continue  # Skipped by the scan as well
+                    self._claim(range(max(start, 0), min(end, POSTCODE_SLOTS - 1) + 1), entry_index)
+                elif is_canonical_postcode(segment):
+                    self._claim((int(segment),), entry_index)
+                # Other exact segments ('', '800', '30000') can never equal a four-digit postcode
+
+        if self.overlaps:
+            summary = ", ".join(f"{a}/{b}: {n}" for (a, b), n in sorted(self.overlaps.items()))
+            logger.warning("Postcodes claimed by more than one hub (first listed wins): %s", summary)
+        logger.debug("Compiled postcode index for %s hubs (exact=%s)", len(self._hubs), self.exact)
+
+    def _claim(self, postcodes, entry_index: int) -> None:
+        slots = self._slots
+        for p in postcodes:
+            owner = slots[p]
+            if owner == _UNASSIGNED:
+                slots[p] = entry_index
+            elif owner != entry_index:
+                key = (self._hubs[owner][0], self._hubs[entry_index][0])
+                self.overlaps[key] = self.overlaps.get(key, 0) + 1
+
+    def handles(self, postcode) -> bool:
+        return self.exact and is_canonical_postcode(postcode)
+
+    def lookup(self, postcode: str) -> Optional[Dict]:
+        """O(1) lookup for a postcode accepted by handles()."""
+        owner = self._slots[int(postcode)]
+        if owner == _UNASSIGNED:
+            return None
+        hub_name, hub_id = self._hubs[owner]
+        return {"hubName": hub_name, "hubId": hub_id}
+
+
+register_index("postcode_index", lambda snapshot: PostcodeIndex(snapshot.hub_data))
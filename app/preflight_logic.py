@@ -1,20 +1,31 @@
 # app/preflight_logic.py
 import logging
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from app.models import ScheduleRequest, PreflightRule, OrderMatchingCriteria, PreflightProfile
-from app.data_manager import get_preflight_rules_data, get_product_info_data, get_preflight_profiles_data
 from app.imposing_logic import check_order_criteria # Reuse criteria checking logic
 from app.hub_selection import check_dates # Reuse date checking logic
+from app.config_snapshot import ConfigSnapshot, get_config_snapshot, register_index
+from app.product_catalog import get_product_catalog
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
 DEFAULT_PREFLIGHT_PROFILE_ID = 0 # 0 = Do Not Preflight
-DEFAULT_PREFLIGHT_PROFILE_ID = 0 # 0 = Do Not Preflight
+DEFAULT_PREFLIGHT_PROFILE_NAME = "NoPreflight"
+
+def _build_preflight_rules(snapshot: ConfigSnapshot) -> Tuple[List[PreflightRule], Dict[int, PreflightProfile]]:
+    """Parse preflight rules (sorted by priority, highest first) and the profile lookup map."""
+    if snapshot.preflight_rules is None or snapshot.preflight_profiles is None:
+        raise ValueError("preflight rules or profiles could not be loaded")
+    rules: List[PreflightRule] = [PreflightRule(**r) for r in snapshot.preflight_rules]
+    profiles: List[PreflightProfile] = [PreflightProfile(**p) for p in snapshot.preflight_profiles]
+    rules.sort(key=lambda x: x.priority, reverse=True)
+    return rules, {p.id: p for p in profiles}
+
+register_index("preflight_rules", _build_preflight_rules)
 
 # MODIFIED: Added chosen_hub argument
-def determine_preflight_action(req: ScheduleRequest, product_id: int, chosen_hub: str) -> Tuple[int, Optional[str]]:
+def determine_preflight_action(req: ScheduleRequest, product_id: int, chosen_hub: str, snapshot: Optional[ConfigSnapshot] = None) -> Tuple[int, Optional[str]]:
     """
     Determines the SynergyPreflight profile ID based on matching preflight rules.
     Args:
@@ -25,37 +36,32 @@ def determine_preflight_action(req: ScheduleRequest, product_id: int, chosen_hub
         Tuple[int, Optional[str]]: The preflight profile ID and its corresponding name.
                                    Defaults to (0, "NoPreflight").
     """
-    logger.debug(f"Determining preflight action for OrderID: {req.orderId}, ProductID: {product_id}")
+    logger.debug("Determining preflight action for OrderID: %s, ProductID: %s", req.orderId, product_id)
+    if snapshot is None:
+        snapshot = get_config_snapshot()
 
     try:
-        rules_data = get_preflight_rules_data()
-        profiles_data = get_preflight_profiles_data() # Load profiles to get names
-        # Convert raw data list to list of Pydantic models for validation and easier access
-        rules: List[PreflightRule] = [PreflightRule(**r) for r in rules_data]
-        profiles: List[PreflightProfile] = [PreflightProfile(**p) for p in profiles_data]
-        profile_map = {p.id: p for p in profiles} # Create a map for easy lookup
-        logger.debug(f"Loaded {len(rules)} preflight rules and {len(profiles)} profiles.")
+        # Parsed once per config version; rules already sorted by priority (highest first)
+        rules, profile_map = snapshot.index("preflight_rules")
+        logger.debug("Loaded %s preflight rules and %s profiles.", len(rules), len(profile_map))
     except Exception as e:
-        logger.error(f"Failed to load or parse preflight rules/profiles: {e}. Using default action.")
+        logger.error("Failed to load or parse preflight rules/profiles: %s. Using default action.", e)
         return DEFAULT_PREFLIGHT_PROFILE_ID, DEFAULT_PREFLIGHT_PROFILE_NAME
 
-    # Sort rules by priority (highest first)
-    rules.sort(key=lambda x: x.priority, reverse=True)
-    all_product_info = get_product_info_data()
-    product_obj = all_product_info.get(str(product_id)) # Product info uses string keys
-    order_product_group: Optional[str] = product_obj.get("Product_Group") if product_obj else None
-    if not product_obj:
-        logger.warning(f"Product object not found for Product ID {product_id} when checking preflight rules. Product Group checks may fail.")
+    product = get_product_catalog(snapshot).get(product_id)
+    order_product_group: Optional[str] = product.product_group if product else None
+    if product is None:
+        logger.warning("Product object not found for Product ID %s when checking preflight rules. Product Group checks may fail.", product_id)
 
     for rule in rules:
-        logger.debug(f"Evaluating preflight rule ID: {rule.id}, Priority: {rule.priority}")
+        logger.debug("Evaluating preflight rule ID: %s, Priority: %s", rule.id, rule.priority)
 
         if not rule.enabled:
-            logger.debug(f"Skipping rule {rule.id} (disabled).")
+            logger.debug("Skipping rule %s (disabled).", rule.id)
             continue
 
         if not check_dates(rule):
-             logger.debug(f"Skipping rule {rule.id} (outside valid date range).")
+             logger.debug("Skipping rule %s (outside valid date range).", rule.id)
              continue # Correct indentation
 
         # Check criteria match
@@ -65,21 +71,21 @@ def determine_preflight_action(req: ScheduleRequest, product_id: int, chosen_hub
             if check_order_criteria(rule.orderCriteria, req, product_id, order_product_group, chosen_hub):
                 criteria_match = True
             else:
-                logger.debug(f"Rule {rule.id} did not match order criteria.")
+                logger.debug("Rule %s did not match order criteria.", rule.id)
                 continue # Skip to next rule if criteria defined but don't match
         else:
             # No criteria defined, so it matches this part
             criteria_match = True
-            logger.debug(f"Rule {rule.id} has no orderCriteria defined, considering it a match.")
+            logger.debug("Rule %s has no orderCriteria defined, considering it a match.", rule.id)
 
         # If criteria matched (or none were defined)
         if criteria_match:
-            logger.info(f"Preflight rule {rule.id} matched. Setting profile ID to {rule.preflightProfileId}.")
+            logger.info("Preflight rule %s matched. Setting profile ID to %s.", rule.id, rule.preflightProfileId)
             matched_profile = profile_map.get(rule.preflightProfileId)
             if matched_profile:
                 return matched_profile.id, matched_profile.preflightProfileName
             else:
-                logger.warning(f"Preflight rule {rule.id} matched, but Profile ID {rule.preflightProfileId} not found in profiles data. Returning ID with default name.")
+                logger.warning("Preflight rule %s matched, but Profile ID %s not found in profiles data. Returning ID with default name.", rule.id, rule.preflightProfileId)
                 # Return the ID specified by the rule, but indicate the name is missing/default
                 return rule.preflightProfileId, f"UnknownProfile_{rule.preflightProfileId}"
 
@@ -0,0 +1,151 @@
+# app/process_backend.py
+# Optional multi-process execution for batch and stream scheduling.
+# process_order is pure-Python CPU work, so one interpreter uses one core no matter how many
+# threads run it. With SCHEDULE_PROCESS_WORKERS > 0, chunks of orders are scheduled in a
+# ProcessPoolExecutor whose workers each build the config snapshot (and its indexes) once at
+# start-up. The pool belongs to one config version: when a newer snapshot is seen, a new pool
+# is started and the old one shuts down once the requests still using it have finished.
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from app.config_snapshot import ConfigSnapshot
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_PROCESS_WORKERS = int(os.getenv("SCHEDULE_PROCESS_WORKERS", "0"))
+SCHEDULE_PROCESS_CHUNK_ITEMS = int(os.getenv("SCHEDULE_PROCESS_CHUNK_ITEMS", "256"))
+
+# Chunk functions take (items, start_index, snapshot, now) and return picklable results
+ChunkFunction = Callable[[List[Any], int, ConfigSnapshot, datetime], Any]
+
+# ---------- Worker side ----------
+
+_worker_snapshot: Optional[ConfigSnapshot] = None
+
+
+def _init_worker(files: Dict[str, Any], version: int, logging_disabled: int) -> None:
+    global _worker_snapshot
+    logging.disable(logging_disabled)
+    # Importing the scheduler registers every snapshot index before the build
+    import app.batch_scheduler  # noqa: F401
+    snapshot = ConfigSnapshot(version=version, **files)
+    snapshot.build_indexes()
+    _worker_snapshot = snapshot
+
+
+def _run_chunk(version: int, func: ChunkFunction, items: List[Any], start_index: int, now: datetime) -> Any:
+    if _worker_snapshot is None or _worker_snapshot.version != version:
+        raise RuntimeError(f"Scheduling worker holds config version "
+                           f"{getattr(_worker_snapshot, 'version', None)}, expected {version}")
+    return func(items, start_index, _worker_snapshot, now)
+
+# ---------- Parent side ----------
+
+
+class _PoolGeneration:
+    def __init__(self, snapshot: ConfigSnapshot, workers: int):
+        self.version = snapshot.version
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            # Never fork a process that already runs server threads
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(snapshot.raw_files(), snapshot.version, logging.root.manager.disable),
+        )
+        self.leases = 0
+        self.retired = False
+
+
+class SchedulingPool:
+    """A ProcessPoolExecutor per config version, handed out through lease()."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._current: Optional[_PoolGeneration] = None
+
+    @contextmanager
+    def lease(self, snapshot: ConfigSnapshot) -> Iterator[Optional["PoolLease"]]:
+        """
+        Use the pool for `snapshot`'s config version, recycling the pool if the version is newer.
+        Yields None for a snapshot older than the running pool; the caller then schedules in-process.
+        """
+        with self._lock:
+            generation = self._current
+            if generation is None or generation.version < snapshot.version:
+                if generation is not None:
+                    logger.info(f"Config version {snapshot.version} replaces {generation.version}; recycling scheduling pool")
+                    self._retire(generation)
+                logger.info(f"Starting {self.workers} scheduling worker processes for config version {snapshot.version}")
+                generation = self._current = _PoolGeneration(snapshot, self.workers)
+            if generation.version != snapshot.version:
+                generation = None
+            else:
+                generation.leases += 1
+        if generation is None:
+            yield None
+            return
+        try:
+            yield PoolLease(generation.executor, generation.version, self.workers)
+        finally:
+            with self._lock:
+                generation.leases -= 1
+                if generation.retired and generation.leases == 0:
+                    generation.executor.shutdown(wait=False)
+
+    def _retire(self, generation: _PoolGeneration) -> None:
+        generation.retired = True
+        if generation.leases == 0:
+            generation.executor.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._current is not None:
+                self._retire(self._current)
+                self._current = None
+
+
+class PoolLease:
+    """One request's use of a pool generation."""
+
+    def __init__(self, executor: ProcessPoolExecutor, version: int, workers: int):
+        self.executor = executor
+        self.version = version
+        # Enough queued chunks to keep every worker busy while results are consumed in order
+        self.max_in_flight = workers * 2
+
+    def submit(self, func: ChunkFunction, items: List[Any], start_index: int, now: datetime) -> Future:
+        return self.executor.submit(_run_chunk, self.version, func, items, start_index, now)
+
+    def map_chunks(self, func: ChunkFunction, items: Iterable[Any], now: datetime,
+                   chunk_items: int = SCHEDULE_PROCESS_CHUNK_ITEMS) -> Iterator[Any]:
+        """Run `func` over consecutive chunks of `items`, yielding each chunk's result in order."""
+        pending: deque = deque()
+        chunk: List[Any] = []
+        start_index = 0
+        try:
+            for item in items:
+                chunk.append(item)
+                if len(chunk) == chunk_items:
+                    pending.append(self.submit(func, chunk, start_index, now))
+                    start_index += len(chunk)
+                    chunk = []
+                    if len(pending) >= self.max_in_flight:
+                        yield pending.popleft().result()
+            if chunk:
+                pending.append(self.submit(func, chunk, start_index, now))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+scheduling_pool: Optional[SchedulingPool] = SchedulingPool(SCHEDULE_PROCESS_WORKERS) if SCHEDULE_PROCESS_WORKERS > 0 else None
@@ -0,0 +1,106 @@
+# app/product_catalog.py
+# Indexed, pre-parsed view of product_info.json built once per config snapshot.
+# Replaces repeated string-keyed dict lookups and per-request int()/list parsing on the hot path.
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterator, Optional, Tuple
+
+from app.config_snapshot import ConfigSnapshot, register_index
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_START_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+# Used when the matched (or fallback) product ID is missing from product_info.json
+FALLBACK_PRODUCT_DATA = {
+    "Product_Category": "Default Fallback Product", "Product_Group": "Unknown", "Product_ID": 99,
+    "Production_Hub": ["vic", "nsw", "qld", "wa", "nqld"], "Cutoff": "12", "SynergyPreflight": 0, "SynergyImpose": 0,
+    "EnableAutoHubTransfer": 1, "scheduleAppliesTo": [1, 2, 3, 5, 24], "Start_days": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
+    "Days_to_produce": "3", "Modified_run_date": [], "printTypes": [1, 2, 3]
+}
+
+
+def _parse_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class ProductRecord:
+    """A single product_info.json entry with its scheduling fields parsed up front."""
+    product_id: int
+    product_group: Optional[str]
+    product_category: Optional[str]
+    production_hubs: Tuple[str, ...]        # As configured; echoed back in responses
+    production_hubs_lower: Tuple[str, ...]  # Normalised for hub selection
+    cutoff: Optional[int]                   # None if the configured value is not an integer
+    days_to_produce: Optional[int]
+    start_days: Tuple[str, ...]
+    print_types: FrozenSet[int]
+    schedule_applies_to: FrozenSet[int]     # Empty means the product applies to every hub
+    raw: Dict[str, Any]                     # Original entry (read-only), for rules that inspect it
+
+    @classmethod
+    def from_data(cls, product_id: int, data: Dict[str, Any]) -> "ProductRecord":
+        production_hubs = tuple(data.get("Production_Hub", []))
+        return cls(
+            product_id=product_id,
+            product_group=data.get("Product_Group", "Unknown"),
+            product_category=data.get("Product_Category", "Unknown"),
+            production_hubs=production_hubs,
+            production_hubs_lower=tuple(h.lower() for h in production_hubs),
+            cutoff=_parse_int(data.get("Cutoff", "12")),
+            days_to_produce=_parse_int(data.get("Days_to_produce", 1)),
+            start_days=tuple(data.get("Start_days", DEFAULT_START_DAYS)),
+            print_types=frozenset(data.get("printTypes", []) or []),
+            schedule_applies_to=frozenset(data.get("scheduleAppliesTo", []) or []),
+            raw=data,
+        )
+
+    def supports_print_type(self, print_type: int) -> bool:
+        return print_type in self.print_types
+
+    def applies_to_hub(self, hub_id: Optional[int]) -> bool:
+        return not self.schedule_applies_to or hub_id in self.schedule_applies_to
+
+
+FALLBACK_PRODUCT = ProductRecord.from_data(99, FALLBACK_PRODUCT_DATA)
+
+
+class ProductCatalog:
+    """Int-keyed lookup of ProductRecords for one config version."""
+
+    def __init__(self, product_info: Dict[str, Dict[str, Any]]):
+        self._records: Dict[int, ProductRecord] = {}
+        for key, data in product_info.items():
+            product_id = _parse_int(key)
+            if product_id is None:
+                logger.warning("Skipping product_info entry with non-integer key '%s'", key)
+                continue
+            self._records[product_id] = ProductRecord.from_data(product_id, data)
+
+    def get(self, product_id: Any) -> Optional[ProductRecord]:
+        record = self._records.get(product_id)
+        if record is None and not isinstance(product_id, int):
+            # Tolerate string IDs from hand-edited keyword files
+            parsed = _parse_int(product_id)
+            record = self._records.get(parsed) if parsed is not None else None
+        return record
+
+    def __contains__(self, product_id: Any) -> bool:
+        return self.get(product_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[ProductRecord]:
+        return iter(self._records.values())
+
+
+def get_product_catalog(snapshot: ConfigSnapshot) -> ProductCatalog:
+    return snapshot.index("product_catalog")
+
+
+register_index("product_catalog", lambda snapshot: ProductCatalog(snapshot.product_info))
@@ -1,58 +1,58 @@
 #product_matcher.py
 #This module contains the logic for matching product IDs based on description and determining the grain direction based on orientation, width, height, and description.
 import logging
-from app.data_manager import get_product_info_data  # <-- Add this import so we can fetch product info
+from typing import Optional
+from app.config_snapshot import ConfigSnapshot, get_config_snapshot, register_index
+from app.keyword_automaton import KeywordRuleSet
+from app.product_catalog import get_product_catalog
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
-def match_product_id(description: str, product_keywords: list, order_print_type: int, order_mis_hub_id: int) -> int:
-    logger.debug(f"Matching product ID for description: {description}")
-    desc_lower = description.lower()
+def _build_product_keyword_rules(snapshot: ConfigSnapshot) -> KeywordRuleSet:
+    return KeywordRuleSet(snapshot.product_keywords)
 
-    for item in product_keywords:
-        product_id = item["Product_ID"]
 
-        # 1. Match all
-        if not match_all(item.get("Match_All", []), desc_lower):
-            logger.debug(f"Description '{description}' did not match all keywords for product ID {product_id}.")
-            continue
+register_index("product_keyword_rules", _build_product_keyword_rules)
 
-        # 2. Exclude all
-        if not exclude_all(item.get("Exclude_All", []), desc_lower):
-            logger.debug(f"Description '{description}' excluded by keywords for product ID {product_id}.")
-            continue
 
-        # 3. Match any
-        if not match_any(item.get("Match_Any", []), desc_lower):
-            logger.debug(f"Description '{description}' did not match any keywords for product ID {product_id}.")
-            continue
-        
+def match_product_id(description: str, product_keywords: list, order_print_type: int, order_mis_hub_id: int, snapshot: Optional[ConfigSnapshot] = None) -> int:
+    logger.debug("Matching product ID for description: %s", description)
+    if snapshot is None:
+        snapshot = get_config_snapshot()
+
+    # 1-3. Match all / exclude all / match any, evaluated in one automaton scan
+    if product_keywords is snapshot.product_keywords:
+        keyword_rules = snapshot.index("product_keyword_rules")
+    else:
+        keyword_rules = KeywordRuleSet(product_keywords)
+    catalog = None
+
+    for item in keyword_rules.matches(description):
+        product_id = item["Product_ID"]
+
         # 4. Now check the product's printTypes to ensure it supports the requested printType
-        product_info = get_product_info_data()
-        product_data = product_info.get(str(product_id), {})
-        allowed_print_types = product_data.get("printTypes", [])
-        if order_print_type not in allowed_print_types:
+        if catalog is None:
+            catalog = get_product_catalog(snapshot)
+        record = catalog.get(product_id)
+        if record is None or not record.supports_print_type(order_print_type):
             logger.debug(
-                f"Product ID {product_id} does not support printType {order_print_type}. "
-                f"Allowed: {allowed_print_types}. Skipping."
+                "Product ID %s does not support printType %s. Allowed: %s. Skipping.",
+                product_id, order_print_type, sorted(record.print_types) if record else [],
             )
             continue        
         
         # Check the product's scheduleAppliesTo if present
-        schedule_applies = product_data.get("scheduleAppliesTo", [])
-        if schedule_applies:
-            if order_mis_hub_id not in schedule_applies:
-                logger.debug(
-                    f"Product ID {product_id} does not allow hubID={order_mis_hub_id}. "
-                    f"Allowed: {schedule_applies}. Skipping."
-                )
-                continue
+        if not record.applies_to_hub(order_mis_hub_id):
+            logger.debug(
+                "Product ID %s does not allow hubID=%s. Allowed: %s. Skipping.",
+                product_id, order_mis_hub_id, sorted(record.schedule_applies_to),
+            )
+            continue
         
-        logger.debug(f"Matched product ID {product_id} for description='{description}'.")
+        logger.debug("Matched product ID %s for description='%s'.", product_id, description)
         return product_id
 
-    logger.debug(f"No matching product ID found for description: {description}")
+    logger.debug("No matching product ID found for description: %s", description)
     return None
 
 def match_all(keywords, desc_lower):
@@ -101,7 +101,7 @@ def determine_grain_direction(orientation: str, width: float, height: float, des
     - grain_id (int): The grain direction ID (3 = Vertical, 2 = Horizontal, 1 = Either).
     """
 
-    logger.debug(f"Determining grain direction for orientation: {orientation}, width: {width}, height: {height}, description: {description}")
+    logger.debug("Determining grain direction for orientation: %s, width: %s, height: %s, description: %s", orientation, width, height, description)
 
     # BC size thresholds
     BC_LONG = 100
@@ -116,7 +116,7 @@ def determine_grain_direction(orientation: str, width: float, height: float, des
     orientation = orientation.lower()  # Normalize casing
 
     if orientation not in valid_orientations:
-        logger.warning(f"Unexpected orientation '{orientation}'. Inferring from dimensions.")
+        logger.warning("Unexpected orientation '%s'. Inferring from dimensions.", orientation)
         if height > width:
             orientation = "portrait"
         elif width > height:
@@ -157,6 +157,7 @@ def determine_grain_direction(orientation: str, width: float, height: float, des
         grain = "Either"
         grain_id = 1
 
-    logger.debug(f"Final grain direction: {grain} (ID={grain_id}), final orientation: {orientation}, long edge: {long_edge}, short edge: {short_edge}")
+    logger.debug("Final grain direction: %s (ID=%s), final orientation: %s, long edge: %s, short edge: %s", grain, grain_id, orientation, long_edge, short_edge)
 
     return grain, grain_id
+
@@ -1,34 +1,24 @@
 import logging
-from app.product_matcher import match_all, exclude_all, match_any  # reuse your helper functions
+from typing import Optional
+from app.config_snapshot import ConfigSnapshot, register_index
+from app.keyword_automaton import KeywordRuleSet
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
-def match_production_groups(description: str, groups: list) -> list:
+register_index("production_group_rules", lambda snapshot: KeywordRuleSet(snapshot.production_groups))
+
+def match_production_groups(description: str, groups: list, snapshot: Optional[ConfigSnapshot] = None) -> list:
     """Return a list of production group names that match the order description."""
+    # Match_All, Exclude_All and Match_Any are all checked from one automaton scan
+    if snapshot is not None and groups is snapshot.production_groups:
+        rules = snapshot.index("production_group_rules")
+    else:
+        rules = KeywordRuleSet(groups)
+
     assigned_groups = []
-    desc_lower = description.lower()
-    
-    for group in groups:
-        group_id = group.get("id")
+    for group in rules.matches(description):
         group_name = group.get("name")
-        # Check required keywords if defined
-        if group.get("Match_All"):
-            if not match_all(group["Match_All"], desc_lower):
-                logger.debug(f"Group '{group_name}' skipped because not all required keywords match.")
-                continue
-        # Check excluded keywords if defined
-        if group.get("Exclude_All"):
-            if not exclude_all(group["Exclude_All"], desc_lower):
-                logger.debug(f"Group '{group_name}' skipped due to excluded keywords.")
-                continue
-        # Check match-any groups if defined – if any sub‐group exists then at least one keyword must match
-        if group.get("Match_Any"):
-            if not match_any(group["Match_Any"], desc_lower):
-                logger.debug(f"Group '{group_name}' skipped because none of the optional keyword groups match.")
-                continue
-        # If we reach here, the group qualifies
-        logger.debug(f"Assigned production group '{group_name}' to order based on description.")
+        logger.debug("Assigned production group '%s' to order based on description.", group_name)
         assigned_groups.append(group_name)
-    
-    return assigned_groups
\ No newline at end of file
+
+    return assigned_groups
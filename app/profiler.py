@@ -0,0 +1,140 @@
+# app/profiler.py
+# On-demand sampling CPU profiler for /admin/profile.
+# A daemon thread wakes every interval, snapshots the stack of every other thread in this
+# process (sys._current_frames) and counts identical stacks. Nothing is hooked into the code
+# being profiled, so the cost is one stack walk per thread per interval, and only while a
+# profile is running. A SIGPROF timer is not used: Python runs signal handlers on the main
+# thread only, so it would miss requests served from the threadpool.
+# Output is collapsed-stack text ("outer;inner;leaf count" per line), which flamegraph.pl,
+# speedscope and inferno read directly. Each uvicorn worker profiles itself only.
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+
+APP_PACKAGE = "app"
+
+Stack = Tuple[str, ...]
+
+
+class ProfilerBusy(RuntimeError):
+    """A profile is already running in this process."""
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = PROFILER_INTERVAL_MS / 1000.0, app_only: bool = True):
+        self.interval = max(0.001, interval)
+        self.app_only = app_only
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.error: Optional[BaseException] = None  # Set if the sampler thread died
+        self._labels: Dict[object, Optional[str]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _label(self, frame) -> Optional[str]:
+        code = frame.f_code
+        label = self._labels.get(code, False)
+        if label is False:
+            module = frame.f_globals.get("__name__", "?")
+            if self.app_only and module != APP_PACKAGE and not module.startswith(APP_PACKAGE + "."):
+                label = None
+            else:
+                # co_qualname is Python 3.11+
+                label = f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+            self._labels[code] = label
+        return label
+
+    def _stack(self, frame) -> Stack:
+        labels = []
+        while frame is not None:
+            label = self._label(frame)
+            if label is not None:
+                labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels)
+
+    def sample(self) -> None:
+        """Record the current stack of every thread except the sampler itself."""
+        own = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            stack = self._stack(frame)
+            # Threads with no application frames are idle (or outside the app) for this purpose
+            if stack:
+                self.samples[stack] += 1
+        self.sample_count += 1
+
+    def _run(self) -> None:
+        try:
+            next_at = time.perf_counter()
+            while not self._stop.is_set():
+                self.sample()
+                next_at += self.interval
+                delay = next_at - time.perf_counter()
+                if delay < 0:
+                    # Fell behind (e.g. a long GIL hold); skip missed ticks instead of bursting
+                    next_at = time.perf_counter()
+                    delay = 0
+                self._stop.wait(delay)
+        except Exception as e:
+            logger.exception("Sampling profiler stopped after %s samples", self.sample_count)
+            self.error = e
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, most sampled first."""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.samples.most_common())
+
+    def by_function(self) -> str:
+        """Per-function sample counts: self (leaf) and total (anywhere on the stack)."""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.samples.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                total[label] += count
+        lines = [f"{'self':>8} {'total':>8}  function"]
+        lines.extend(f"{own[label]:>8} {count:>8}  {label}" for label, count in total.most_common())
+        return "\n".join(lines) + "\n"
+
+
+_profile_lock = threading.Lock()
+
+
+def begin_profile(interval: Optional[float] = None, app_only: bool = True) -> SamplingProfiler:
+    """Start the process-wide profile. Raises ProfilerBusy if one is running; pair with end_profile."""
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy("A profile is already running")
+    try:
+        profiler = SamplingProfiler(PROFILER_INTERVAL_MS / 1000.0 if interval is None else interval, app_only)
+        profiler.start()
+    except Exception:
+        _profile_lock.release()
+        raise
+    return profiler
+
+
+def end_profile(profiler: SamplingProfiler) -> None:
+    try:
+        profiler.stop()
+    finally:
+        _profile_lock.release()
@@ -0,0 +1,177 @@
+# app/response_cache.py
+# Bounded LRU cache of process_order responses. For one config version the schedule depends
+# only on the request fields and on where "now" falls for the chosen hub: the hub-local calendar
+# date and whether the hour is before the product's cutoff (plus the server date, which hub
+# rule date ranges are checked against). An entry therefore stays valid until the next cutoff
+# or midnight boundary, and MIS re-queries of the same order become a lookup.
+# Hits are re-stamped with the caller's orderId and the real processing time.
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import pytz
+from pydantic.fields import SHAPE_LIST
+
+from app.config_snapshot import ConfigSnapshot
+from app.metrics import register_cache
+from app.models import ScheduleRequest, ScheduleResponse
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "10000"))
+
+TIME_FORMAT = '%A, %Y-%m-%d %H:%M:%S %Z (%z)'
+DEFAULT_TIMEZONE = 'Australia/Melbourne'
+
+# Every request field except orderId, which is only echoed back
+_KEY_FIELDS = tuple(name for name in ScheduleRequest.__fields__ if name != "orderId")
+# Response fields holding lists, copied for every hit
+_LIST_FIELDS = tuple(name for name, field in ScheduleResponse.__fields__.items() if field.shape == SHAPE_LIST)
+
+
+class CachedSchedule(NamedTuple):
+    response: ScheduleResponse
+    timezone: pytz.BaseTzInfo
+    offset_hours: int
+    cutoff_hour: int
+    local_date: date
+    before_cutoff: bool
+    server_date: date
+
+
+def request_fingerprint(req: ScheduleRequest) -> Tuple:
+    """Hashable fingerprint of the fields that affect the schedule (taken before process_order mutates req)."""
+    values = []
+    for name in _KEY_FIELDS:
+        value = getattr(req, name)
+        if name == "orderNotes" and value is not None:
+            value = tuple(tuple(sorted(note.dict().items())) for note in value)
+        values.append(value)
+    return tuple(values)
+
+
+def hub_timezone(snapshot: ConfigSnapshot, hub: str) -> pytz.BaseTzInfo:
+    """Same lookup as process_order Step 4."""
+    name = DEFAULT_TIMEZONE
+    for hub_config in snapshot.cmyk_hubs:
+        if hub_config["Hub"].lower() == hub.lower():
+            name = hub_config.get("Timezone", name)
+            break
+    try:
+        return pytz.timezone(name)
+    except pytz.UnknownTimeZoneError:
+        return pytz.timezone(DEFAULT_TIMEZONE)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU of CachedSchedule entries keyed on the request fingerprint. The cache is
+    flushed when a newer config version arrives (older ones bypass it); an entry whose date or
+    cutoff bucket no longer matches "now" is dropped on lookup.
+    """
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple, CachedSchedule]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def _check_version(self, snapshot: ConfigSnapshot) -> bool:
+        """
+        Caller holds the lock. A newer config version flushes the cache; returns False for an older
+        one (e.g. a batch or stream still pinned to the previous snapshot), which bypasses the cache.
+        """
+        if self._version is None or snapshot.version > self._version:
+            if self._entries:
+                logger.info("Response cache flushed for config version %s (%s entries dropped)", snapshot.version, len(self._entries))
+            self._entries.clear()
+            self._version = snapshot.version
+        return snapshot.version == self._version
+
+    def get(self, snapshot: ConfigSnapshot, key: Tuple, req: ScheduleRequest, now: datetime) -> Optional[ScheduleResponse]:
+        if self.maxsize <= 0:
+            return None
+        with self._lock:
+            if not self._check_version(snapshot):
+                self.misses += 1
+                return None
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            actual_time = now.astimezone(entry.timezone)
+            simulated_time = actual_time + timedelta(hours=entry.offset_hours)
+            if (simulated_time.date() != entry.local_date
+                    or (simulated_time.hour < entry.cutoff_hour) != entry.before_cutoff
+                    or datetime.now().date() != entry.server_date):
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        update = {
+            "orderId": req.orderId,
+            "actualProcessingTime": actual_time.strftime(TIME_FORMAT),
+            "simulatedProcessingTime": simulated_time.strftime(TIME_FORMAT) if entry.offset_hours != 0 else None,
+        }
+        # copy() is shallow: give each hit its own lists so callers cannot alter the cached entry
+        for name in _LIST_FIELDS:
+            value = getattr(entry.response, name)
+            if value is not None:
+                update[name] = list(value)
+        return entry.response.copy(update=update)
+
+    def put(self, snapshot: ConfigSnapshot, key: Tuple, now: datetime, offset_hours: int, response: ScheduleResponse) -> None:
+        if self.maxsize <= 0:
+            return
+        try:
+            cutoff_hour = int(response.productCutoff)
+        except (TypeError, ValueError):
+            return
+        timezone = hub_timezone(snapshot, response.chosenProductionHub)
+        simulated_time = now.astimezone(timezone) + timedelta(hours=offset_hours)
+        entry = CachedSchedule(response, timezone, offset_hours, cutoff_hour, simulated_time.date(),
+                               simulated_time.hour < cutoff_hour, datetime.now().date())
+        with self._lock:
+            if not self._check_version(snapshot):
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+            }
+
+
+response_cache = ResponseCache()
+
+
+def _cache_stats() -> Tuple[int, int, int]:
+    stats = response_cache.stats()
+    return stats["hits"], stats["misses"], stats["size"]
+
+
+register_cache("schedule_response", _cache_stats)
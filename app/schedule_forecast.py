@@ -0,0 +1,95 @@
+# app/schedule_forecast.py
+# Dispatch-date forecast for one order over a horizon of placement times.
+# Product matching, hub selection and finishing do not depend on when the order is placed, so the
+# order is scheduled once; only Steps 5 and 7 (run, start and dispatch dates) are re-evaluated.
+# Those depend on the hub-local date and which side of the cutoff the hour falls, so the sweep
+# walks hour boundaries, recomputes only when that bucket changes, and merges consecutive hours
+# with the same dates into intervals.
+import logging
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config_snapshot import ConfigSnapshot, get_config_snapshot
+from app.models import ScheduleRequest
+from app.product_catalog import FALLBACK_PRODUCT, ProductRecord, get_product_catalog
+from app.response_cache import hub_timezone
+from app.schedule_logic import process_order, resolve_dispatch_dates, resolve_run
+from app.serialization import response_content
+from app.server_timing import note_config
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_FORECAST_MAX_HOURS = int(os.getenv("SCHEDULE_FORECAST_MAX_HOURS", "2160"))  # 90 days
+
+# (placed from, placed to, adjusted start date, dispatch date)
+Interval = Tuple[datetime, datetime, date, date]
+
+
+def dispatch_intervals(snapshot: ConfigSnapshot, product: ProductRecord, hub: str, total_prod_days: int,
+                       start: datetime, end: datetime) -> List[Interval]:
+    """
+    Placement intervals in [start, end) with the (adjusted start, dispatch) dates of an order placed
+    in each. `start` is hub-local time shifted the way process_order applies timeOffsetHours, so every
+    instant gets the same dates as a /schedule call at that offset.
+    """
+    intervals: List[list] = []
+    bucket = None
+    placed = start
+    while placed < end:
+        next_hour = min(placed.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1), end)
+        key = (placed.date(), placed.hour < product.cutoff)
+        if key != bucket:
+            bucket = key
+            run_dates, day_entry = resolve_run(snapshot, product, hub, *key)
+            dates = resolve_dispatch_dates(snapshot, hub, run_dates.calculated_start_date, total_prod_days, day_entry)
+            if not intervals or tuple(intervals[-1][2:]) != dates:
+                intervals.append([placed, placed, *dates])
+        intervals[-1][1] = next_hour
+        placed = next_hour
+    return [tuple(interval) for interval in intervals]
+
+
+def forecast_order(req: ScheduleRequest, horizon_hours: int, snapshot: Optional[ConfigSnapshot] = None,
+                   now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    """
+    Schedule `req` once and forecast its dispatch date for placement times from now (plus its
+    timeOffsetHours) to `horizon_hours` later. Returns a ScheduleForecastResponse-shaped dict,
+    or None if the order cannot be scheduled.
+    """
+    if snapshot is None:
+        snapshot = get_config_snapshot()
+    note_config(snapshot)
+    if now is None:
+        now = datetime.now(timezone.utc)
+    start_offset = req.timeOffsetHours or 0
+    schedule = process_order(req, snapshot=snapshot, now=now)
+    if not schedule:
+        return None
+
+    product = get_product_catalog(snapshot).get(schedule.productId) or FALLBACK_PRODUCT
+    hub = schedule.chosenProductionHub
+    tz = hub_timezone(snapshot, hub)
+    start = now.astimezone(tz) + timedelta(hours=start_offset)
+    intervals = dispatch_intervals(snapshot, product, hub, schedule.totalProductionDays,
+                                   start, start + timedelta(hours=horizon_hours))
+    logger.info("Forecast for OrderID %s: %s hours from %s at hub %s -> %s dispatch intervals",
+                req.orderId or 'N/A', horizon_hours, start.isoformat(), hub, len(intervals))
+    fallback = schedule.dispatchDate is None  # Product 99 has no dispatch date
+    return {
+        "configVersion": snapshot.version,
+        "processedAt": now.isoformat(),
+        "timezone": tz.zone,
+        "horizonHours": horizon_hours,
+        "schedule": response_content(schedule),
+        "intervals": [
+            {
+                # normalize() renders each instant with the offset in force at that time (DST)
+                "placedFrom": tz.normalize(placed_from).isoformat(),
+                "placedTo": tz.normalize(placed_to).isoformat(),
+                "adjustedStartDate": str(adjusted_start),
+                "dispatchDate": None if fallback else str(dispatch),
+            }
+            for placed_from, placed_to, adjusted_start, dispatch in intervals
+        ],
+    }
@@ -0,0 +1,51 @@
+# app/schedule_runner.py
+# Chooses where /schedule runs process_order.
+#   async      - directly on the event loop. With config served from an in-memory snapshot,
+#                process_order does no blocking I/O, so there is no thread handoff per request
+#                and concurrency is not capped by the threadpool size. Config disk checks and
+#                snapshot rebuilds are still offloaded to the threadpool when they fall due.
+#   threadpool - the previous behaviour: every call on the anyio worker threadpool.
+import logging
+import os
+from datetime import datetime
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config_snapshot import ConfigSnapshot, get_config_snapshot, peek_config_snapshot
+from app.models import ScheduleRequest, ScheduleResponse
+from app.schedule_logic import process_order
+from app.server_timing import note_config
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_MODES = ("async", "threadpool")
+
+SCHEDULE_EXECUTION_MODE = os.getenv("SCHEDULE_EXECUTION_MODE", "async").lower()
+if SCHEDULE_EXECUTION_MODE not in EXECUTION_MODES:
+    logger.warning("Unknown SCHEDULE_EXECUTION_MODE '%s'; using 'threadpool'", SCHEDULE_EXECUTION_MODE)
+    SCHEDULE_EXECUTION_MODE = "threadpool"
+
+
+async def get_config_snapshot_async() -> ConfigSnapshot:
+    """get_config_snapshot for the event loop: disk checks and rebuilds run in the threadpool."""
+    snapshot = peek_config_snapshot()
+    if snapshot is None:
+        snapshot = await run_in_threadpool(get_config_snapshot)
+    return snapshot
+
+
+def _process_order_in_thread(req: ScheduleRequest, now: Optional[datetime]) -> Optional[ScheduleResponse]:
+    snapshot = get_config_snapshot()
+    note_config(snapshot)
+    return process_order(req, snapshot=snapshot, now=now)
+
+
+async def run_process_order(req: ScheduleRequest, now: Optional[datetime] = None,
+                            mode: Optional[str] = None) -> Optional[ScheduleResponse]:
+    """Run process_order for one request in `mode` (SCHEDULE_EXECUTION_MODE by default)."""
+    if (mode or SCHEDULE_EXECUTION_MODE) == "threadpool":
+        return await run_in_threadpool(_process_order_in_thread, req, now)
+    snapshot = await get_config_snapshot_async()
+    note_config(snapshot)
+    return process_order(req, snapshot=snapshot, now=now)
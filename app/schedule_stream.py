@@ -0,0 +1,190 @@
+# app/schedule_stream.py
+# Newline-delimited JSON scheduling for very large order feeds.
+# The request body is read chunk by chunk, each chunk's orders are scheduled in the threadpool
+# (or the process pool) against one pinned config snapshot and "now", and results are written
+# back as NDJSON lines (ScheduleBatchItem-shaped) in input order. Only a bounded number of
+# chunks are ever outstanding, so memory stays flat whatever the size of the feed.
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app import process_backend
+from app.batch_scheduler import schedule_item
+from app.config_snapshot import ConfigSnapshot
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_STREAM_CHUNK_ITEMS = int(os.getenv("SCHEDULE_STREAM_CHUNK_ITEMS", "64"))
+SCHEDULE_STREAM_MAX_LINE_BYTES = int(os.getenv("SCHEDULE_STREAM_MAX_LINE_BYTES", "1048576"))
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class NDJSONLineReader:
+    """
+    Splits body chunks into lines without holding more than one partial line.
+    Lines longer than max_line_bytes are discarded up to their newline and reported as None.
+    """
+
+    def __init__(self, max_line_bytes: int = SCHEDULE_STREAM_MAX_LINE_BYTES):
+        self.max_line_bytes = max_line_bytes
+        self._buffer = bytearray()
+        self._discarding = False
+
+    def feed(self, chunk: bytes) -> List[Optional[bytes]]:
+        lines: List[Optional[bytes]] = []
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                break
+            if self._discarding:
+                self._discarding = False
+                lines.append(None)
+            else:
+                self._buffer += chunk[start:end]
+                lines.append(self._take())
+            start = end + 1
+        if not self._discarding:
+            self._buffer += chunk[start:]
+            if len(self._buffer) > self.max_line_bytes:
+                self._buffer.clear()
+                self._discarding = True
+        return lines
+
+    def close(self) -> List[Optional[bytes]]:
+        """Flush the final line when the body does not end with a newline."""
+        if self._discarding:
+            self._discarding = False
+            return [None]
+        return [self._take()] if self._buffer else []
+
+    def _take(self) -> Optional[bytes]:
+        line = bytes(self._buffer)
+        self._buffer.clear()
+        return None if len(line) > self.max_line_bytes else line
+
+
+def _error_item(index: int, error: str) -> Dict[str, Any]:
+    return {"index": index, "orderId": None, "result": None, "error": error}
+
+
+def _record_count(lines: List[Optional[bytes]]) -> int:
+    return sum(1 for line in lines if line is None or line.strip())
+
+
+def schedule_lines(lines: List[Optional[bytes]], start_index: int, snapshot: ConfigSnapshot, now: datetime) -> List[Dict[str, Any]]:
+    """
+    Decode and schedule raw NDJSON lines. Blank lines are skipped and do not take an index;
+    undecodable or oversized lines are reported as errors in place.
+    """
+    results = []
+    index = start_index
+    for line in lines:
+        if line is None:
+            results.append(_error_item(index, f"Invalid order: line exceeds {SCHEDULE_STREAM_MAX_LINE_BYTES} bytes"))
+        elif not line.strip():
+            continue
+        else:
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                results.append(_error_item(index, f"Invalid JSON: {e}"))
+            else:
+                results.append(schedule_item(index, item, snapshot, now))
+        index += 1
+    return results
+
+
+def schedule_lines_encoded(lines: List[Optional[bytes]], start_index: int, snapshot: ConfigSnapshot, now: datetime) -> Tuple[bytes, int]:
+    """schedule_lines, returned as (NDJSON bytes, failure count) so pool workers send back one compact payload."""
+    results = schedule_lines(lines, start_index, snapshot, now)
+    failed = sum(1 for result in results if result["error"] is not None)
+    return "".join(json.dumps(result) + "\n" for result in results).encode("utf-8"), failed
+
+
+async def stream_schedule(body: AsyncIterator[bytes], snapshot: ConfigSnapshot, now: Optional[datetime] = None) -> AsyncIterator[bytes]:
+    """
+    Schedule every order in an NDJSON body, yielding encoded result lines in input order.
+    Chunks run in the threadpool one at a time or, with the process pool enabled, up to
+    PoolLease.max_in_flight at once. Body reading stops while that many chunks are outstanding,
+    so a slow reader of the response slows down reading of the request.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    reader = NDJSONLineReader()
+    pool = process_backend.scheduling_pool
+    pending: Deque[Tuple["asyncio.Future[Tuple[bytes, int]]", int]] = deque()  # (chunk result, record count)
+    index = completed = failed = 0
+    finished = False
+
+    with (pool.lease(snapshot) if pool is not None else nullcontext()) as lease:
+        max_in_flight = lease.max_in_flight if lease is not None else 1
+
+        def submit(lines: List[Optional[bytes]]) -> None:
+            nonlocal index
+            if lease is not None:
+                future = asyncio.wrap_future(lease.submit(schedule_lines_encoded, lines, index, now))
+            else:
+                future = asyncio.ensure_future(run_in_threadpool(schedule_lines_encoded, lines, index, snapshot, now))
+            count = _record_count(lines)
+            pending.append((future, count))
+            index += count
+
+        async def collect(wait_for: int) -> AsyncIterator[bytes]:
+            nonlocal completed, failed
+            # Always hand back finished chunks; wait only while more than `wait_for` are outstanding
+            while pending and (len(pending) > wait_for or pending[0][0].done()):
+                future, count = pending.popleft()
+                encoded, chunk_failed = await future
+                completed += count
+                failed += chunk_failed
+                if encoded:
+                    yield encoded
+
+        try:
+            async for chunk in body:
+                lines = reader.feed(chunk)
+                for start in range(0, len(lines), SCHEDULE_STREAM_CHUNK_ITEMS):
+                    submit(lines[start:start + SCHEDULE_STREAM_CHUNK_ITEMS])
+                    async for encoded in collect(max_in_flight - 1):
+                        yield encoded
+            lines = reader.close()
+            if lines:
+                submit(lines)
+            async for encoded in collect(0):
+                yield encoded
+            finished = True
+        except ClientDisconnect:
+            logger.warning("Client disconnected from schedule stream after %s orders", completed)
+        finally:
+            for future, _ in pending:
+                future.cancel()
+            logger.info(
+                "Stream scheduled %s orders against config version %s (%s succeeded, %s failed%s)",
+                completed, snapshot.version, completed - failed, failed, "" if finished else ", incomplete",
+            )
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for endpoints that keep reading the request body while responding.
+    The stock response listens on `receive` for disconnects, which would swallow body chunks;
+    here a disconnect surfaces as ClientDisconnect from request.stream() instead.
+    """
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,137 @@
+# app/serialization.py
+# Fast path from process_order values to response bytes.
+# - build_schedule_response() skips ScheduleResponse validation (ScheduleResponse.construct) when
+#   every value already has its field's exact type, which is what the engine produces; anything
+#   else (e.g. a string ID from hand-edited config) goes through normal validation.
+# - dumps() renders the same bytes as starlette's JSONResponse, with orjson when it is installed
+#   (app.main.FastJSONResponse uses it; returning that from an endpoint also skips FastAPI's
+#   response_model re-validation). No web framework imports: process-pool workers load this module.
+# orjson is optional; without it (or with JSON_ENCODER=json) the standard library encoder is used.
+import json
+import logging
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
+
+from app.models import ScheduleResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+JSON_ENCODER = os.getenv("JSON_ENCODER", "orjson" if orjson is not None else "json").lower()
+if JSON_ENCODER == "orjson" and orjson is None:
+    logger.warning("JSON_ENCODER=orjson but orjson is not installed; using the standard library encoder")
+    JSON_ENCODER = "json"
+
+_SCALAR_TYPES = (str, int, float, bool)
+_MISSING = object()
+
+
+def _exact_fields(model) -> Tuple[Tuple[str, Optional[type], Optional[type], bool], ...]:
+    """
+    (name, exact value type, exact item type for lists, allows None) per field, in field order.
+    pydantic converts e.g. an int to float or a bool to int, which changes the JSON, so only values
+    whose type is exactly the field's type can skip validation. Fields that are not a plain scalar
+    or list of scalars get no exact type and are always validated.
+    """
+    fields = []
+    for name, field in model.__fields__.items():
+        value_type = item_type = None
+        if field.type_ in _SCALAR_TYPES and field.shape == SHAPE_SINGLETON:
+            value_type = field.type_
+        elif field.type_ in _SCALAR_TYPES and field.shape == SHAPE_LIST:
+            value_type, item_type = list, field.type_
+        fields.append((name, value_type, item_type, field.allow_none))
+    return tuple(fields)
+
+
+_RESPONSE_FIELDS = _exact_fields(ScheduleResponse)
+
+
+def _exact_values(values: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """`values` in field order (the key order on the wire), or None if validation could change them."""
+    if len(values) != len(_RESPONSE_FIELDS):
+        return None
+    ordered = {}
+    for name, value_type, item_type, allow_none in _RESPONSE_FIELDS:
+        value = values.get(name, _MISSING)
+        if value is None:
+            if not allow_none:
+                return None
+        elif type(value) is not value_type:
+            return None
+        elif item_type is not None:
+            for item in value:
+                if type(item) is not item_type:
+                    return None
+        ordered[name] = value
+    return ordered
+
+
+def _construct(values: Dict[str, Any]) -> ScheduleResponse:
+    """
+    ScheduleResponse.construct(**values) for values that already hold every field in field order.
+    construct() re-checks each field for aliases and defaults, which costs more than the rest
+    of the fast path together.
+    """
+    response = ScheduleResponse.__new__(ScheduleResponse)
+    object.__setattr__(response, "__dict__", values)
+    object.__setattr__(response, "__fields_set__", set(values))
+    return response
+
+
+def build_schedule_response(values: Dict[str, Any]) -> ScheduleResponse:
+    """ScheduleResponse from process_order's values, validated only if a value is not already exact."""
+    ordered = _exact_values(values)
+    if ordered is not None:
+        return _construct(ordered)
+    logger.debug("ScheduleResponse values are not exact; validating")
+    return ScheduleResponse(**values)
+
+
+def response_content(response: ScheduleResponse) -> Dict[str, Any]:
+    """
+    JSON-ready dict of a ScheduleResponse (what FastAPI would send for it). Every field is a
+    scalar or a list of scalars, so the model's own values are used rather than .dict().
+    """
+    return dict(response.__dict__)
+
+
+_PLAIN_TYPES = frozenset({str, int, bool, type(None)})
+
+
+def _orjson_compatible(content: Any) -> bool:
+    """
+    False if orjson could render `content` differently from json.dumps: floats outside
+    1e-4 <= |x| < 1e16 (exponent formatting), NaN/infinity, or types json.dumps would reject.
+    Non-string keys and integers beyond 64 bits make orjson raise instead, see dumps().
+    """
+    kind = type(content)
+    if kind is dict:
+        values = content.values()
+    elif kind is list or kind is tuple:
+        values = content
+    elif kind is float:
+        return content == 0 or 1e-4 <= abs(content) < 1e16
+    else:
+        return kind in _PLAIN_TYPES
+    for value in values:
+        if type(value) not in _PLAIN_TYPES and not _orjson_compatible(value):
+            return False
+    return True
+
+
+def dumps(content: Any) -> bytes:
+    """Same bytes as starlette's JSONResponse.render(content)."""
+    if JSON_ENCODER == "orjson" and _orjson_compatible(content):
+        try:
+            return orjson.dumps(content)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
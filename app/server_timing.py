@@ -0,0 +1,101 @@
+# app/server_timing.py
+# Server-Timing (and X-Config-Version) response headers for the scheduling endpoints, so client
+# traces and browser devtools show where a request's time went.
+# The middleware puts a RequestTimings in a ContextVar; code along the request path marks the
+# end of each phase (request body, auth, validation, config) and process_order adds its stage
+# laps. Batch requests sum each stage over all orders. Off by default; when off no RequestTimings
+# exists and every hook is a single ContextVar lookup.
+#
+#   SERVER_TIMING_ENABLED=1
+#   SERVER_TIMING_PATHS=/schedule,/schedule/batch,/schedule/forecast
+import logging
+import os
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "0").lower() in ("1", "true", "yes")
+SERVER_TIMING_PATHS = frozenset(
+    path.strip() for path in os.getenv("SERVER_TIMING_PATHS", "/schedule,/schedule/batch,/schedule/forecast").split(",") if path.strip())
+
+_current_timings: ContextVar[Optional["RequestTimings"]] = ContextVar("server_timings", default=None)
+
+
+class RequestTimings:
+    """Phase durations (seconds, summed per name, in first-seen order) for one request."""
+    __slots__ = ("started", "_last", "durations", "config_version")
+
+    def __init__(self):
+        self.started = self._last = perf_counter()
+        self.durations: Dict[str, float] = {}
+        self.config_version: Optional[int] = None
+
+    def mark(self, name: str) -> None:
+        """Charge the time since the previous mark to `name`."""
+        now = perf_counter()
+        self.durations[name] = self.durations.get(name, 0.0) + (now - self._last)
+        self._last = now
+
+    def add_laps(self, laps: Iterable[Tuple[str, float]]) -> None:
+        """Add process_order stage laps; the time they cover is not charged to the next mark."""
+        for name, seconds in laps:
+            self.durations[name] = self.durations.get(name, 0.0) + seconds
+        self._last = perf_counter()
+
+    def header(self) -> str:
+        entries = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.durations.items()]
+        entries.append(f"total;dur={(perf_counter() - self.started) * 1000:.3f}")
+        return ", ".join(entries)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """The RequestTimings for the request being served, or None when Server-Timing is off for it."""
+    return _current_timings.get()
+
+
+def mark(name: str) -> None:
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.mark(name)
+
+
+def note_config(snapshot) -> None:
+    """Mark config loading done and remember the version served (for X-Config-Version)."""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.mark("config")
+        timings.config_version = snapshot.version
+
+
+class ServerTimingMiddleware:
+    """Pure ASGI middleware adding the headers to responses for SERVER_TIMING_PATHS."""
+
+    def __init__(self, app, paths: Iterable[str] = SERVER_TIMING_PATHS, enabled: Optional[bool] = None):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.enabled = SERVER_TIMING_ENABLED if enabled is None else enabled
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http" or scope.get("path") not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # The body is rendered before the response starts, so this covers serialization
+                timings.mark("serialize")
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.header().encode("latin-1")))
+                if timings.config_version is not None:
+                    headers.append((b"x-config-version", str(timings.config_version).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_timings.reset(token)
@@ -0,0 +1,85 @@
+# benchmarks/bench_hub_rules.py
+# Cost of validating one hub candidate as the number of hub rules grows.
+# Compares the compiled per-hub engine against the previous behaviour of parsing hub_rules.json
+# into pydantic models on every request and scanning every rule for each candidate.
+#
+#   python -m benchmarks.bench_hub_rules [--rules 10,100,500,1000] [--repeat 2000]
+import argparse
+import random
+import time
+from datetime import date
+
+from app.hub_rule_engine import HubRuleEngine, HubRuleOrder
+from app.hub_selection import parse_hub_rules
+
+HUBS = ["vic", "nsw", "qld", "nqld", "wa"]
+
+
+def generate_rules(count: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    rules = []
+    for i in range(count):
+        rule = {"id": f"bench_{i}", "hubId": rng.choice(HUBS), "priority": rng.randint(0, 10), "enabled": rng.random() > 0.1}
+        if rng.random() < 0.5:
+            rule["sizeConstraints"] = {"maxWidth": rng.choice([437, 500, 1000]), "maxHeight": rng.choice([310, 400, 700])}
+        criteria = {"printTypes": rng.sample([1, 2, 3], k=rng.randint(1, 3))}
+        if rng.random() < 0.4:
+            criteria["keywords"] = rng.sample(["gloss", "matt", "velvet", "foil", "uncoated", "kraft"], k=2)
+        if rng.random() < 0.3:
+            criteria["maxQuantity"] = rng.choice([500, 2000, 10000])
+        if rng.random() < 0.2:
+            criteria["excludeProductGroups"] = ["Cards"]
+        rule["orderCriteria"] = criteria
+        if rng.random() < 0.1:
+            rule["startDate"], rule["endDate"] = "2024-01-01", "2099-12-31"
+        rules.append(rule)
+    return {"rules": rules, "equipment": {}}
+
+
+def time_per_call(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rules", default="10,50,100,250,500,1000")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    order = HubRuleOrder("Gloss Flyer 150gsm", 210.0, 297.0, 1000, 6, "Flyers", 2)
+    print(f"{'rules':>6} {'parse+scan us':>14} {'scan us':>10} {'engine us':>10} {'hub rules':>10}")
+    for count in (int(n) for n in args.rules.split(",")):
+        data = generate_rules(count)
+        sorted_rules = sorted(parse_hub_rules(data), key=lambda r: r.priority, reverse=True)
+        engine = HubRuleEngine(sorted_rules)
+        all_compiled = [rule for hub in HUBS for rule in engine.rules_for(hub)]
+        hub_of = {id(rule): hub for hub in HUBS for rule in engine.rules_for(hub)}
+        candidate = "qld"
+        today = date.today()
+
+        def scan_every_rule():
+            # Previous shape: every rule is visited just to compare its hubId
+            for rule in all_compiled:
+                if hub_of[id(rule)] != candidate:
+                    continue
+                if rule.window.is_active(today) and rule.excludes(order):
+                    return
+
+        def parse_and_scan():
+            parse_hub_rules(data)
+            scan_every_rule()
+
+        legacy_repeat = max(1, args.repeat // 20)
+        print(
+            f"{count:>6} {time_per_call(parse_and_scan, legacy_repeat) * 1e6:>14.1f} "
+            f"{time_per_call(scan_every_rule, args.repeat) * 1e6:>10.2f} "
+            f"{time_per_call(lambda: engine.excluding_rule(candidate, order), args.repeat) * 1e6:>10.2f} "
+            f"{len(engine.rules_for(candidate)):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# benchmarks/bench_process_order.py
+# End-to-end process_order throughput and per-stage latency on synthetic orders (benchmarks/orders.py),
+# with the clock frozen so every run schedules the same orders against the same instant.
+# Results are compared with a stored baseline; stages and throughput that moved by more than
+# --tolerance are flagged, and --check turns a regression into a non-zero exit code.
+# Logging and the response cache are off by default.
+# Baselines are machine-specific: re-save one per machine.
+#
+#   python -m benchmarks.bench_process_order [--orders 5000] [--repeat 3] [--check]
+#   python -m benchmarks.bench_process_order --save-baseline
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+from app.config_snapshot import get_config_snapshot
+from app.metrics import StageClock
+from app.models import ScheduleRequest
+from app.response_cache import response_cache
+from app.schedule_logic import _process_order, process_order
+from benchmarks.orders import generate_orders
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline_process_order.json")
+# Tuesday 12:30 AEDT: before most cutoffs, so orders exercise the same-day paths
+FROZEN_NOW = datetime(2025, 3, 4, 1, 30, tzinfo=timezone.utc)
+
+
+def measure_throughput(requests: List[ScheduleRequest], snapshot, now: datetime) -> float:
+    start = time.perf_counter()
+    for req in requests:
+        process_order(req, snapshot=snapshot, now=now)
+    return len(requests) / (time.perf_counter() - start)
+
+
+def measure_stages(requests: List[ScheduleRequest], snapshot, now: datetime) -> Dict[str, List[float]]:
+    stages: Dict[str, List[float]] = {}
+    for req in requests:
+        clock = StageClock()
+        _process_order(req, snapshot, now, clock)
+        for stage, seconds in clock.laps:
+            stages.setdefault(stage, []).append(seconds)
+        stages.setdefault("total", []).append(clock.total())
+    return stages
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(orders: int, repeat: int, seed: int, now: datetime) -> dict:
+    snapshot = get_config_snapshot()
+    # Parsed up front: request validation is not part of process_order
+    requests = [ScheduleRequest.parse_obj(order) for order in generate_orders(orders, seed=seed)]
+    measure_throughput(requests[:500], snapshot, now)  # warm caches and indexes
+    rates = [measure_throughput(requests, snapshot, now) for _ in range(repeat)]
+    stages = measure_stages(requests, snapshot, now)
+    return {
+        "orders": orders,
+        "seed": seed,
+        "now": now.isoformat(),
+        "machine": f"{platform.machine()} {platform.python_implementation()} {platform.python_version()}",
+        # Best of N: the least disturbed run is the most repeatable
+        "orders_per_second": round(max(rates), 1),
+        "stages_us": {
+            stage: {
+                "mean": round(statistics.mean(values) * 1e6, 2),
+                "p50": round(percentile(values, 0.50) * 1e6, 2),
+                "p99": round(percentile(values, 0.99) * 1e6, 2),
+            }
+            for stage, values in stages.items()
+        },
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Print result next to baseline; returns the regressions beyond `tolerance` (a fraction)."""
+    regressions = []
+    base_rate = baseline.get("orders_per_second")
+    rate = result["orders_per_second"]
+    change = (rate / base_rate - 1) if base_rate else 0.0
+    print(f"{'orders/s':<20} {rate:>10.1f} {base_rate or 0:>10.1f} {change:>+8.1%}")
+    if base_rate and change < -tolerance:
+        regressions.append(f"throughput {change:+.1%}")
+
+    print(f"\n{'stage mean us':<20} {'now':>10} {'baseline':>10} {'change':>8}   p50 / p99 us")
+    base_stages = baseline.get("stages_us", {})
+    for stage, now_stats in result["stages_us"].items():
+        base = base_stages.get(stage)
+        if base is None or not base["mean"]:
+            print(f"{stage:<20} {now_stats['mean']:>10.1f} {'-':>10} {'':>8}   {now_stats['p50']:.1f} / {now_stats['p99']:.1f}")
+            continue
+        change = now_stats["mean"] / base["mean"] - 1
+        flag = " <-- slower" if change > tolerance else ""
+        print(f"{stage:<20} {now_stats['mean']:>10.1f} {base['mean']:>10.1f} {change:>+8.1%}   "
+              f"{now_stats['p50']:.1f} / {now_stats['p99']:.1f}{flag}")
+        if flag:
+            regressions.append(f"{stage} mean {change:+.1%}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3, help="throughput runs; the best is reported")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging (0.2 = 20%%)")
+    parser.add_argument("--check", action="store_true", help="exit 1 if anything regressed beyond --tolerance")
+    parser.add_argument("--logs", action="store_true", help="keep application logging enabled")
+    parser.add_argument("--response-cache", action="store_true",
+                        help="leave the response cache on (repeat passes then measure cache hits)")
+    args = parser.parse_args()
+    if not args.logs:
+        logging.disable(logging.CRITICAL)
+    if not args.response_cache:
+        response_cache.maxsize = 0
+
+    result = run(args.orders, args.repeat, args.seed, FROZEN_NOW)
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline}: {result['orders_per_second']} orders/s")
+        return
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.\n")
+    elif (baseline.get("orders"), baseline.get("seed")) != (result["orders"], result["seed"]):
+        print(f"Note: baseline used {baseline.get('orders')} orders (seed {baseline.get('seed')}).\n")
+    print(f"{'':<20} {'now':>10} {'baseline':>10} {'change':>8}")
+    regressions = compare(result, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions: " + ", ".join(regressions))
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/bench_process_pool.py
+# Batch scheduling throughput in-process vs the process-pool backend with a growing worker count.
+# Every order gets a unique description so the product match cache does not turn the run
+# into a cache benchmark. Logging is silenced by default.
+#
+#   python -m benchmarks.bench_process_pool [--orders 20000] [--workers 1,2,4,8,16] [--logs]
+import argparse
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+from app import process_backend
+from app.batch_scheduler import schedule_batch
+from app.config_snapshot import get_config_snapshot
+from app.process_backend import SchedulingPool
+from benchmarks.orders import generate_orders
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--workers", default=",".join(str(n) for n in (1, 2, 4, 8, 16) if n <= (os.cpu_count() or 1)))
+    parser.add_argument("--logs", action="store_true", help="keep application logging enabled")
+    args = parser.parse_args()
+    if not args.logs:
+        logging.disable(logging.CRITICAL)
+
+    orders = generate_orders(args.orders, unique_descriptions=True)
+    snapshot = get_config_snapshot()
+    now = datetime.now(timezone.utc)
+
+    start = time.perf_counter()
+    schedule_batch(orders, snapshot=snapshot, now=now)
+    baseline = args.orders / (time.perf_counter() - start)
+    print(f"{'workers':>8} {'orders/s':>10} {'speedup':>8}")
+    print(f"{'in-proc':>8} {baseline:>10.0f} {1.0:>8.2f}")
+
+    for workers in (int(n) for n in args.workers.split(",")):
+        pool = SchedulingPool(workers)
+        process_backend.scheduling_pool = pool
+        try:
+            schedule_batch(orders[:workers * process_backend.SCHEDULE_PROCESS_CHUNK_ITEMS * 2], snapshot=snapshot, now=now)  # start workers
+            start = time.perf_counter()
+            schedule_batch(orders, snapshot=snapshot, now=now)
+            rate = args.orders / (time.perf_counter() - start)
+        finally:
+            pool.shutdown()
+            process_backend.scheduling_pool = None
+        print(f"{workers:>8} {rate:>10.0f} {rate / baseline:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/bench_schedule_modes.py
+# /schedule throughput and latency at high concurrency, event-loop vs threadpool execution.
+# Requests go through the full ASGI app in-process (routing, auth dependency, body validation,
+# response serialisation), so only the execution mode differs between runs.
+# Logging is silenced by default so the numbers reflect scheduling, not stderr.
+#
+#   python -m benchmarks.bench_schedule_modes [--requests 2000] [--concurrency 50,200,1000] [--logs]
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+from app import schedule_runner
+from app.config import API_KEY
+from app.main import app
+
+ORDER = {
+    "orderId": "bench",
+    "misDeliversToPostcode": "3000",
+    "misOrderQTY": 1000,
+    "orientation": "portrait",
+    "description": "Offset 150gsm Gloss Flyer",
+    "printType": 1,
+    "kinds": 1,
+    "preflightedWidth": 210.0,
+    "preflightedHeight": 297.0,
+    "misCurrentHub": "vic",
+    "misCurrentHubID": 1,
+    "misDeliversToState": "vic",
+}
+
+
+async def call(body: bytes) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/schedule", "raw_path": b"/schedule", "query_string": b"",
+        "root_path": "", "server": ("bench", 80), "client": ("127.0.0.1", 1),
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"x-api-key", API_KEY.encode()),
+        ],
+    }
+    sent = False
+    status = None
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    if status != 200:
+        raise RuntimeError(f"/schedule returned {status}")
+    return time.perf_counter() - start
+
+
+async def run(mode: str, total: int, concurrency: int) -> dict:
+    schedule_runner.SCHEDULE_EXECUTION_MODE = mode
+    body = json.dumps(ORDER).encode()
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            return await call(body)
+
+    await asyncio.gather(*(one() for _ in range(min(total, 50))))  # warm up
+    start = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(one() for _ in range(total))))
+    elapsed = time.perf_counter() - start
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", default="50,200,1000")
+    parser.add_argument("--logs", action="store_true", help="keep application logging enabled")
+    args = parser.parse_args()
+    if not args.logs:
+        logging.disable(logging.CRITICAL)
+
+    print(f"{'concurrency':>11} {'mode':>10} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for concurrency in (int(n) for n in args.concurrency.split(",")):
+        for mode in ("threadpool", "async"):
+            stats = asyncio.run(run(mode, args.requests, concurrency))
+            print(f"{concurrency:>11} {mode:>10} {stats['rps']:>9.0f} {stats['p50']:>9.2f} {stats['p99']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
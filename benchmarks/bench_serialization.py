@@ -0,0 +1,93 @@
+# benchmarks/bench_serialization.py
+# Per-response cost of turning process_order's values into /schedule response bytes.
+#   before: ScheduleResponse(**values) with validation, then FastAPI's response_model handling
+#           (serialize_response: re-validation + jsonable_encoder) and JSONResponse.render
+#   after:  build_schedule_response (construct), response_content and app.main.FastJSONResponse.render,
+#           with the standard library encoder and (if installed) orjson
+# Every "after" body is checked byte for byte against the "before" body.
+#
+#   python -m benchmarks.bench_serialization [--orders 2000] [--repeat 5]
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List
+
+from fastapi.routing import serialize_response
+from starlette.responses import JSONResponse
+
+import app.serialization as serialization
+from app.main import FastJSONResponse, app
+from app.models import ScheduleRequest, ScheduleResponse
+from app.response_cache import response_cache
+from app.schedule_logic import process_order
+from app.serialization import build_schedule_response, response_content
+from benchmarks.orders import generate_orders
+
+
+def engine_values(orders: int, seed: int) -> List[Dict[str, Any]]:
+    """The keyword arguments process_order passes for each response."""
+    responses = [process_order(ScheduleRequest.parse_obj(order)) for order in generate_orders(orders, seed=seed)]
+    return [dict(response.__dict__) for response in responses if response]
+
+
+def schedule_route_field():
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/schedule")
+    return route.secure_cloned_response_field
+
+
+def before(values: List[Dict[str, Any]]) -> List[bytes]:
+    field = schedule_route_field()
+
+    async def render() -> List[bytes]:
+        bodies = []
+        for value in values:
+            content = await serialize_response(field=field, response_content=ScheduleResponse(**value), is_coroutine=True)
+            bodies.append(JSONResponse(content).body)
+        return bodies
+
+    return asyncio.run(render())
+
+
+def after(values: List[Dict[str, Any]]) -> List[bytes]:
+    return [FastJSONResponse(response_content(build_schedule_response(value))).body for value in values]
+
+
+def best_us(fn: Callable[[List[Dict[str, Any]]], List[bytes]], values: List[Dict[str, Any]], repeat: int) -> float:
+    """Best-of-`repeat` microseconds per response."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(values)
+        times.append(time.perf_counter() - start)
+    return min(times) / len(values) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    response_cache.maxsize = 0
+
+    values = engine_values(args.orders, args.seed)
+    expected = before(values)
+    results = {"before (validate + FastAPI + json)": best_us(before, values, args.repeat)}
+    encoders = ["json"] + (["orjson"] if serialization.orjson is not None else [])
+    for encoder in encoders:
+        serialization.JSON_ENCODER = encoder
+        mismatches = sum(1 for old, new in zip(expected, after(values)) if old != new)
+        if mismatches:
+            raise SystemExit(f"{encoder}: {mismatches} of {len(values)} bodies differ from the FastAPI path")
+        results[f"after (construct + {encoder})"] = best_us(after, values, args.repeat)
+
+    print(f"{len(values)} responses, {sum(map(len, expected)) / len(expected):.0f} bytes each; bodies identical\n")
+    base = next(iter(results.values()))
+    for name, us in results.items():
+        print(f"{name:<38} {us:>8.1f} us/response  {base / us:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+# benchmarks/load_test.py
+# HTTP load test: starts app.main:app under uvicorn (one worker, throwaway credentials) and drives
+# it with synthetic orders (benchmarks/orders.py) at fixed arrival rates over keep-alive connections.
+# Arrivals are open-loop: request i is due at start + i/rate whether or not earlier ones have
+# finished, and latency is measured from that due time, so a server that falls behind shows it
+# in the percentiles instead of silently slowing the client down.
+# Results (throughput, p50/p95/p99/max latency, error rate per endpoint and rate) are written as
+# JSON tagged with the git commit; --compare prints the change against an earlier results file.
+#
+#   python -m benchmarks.load_test [--rates 100,200,400] [--duration 10] [--endpoints schedule,batch]
+#   python -m benchmarks.load_test --url http://127.0.0.1:8000 --api-key KEY   (existing server)
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks.orders import generate_orders
+
+RESULTS_DIR = Path(__file__).with_name("results")
+LOAD_TEST_API_KEY = "load-test-key"
+LOAD_TEST_USERS = {"loadtest": {"password": "load-test", "role": "admin"}}
+
+
+# ---------- Server ----------
+
+def free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def start_server(host: str, port: int, log_level: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "SCHEDULER_API_KEY": LOAD_TEST_API_KEY,
+        "USER_CREDENTIALS": json.dumps(LOAD_TEST_USERS),
+        "LOG_LEVEL": log_level,
+        "CONFIG_WATCH_ENABLED": env.get("CONFIG_WATCH_ENABLED", "0"),
+    })
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", host, "--port", str(port),
+               "--workers", "1", "--log-level", "warning", "--no-access-log"]
+    return subprocess.Popen(command, env=env)
+
+
+async def wait_until_ready(host: str, port: int, api_key: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = await HTTPConnection.open(host, port)
+            try:
+                status, _ = await connection.request("GET", "/metrics", b"", api_key)
+            finally:
+                connection.close()
+            if status == 200:
+                return
+        except OSError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server on {host}:{port} did not become ready within {timeout:.0f}s")
+
+
+# ---------- Client ----------
+
+class HTTPConnection:
+    """Minimal HTTP/1.1 keep-alive client: one request at a time, Content-Length or chunked bodies."""
+
+    def __init__(self, host: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.host = host
+        self.reader = reader
+        self.writer = writer
+        self.closed = False
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> "HTTPConnection":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(host, reader, writer)
+
+    async def request(self, method: str, path: str, body: bytes, api_key: str,
+                      content_type: str = "application/json") -> Tuple[int, bytes]:
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nX-API-KEY: {api_key}\r\n"
+                f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n")
+        self.writer.write(head.encode("latin-1") + body)
+        await self.writer.drain()
+
+        status_line, *header_lines = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        status = int(status_line.split(" ", 2)[1])
+        headers = {}
+        for line in header_lines:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            payload = b"".join(chunks)
+        else:
+            payload = await self.reader.readexactly(int(headers.get("content-length", "0")))
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, payload
+
+    def close(self) -> None:
+        self.closed = True
+        self.writer.close()
+
+
+# ---------- Endpoints ----------
+
+def build_requests(endpoint: str, orders: List[dict], batch_size: int) -> Tuple[str, str, List[bytes], int]:
+    """(path, content type, request bodies, orders per request) for one endpoint."""
+    if endpoint == "schedule":
+        return "/schedule", "application/json", [json.dumps(order).encode() for order in orders], 1
+    batches = [orders[i:i + batch_size] for i in range(0, len(orders) - batch_size + 1, batch_size)] or [orders]
+    if endpoint == "batch":
+        return "/schedule/batch", "application/json", [json.dumps(batch).encode() for batch in batches], batch_size
+    if endpoint == "stream":
+        bodies = ["\n".join(json.dumps(order) for order in batch).encode() + b"\n" for batch in batches]
+        return "/schedule/stream", "application/x-ndjson", bodies, batch_size
+    raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+def item_errors_in(endpoint: str, payload: bytes) -> int:
+    """Orders that failed inside a successful batch or stream response (reported per item)."""
+    if endpoint == "batch":
+        return json.loads(payload)["failed"]
+    if endpoint == "stream":
+        return sum(1 for line in payload.splitlines() if line and json.loads(line).get("error") is not None)
+    return 0
+
+
+async def run_rate(host: str, port: int, api_key: str, endpoint: str, rate: float, duration: float,
+                   connections: int, bodies: List[bytes], path: str, content_type: str) -> dict:
+    total = max(1, int(rate * duration))
+    queue: asyncio.Queue = asyncio.Queue()
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    item_errors = 0
+
+    async def client() -> None:
+        nonlocal item_errors
+        connection: Optional[HTTPConnection] = None
+        while True:
+            job = await queue.get()
+            if job is None:
+                break
+            index, due = job
+            try:
+                if connection is None or connection.closed:
+                    connection = await HTTPConnection.open(host, port)
+                status, payload = await connection.request("POST", path, bodies[index % len(bodies)], api_key, content_type)
+                key = str(status)
+                if status == 200:
+                    item_errors += item_errors_in(endpoint, payload)
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                key = type(e).__name__
+                if connection is not None:
+                    connection.close()
+                connection = None
+            latencies.append(time.perf_counter() - due)
+            statuses[key] = statuses.get(key, 0) + 1
+        if connection is not None:
+            connection.close()
+
+    clients = [asyncio.create_task(client()) for _ in range(connections)]
+    start = time.perf_counter()
+    for index in range(total):
+        due = start + index / rate
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        queue.put_nowait((index, due))
+    for _ in clients:
+        queue.put_nowait(None)
+    await asyncio.gather(*clients)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    errors = sum(count for key, count in statuses.items() if not key.startswith("2"))
+
+    def pct(fraction: float) -> float:
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000, 2)
+
+    return {
+        "endpoint": endpoint,
+        "path": path,
+        "target_rps": rate,
+        "duration_s": round(elapsed, 2),
+        "connections": connections,
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 1),
+        "errors": errors,
+        "error_rate": round(errors / total, 4),
+        "item_errors": item_errors,
+        "statuses": statuses,
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies) * 1000, 2),
+            "p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99), "max": round(latencies[-1] * 1000, 2),
+        },
+    }
+
+
+# ---------- Reporting ----------
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_run(run: dict, orders_per_request: int) -> None:
+    latency = run["latency_ms"]
+    print(f"{run['endpoint']:>9} {run['target_rps']:>8.0f} {run['throughput_rps']:>9.1f} "
+          f"{run['throughput_rps'] * orders_per_request:>9.0f} {latency['p50']:>8.1f} {latency['p95']:>8.1f} "
+          f"{latency['p99']:>8.1f} {latency['max']:>8.1f} {run['error_rate']:>7.2%}")
+
+
+def print_comparison(results: dict, previous: dict) -> None:
+    earlier = {(run["endpoint"], run["target_rps"]): run for run in previous.get("runs", [])}
+    print(f"\nAgainst {previous.get('commit') or 'previous run'}:")
+    print(f"{'endpoint':>9} {'rate':>8} {'rps':>9} {'p99 ms':>16} {'errors':>16}")
+    for run in results["runs"]:
+        before = earlier.get((run["endpoint"], run["target_rps"]))
+        if before is None:
+            continue
+        print(f"{run['endpoint']:>9} {run['target_rps']:>8.0f} "
+              f"{run['throughput_rps'] - before['throughput_rps']:>+9.1f} "
+              f"{before['latency_ms']['p99']:>7.1f}->{run['latency_ms']['p99']:<8.1f} "
+              f"{before['error_rate']:>7.2%}->{run['error_rate']:<7.2%}")
+
+
+async def run_all(args, host: str, port: int, api_key: str) -> List[dict]:
+    orders = generate_orders(args.orders, seed=args.seed)
+    await wait_until_ready(host, port, api_key)
+    runs = []
+    print(f"{'endpoint':>9} {'rate':>8} {'rps':>9} {'orders/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+    for endpoint in args.endpoints.split(","):
+        path, content_type, bodies, per_request = build_requests(endpoint, orders, args.batch_size)
+        rates = [float(r) for r in (args.batch_rates if endpoint != "schedule" else args.rates).split(",")]
+        if args.warmup:
+            await run_rate(host, port, api_key, endpoint, rates[0], args.warmup, args.connections, bodies, path, content_type)
+        for rate in rates:
+            run = await run_rate(host, port, api_key, endpoint, rate, args.duration, args.connections,
+                                 bodies, path, content_type)
+            run["orders_per_request"] = per_request
+            print_run(run, per_request)
+            runs.append(run)
+    return runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="load an already running server instead of starting one")
+    parser.add_argument("--api-key", default=LOAD_TEST_API_KEY)
+    parser.add_argument("--endpoints", default="schedule,batch", help="any of schedule,batch,stream")
+    parser.add_argument("--rates", default="100,200,400", help="/schedule arrival rates (requests/s)")
+    parser.add_argument("--batch-rates", default="2,5,10", help="batch/stream arrival rates (requests/s)")
+    parser.add_argument("--batch-size", type=int, default=100, help="orders per batch/stream request")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per rate")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds at the first rate before measuring")
+    parser.add_argument("--connections", type=int, default=32, help="keep-alive connections")
+    parser.add_argument("--orders", type=int, default=2000, help="distinct synthetic orders to cycle through")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--server-log-level", default="ERROR", help="LOG_LEVEL for the started server")
+    parser.add_argument("--output", type=Path, help="results file (default benchmarks/results/load_<commit>_<time>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host = "127.0.0.1"
+        port = free_port(host)
+        server = start_server(host, port, args.server_log_level)
+    try:
+        runs = asyncio.run(run_all(args, host, port, args.api_key))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    finished = datetime.now(timezone.utc)
+    results = {
+        "commit": git_commit(),
+        "finished": finished.isoformat(),
+        "target": args.url or "local uvicorn, 1 worker",
+        "cpu_count": os.cpu_count(),
+        "settings": {key: (str(value) if isinstance(value, Path) else value) for key, value in vars(args).items()
+                     if key not in ("api_key", "output", "compare")},
+        "runs": runs,
+    }
+    output = args.output or RESULTS_DIR / f"load_{results['commit'] or 'unknown'}_{finished:%Y%m%dT%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nResults written to {output}")
+    if args.compare:
+        print_comparison(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
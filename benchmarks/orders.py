@@ -0,0 +1,78 @@
+# benchmarks/orders.py
+# Synthetic order generator built from the live config, so benchmarks exercise real rules:
+# descriptions are assembled from product_keywords.json (Match_All words plus one word from each
+# Match_Any group, with some noise and ~10% that match nothing), delivery postcodes come from
+# hub_data.json and the current hub / delivery state pairs from cmyk_hubs.json.
+import random
+from typing import Any, Dict, List, Optional
+
+from app.data_manager import get_cmyk_hubs_data, get_hub_data, get_product_info_data, get_product_keywords_data
+
+NOISE_WORDS = ["Job", "Reprint", "Urgent", "Client", "Proof", "Run", "Pack", "Std"]
+UNMATCHED_DESCRIPTIONS = ["Custom Quote Item", "Sample Pack", "Misc Finishing Only", "Freight Adjustment"]
+SIZES = [(210.0, 297.0), (297.0, 420.0), (90.0, 55.0), (148.0, 210.0), (99.0, 210.0), (600.0, 900.0)]
+
+
+class OrderGenerator:
+    def __init__(self, seed: int = 11, unmatched_ratio: float = 0.1, unique_descriptions: bool = False):
+        self.rng = random.Random(seed)
+        self.unmatched_ratio = unmatched_ratio
+        self.unique_descriptions = unique_descriptions
+        product_info = get_product_info_data()
+        self.keyword_rules = [rule for rule in get_product_keywords_data() if rule.get("Match_All") or rule.get("Match_Any")]
+        self.print_types = {
+            int(product_id): record.get("printTypes") or [1]
+            for product_id, record in product_info.items()
+        }
+        self.hubs = get_cmyk_hubs_data()
+        state_by_hub_name: Dict[str, str] = {}
+        for hub in self.hubs:
+            state_by_hub_name.setdefault(hub["Hub"], hub["State"])
+        # (postcode, delivery state) pairs from every hub's postcode list
+        self.destinations = [
+            (postcode.strip(), state_by_hub_name.get(entry["hubName"], entry["hubName"]))
+            for entry in get_hub_data()
+            for postcode in str(entry.get("postcode", "")).split(",") if postcode.strip()
+        ] or [("3000", "vic")]
+
+    def description(self, rule: Optional[Dict[str, Any]]) -> str:
+        if rule is None:
+            return self.rng.choice(UNMATCHED_DESCRIPTIONS)
+        words = list(rule.get("Match_All", []))
+        words.extend(self.rng.choice(group) for group in rule.get("Match_Any", []) if group)
+        words.extend(self.rng.sample(NOISE_WORDS, self.rng.randint(0, 2)))
+        self.rng.shuffle(words)
+        return " ".join(words)
+
+    def order(self, index: int) -> Dict[str, Any]:
+        rng = self.rng
+        rule = None if rng.random() < self.unmatched_ratio else rng.choice(self.keyword_rules)
+        description = self.description(rule)
+        if self.unique_descriptions:
+            description = f"{description} #{index}"
+        print_types = self.print_types.get(rule["Product_ID"], [1]) if rule else [1, 2]
+        current_hub = rng.choice(self.hubs)
+        postcode, state = rng.choice(self.destinations)
+        width, height = rng.choice(SIZES)
+        return {
+            "orderId": f"bench-{index}",
+            "misDeliversToPostcode": postcode,
+            "misOrderQTY": rng.choice([100, 250, 500, 1000, 2500, 5000]) + index % 7,
+            "orientation": "portrait" if height >= width else "landscape",
+            "description": description,
+            "printType": rng.choice(print_types),
+            "kinds": rng.randint(1, 3),
+            "preflightedWidth": width,
+            "preflightedHeight": height,
+            "misCurrentHub": current_hub["Hub"],
+            "misCurrentHubID": current_hub["CMHKhubID"],
+            "misDeliversToState": state,
+        }
+
+    def orders(self, count: int) -> List[Dict[str, Any]]:
+        return [self.order(i) for i in range(count)]
+
+
+def generate_orders(count: int, seed: int = 11, unique_descriptions: bool = False) -> List[Dict[str, Any]]:
+    """`count` raw order dicts (ScheduleRequest-shaped), reproducible for a given seed."""
+    return OrderGenerator(seed, unique_descriptions=unique_descriptions).orders(count)
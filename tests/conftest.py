@@ -0,0 +1,52 @@
+# Helpers shared by the test modules
+import asyncio
+import json
+
+from app.config import API_KEY
+from app.models import ScheduleRequest
+
+
+def make_request(**overrides):
+    fields = dict(
+        misDeliversToPostcode="3000",
+        misOrderQTY=1000,
+        orientation="portrait",
+        description="Offset 150gsm Gloss Flyer",
+        printType=1,
+        kinds=1,
+        preflightedWidth=210.0,
+        preflightedHeight=297.0,
+        misCurrentHub="vic",
+        misCurrentHubID=1,
+        misDeliversToState="vic",
+    )
+    fields.update(overrides)
+    return ScheduleRequest(**fields)
+
+
+def post(asgi_app, path: str, payload) -> dict:
+    """POST `payload` as JSON straight to an ASGI app; returns status, headers and body."""
+    body = json.dumps(payload).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "server": ("test", 80), "client": ("127.0.0.1", 1),
+        "headers": [(b"content-type", b"application/json"), (b"x-api-key", API_KEY.encode())],
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    started = {}
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            started.update(status=message["status"], headers=dict(message["headers"]), body=b"")
+        elif message["type"] == "http.response.body":
+            started["body"] += message.get("body", b"")
+
+    asyncio.run(asyncio.wait_for(asgi_app(scope, receive, send), 30))
+    return started
+
@@ -0,0 +1,41 @@
+import json
+from datetime import datetime, timezone
+
+from app.batch_scheduler import schedule_batch
+from app.config_snapshot import get_config_snapshot
+from app.main import app
+from tests.conftest import make_request, post
+
+
+def test_batch_uses_one_snapshot_and_instant():
+    snapshot = get_config_snapshot()
+    now = datetime(2025, 3, 4, 1, 30, tzinfo=timezone.utc)
+    orders = [make_request(orderId=str(i)).dict() for i in range(3)]
+    batch = schedule_batch(orders, snapshot=snapshot, now=now)
+
+    assert batch["configVersion"] == snapshot.version
+    assert batch["processedAt"] == now.isoformat()
+    assert (batch["succeeded"], batch["failed"]) == (3, 0)
+    assert [item["orderId"] for item in batch["results"]] == ["0", "1", "2"]
+    assert len({item["result"]["actualProcessingTime"] for item in batch["results"]}) == 1
+
+
+def test_batch_reports_errors_per_item():
+    good = make_request(orderId="ok").dict()
+    missing_qty = {k: v for k, v in make_request(orderId="bad").dict().items() if k != "misOrderQTY"}
+    batch = schedule_batch([good, missing_qty, "not an order"])
+
+    assert (batch["succeeded"], batch["failed"]) == (1, 2)
+    ok, bad, garbage = batch["results"]
+    assert ok["error"] is None and ok["result"]["productId"]
+    assert bad["orderId"] == "bad" and "misOrderQTY" in bad["error"]
+    assert garbage["index"] == 2 and garbage["result"] is None
+
+
+def test_endpoint_reports_non_object_items_per_item():
+    good = json.loads(make_request(orderId="ok").json())
+    response = post(app, "/schedule/batch", [good, "not an order", 42, None])
+    assert response["status"] == 200
+    batch = json.loads(response["body"])
+    assert (batch["succeeded"], batch["failed"]) == (1, 3)
+    assert [item["index"] for item in batch["results"] if item["error"]] == [1, 2, 3]
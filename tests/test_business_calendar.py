@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+
+from app.business_calendar import BusinessCalendar, HubCalendars, get_business_calendar
+from app.config_snapshot import get_config_snapshot
+from app.schedule_logic import add_business_days, get_closed_dates_for_state
+
+
+def test_calendar_matches_day_walk_for_every_hub():
+    snapshot = get_config_snapshot()
+    hubs = {entry["Hub"].lower() for entry in snapshot.cmyk_hubs} | {"unknown", "VIC"}
+    today = date.today()
+    for hub in hubs:
+        calendar = get_business_calendar(snapshot, hub)
+        closed_dates = get_closed_dates_for_state(hub, snapshot.cmyk_hubs)
+        for offset in range(-30, 400, 3):
+            start = today + timedelta(days=offset)
+            for days in (0, 1, 2, 5, 13):
+                assert calendar.add_business_days(start, days) == add_business_days(start, days, closed_dates), (hub, start, days)
+
+
+def test_closed_dates_and_non_canonical_strings():
+    closed = ["2025-01-06", "2025-1-7", 20250108, "2025-01-09"]
+    calendar = BusinessCalendar(closed, date(2024, 12, 1), date(2025, 3, 1))
+    assert calendar.closed == {date(2025, 1, 6), date(2025, 1, 9)}
+    # Fri 3 Jan + 2 business days skips the weekend and closed Monday 6 Jan
+    assert calendar.add_business_days(date(2025, 1, 3), 2) == add_business_days(date(2025, 1, 3), 2, closed)
+    assert calendar.add_business_days(date(2025, 1, 4), 0) == (date(2025, 1, 7), date(2025, 1, 7))
+
+
+def test_outside_horizon_falls_back_to_walk():
+    closed = ["2030-01-01"]
+    calendar = BusinessCalendar(closed, date(2025, 1, 1), date(2025, 2, 1))
+    for start, days in ((date(2024, 6, 1), 3), (date(2025, 1, 28), 10), (date(2029, 12, 30), 2)):
+        assert calendar.add_business_days(start, days) == add_business_days(start, days, closed)
+
+
+def test_horizon_rolls_forward():
+    calendars = HubCalendars([{"Hub": "vic", "Closed_Dates": []}], today=date(2025, 1, 1))
+    first = calendars.get("vic", today=date(2025, 1, 2))
+    rolled = calendars.get("vic", today=date(2026, 6, 1))
+    assert rolled is not first
+    assert rolled.start_ordinal > first.start_ordinal
+
+
+def test_non_list_closed_dates_defers_to_scan():
+    calendars = HubCalendars([{"Hub": "vic", "Closed_Dates": "2025-01-06"}])
+    assert calendars.get("vic") is None
@@ -0,0 +1,50 @@
+import pytest
+
+from app import config_snapshot, data_manager
+from app import hub_selection, imposing_logic, preflight_logic, product_matcher, schedule_logic
+from app.config_snapshot import get_config_snapshot, register_index
+from app.schedule_logic import process_order
+from tests.conftest import make_request
+
+
+def test_snapshot_reused_until_version_changes():
+    first = get_config_snapshot()
+    assert get_config_snapshot() is first
+
+    data_manager.invalidate_config_cache("hub_rules.json")
+    second = get_config_snapshot()
+    assert second is not first
+    assert second.version > first.version
+
+
+def test_snapshot_is_frozen():
+    snapshot = get_config_snapshot()
+    with pytest.raises(Exception):
+        snapshot.cmyk_hubs = []
+
+
+def test_index_built_once_per_snapshot():
+    calls = []
+    register_index("test_counter", lambda snap: calls.append(snap.version) or len(calls))
+    try:
+        snapshot = get_config_snapshot()
+        assert snapshot.index("test_counter") == snapshot.index("test_counter")
+        assert len(calls) == 1
+    finally:
+        config_snapshot._index_builders.pop("test_counter", None)
+
+
+def test_process_order_uses_only_pinned_snapshot(monkeypatch):
+    snapshot = get_config_snapshot()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("config was loaded outside the pinned snapshot")
+    for name in dir(data_manager):
+        if name.startswith("get_") and name.endswith("_data"):
+            monkeypatch.setattr(data_manager, name, fail)
+    for module in (config_snapshot, hub_selection, imposing_logic, preflight_logic, product_matcher, schedule_logic):
+        monkeypatch.setattr(module, "get_config_snapshot", fail)
+
+    response = process_order(make_request(), snapshot=snapshot)
+    assert response is not None
+    assert response.productId
@@ -0,0 +1,54 @@
+import pytest
+
+from app import config_snapshot, data_manager
+from app.config_snapshot import get_config_snapshot
+from app.config_watcher import ConfigWatcher
+
+
+@pytest.fixture
+def watcher():
+    watcher = ConfigWatcher(interval=3600)
+    yield watcher
+    watcher.stop()
+    data_manager.invalidate_config_cache()
+
+
+def test_save_publishes_a_new_generation(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_manager, "DATA_DIR", tmp_path)
+    data_manager.save_hub_data([{"hubName": "vic", "hubId": 1, "postcode": "3000"}])
+    first = data_manager.read_config_generation()
+    data_manager.save_hub_data([{"hubName": "vic", "hubId": 1, "postcode": "3001"}])
+    second = data_manager.read_config_generation()
+
+    assert first and second and first != second
+    assert second == data_manager.published_config_generation()
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_requests_serve_published_snapshot_without_disk_checks(watcher, monkeypatch):
+    watcher.start()
+    snapshot = get_config_snapshot()
+
+    def no_stat(*args, **kwargs):
+        raise AssertionError("request path touched the filesystem")
+
+    monkeypatch.setattr(data_manager, "_file_signature", no_stat)
+    monkeypatch.setattr(data_manager, "_last_version_check", 0.0)
+    data_manager.invalidate_config_cache("hub_rules.json")
+    # The rebuild belongs to the watcher; requests keep the published snapshot meanwhile
+    assert get_config_snapshot() is snapshot
+    assert config_snapshot.peek_config_snapshot() is snapshot
+
+
+def test_other_process_generation_triggers_full_reload(watcher, tmp_path, monkeypatch):
+    # An absolute stamp path keeps the test out of the real data directory
+    monkeypatch.setattr(data_manager, "CONFIG_GENERATION_FILE", str(tmp_path / "generation"))
+    watcher.start()
+    snapshot = get_config_snapshot()
+    assert watcher.poll() is False
+
+    # Another worker's save: a stamp this process did not write
+    (tmp_path / "generation").write_text("other-worker", encoding="utf-8")
+    assert watcher.poll() is True
+    assert get_config_snapshot().version > snapshot.version
+    assert watcher.poll() is False
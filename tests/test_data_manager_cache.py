@@ -0,0 +1,74 @@
+import json
+import os
+
+import pytest
+
+from app import data_manager
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point the data manager at an isolated data directory with a cold cache."""
+    monkeypatch.setattr(data_manager, "DATA_DIR", tmp_path)
+    data_manager.invalidate_config_cache()
+    yield tmp_path
+    data_manager.invalidate_config_cache()
+
+
+def write_hub_data(path, postcode):
+    with open(path / "hub_data.json", "w", encoding="utf-8") as f:
+        json.dump([{"hubName": "vic", "hubId": 1, "postcode": postcode}], f)
+
+
+def test_getter_returns_cached_object(data_dir, monkeypatch):
+    write_hub_data(data_dir, "3000")
+    first = data_manager.get_hub_data()
+
+    # A second call must not re-read the file
+    def fail_load(*args, **kwargs):
+        raise AssertionError("file was re-read")
+    monkeypatch.setattr(data_manager, "load_json_file", fail_load)
+    assert data_manager.get_hub_data() is first
+
+
+def test_save_invalidates_and_bumps_version(data_dir):
+    write_hub_data(data_dir, "3000")
+    assert data_manager.get_hub_data()[0]["postcode"] == "3000"
+    version = data_manager.get_config_version()
+
+    data_manager.save_hub_data([{"hubName": "vic", "hubId": 1, "postcode": "3001"}])
+
+    assert data_manager.get_config_version() > version
+    assert data_manager.get_hub_data()[0]["postcode"] == "3001"
+
+
+def test_external_edit_detected_after_stat_interval(data_dir, monkeypatch):
+    monkeypatch.setattr(data_manager, "CONFIG_STAT_INTERVAL", 0)
+    write_hub_data(data_dir, "3000")
+    data_manager.get_hub_data()
+    version = data_manager.get_config_version()
+
+    write_hub_data(data_dir, "3000,3001")
+    # Force a different mtime even on coarse-grained filesystems
+    st = os.stat(data_dir / "hub_data.json")
+    os.utime(data_dir / "hub_data.json", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert data_manager.get_config_version() > version
+    assert data_manager.get_hub_data()[0]["postcode"] == "3000,3001"
+
+
+def test_stat_interval_skips_filesystem(data_dir, monkeypatch):
+    monkeypatch.setattr(data_manager, "CONFIG_STAT_INTERVAL", 3600)
+    write_hub_data(data_dir, "3000")
+    data_manager.get_hub_data()
+    data_manager.get_config_version()
+
+    def fail_stat(*args, **kwargs):
+        raise AssertionError("filesystem was touched")
+    monkeypatch.setattr(data_manager, "_file_signature", fail_stat)
+    data_manager.get_hub_data()
+    data_manager.get_config_version()
+
+
+def test_missing_hub_rules_file_is_empty_rule_set(data_dir):
+    assert data_manager.get_hub_rules_data() == {"rules": [], "equipment": {}}
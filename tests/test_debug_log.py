@@ -0,0 +1,98 @@
+import logging
+import threading
+
+from app.debug_log import DebugCaptureHandler, DebugLogBuffer, bind_order_id, reset_order_id
+from app.response_cache import response_cache
+from app.schedule_logic import process_order
+from tests.conftest import make_request
+
+
+def capture(capacity=10, level=logging.DEBUG):
+    buffer = DebugLogBuffer(capacity)
+    log = logging.getLogger(f"test.debug_log.{id(buffer)}")
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    log.addHandler(DebugCaptureHandler(buffer, level))
+    return buffer, log
+
+
+def test_ring_keeps_newest_and_formats_on_read():
+    buffer, log = capture(capacity=3)
+    for i in range(5):
+        log.info("message %s", i)
+    entries, cursor = buffer.entries()
+    assert [e["message"] for e in entries] == ["message 2", "message 3", "message 4"]
+    assert [e["seq"] for e in entries] == [3, 4, 5] and cursor == 5
+    assert entries[0]["level"] == "INFO" and entries[0]["logger"] == log.name
+
+
+def test_cursor_paging_and_filters():
+    buffer, log = capture()
+    log.debug("a")
+    token = bind_order_id("42")
+    try:
+        log.warning("b")
+        log.debug("c")
+    finally:
+        reset_order_id(token)
+    log.error("d")
+
+    page, cursor = buffer.entries(limit=2)
+    assert [e["message"] for e in page] == ["a", "b"]
+    page, cursor = buffer.entries(since=cursor)
+    assert [e["message"] for e in page] == ["c", "d"]
+    assert buffer.entries(since=cursor) == ([], cursor)
+
+    assert [e["message"] for e in buffer.entries(level=logging.WARNING)[0]] == ["b", "d"]
+    assert [e["message"] for e in buffer.entries(order_id="42")[0]] == ["b", "c"]
+
+
+def test_capture_level_is_independent_of_logger():
+    buffer, log = capture(level=logging.WARNING)
+    log.info("skipped")
+    log.warning("kept")
+    assert [e["message"] for e in buffer.entries()[0]] == ["kept"]
+
+
+def test_concurrent_writers_get_unique_sequence_numbers():
+    buffer, log = capture(capacity=4000)
+    threads = [threading.Thread(target=lambda: [log.debug("x") for _ in range(500)]) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    entries, _ = buffer.entries()
+    assert sorted(e["seq"] for e in entries) == list(range(1, 4001))
+
+
+def test_process_order_tags_records_with_order_id():
+    buffer = DebugLogBuffer(2000)
+    handler = DebugCaptureHandler(buffer)
+    app_logger = logging.getLogger("app")
+    previous = app_logger.level
+    app_logger.setLevel(logging.DEBUG)
+    app_logger.addHandler(handler)
+    try:
+        process_order(make_request(orderId="tagged"))
+    finally:
+        app_logger.removeHandler(handler)
+        app_logger.setLevel(previous)
+    tagged = buffer.entries(order_id="tagged")[0]
+    assert tagged and len(tagged) == len(buffer.entries()[0])
+    assert any("Received /schedule request" in e["message"] for e in tagged)
+
+
+def test_orientation_warning_is_logged_for_every_order():
+    buffer = DebugLogBuffer(2000)
+    handler = DebugCaptureHandler(buffer, logging.WARNING)
+    app_logger = logging.getLogger("app")
+    app_logger.addHandler(handler)
+    try:
+        for order_id in ("sideways-1", "sideways-2"):
+            response_cache.clear()
+            process_order(make_request(orderId=order_id, orientation="sideways"))
+    finally:
+        app_logger.removeHandler(handler)
+    for order_id in ("sideways-1", "sideways-2"):
+        entries = buffer.entries(order_id=order_id)[0]
+        assert any("Unexpected orientation 'sideways'" in e["message"] for e in entries), order_id
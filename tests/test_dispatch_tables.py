@@ -0,0 +1,104 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.business_calendar import BusinessCalendar
+from app.config_snapshot import get_config_snapshot
+from app.dispatch_tables import (
+    AFTER_CUTOFF, BEFORE_CUTOFF, BEFORE_EFFECTIVE_RUN, EFFECTIVE_RUN_PASSED, DispatchTable, DispatchTables,
+    get_dispatch_tables, resolve_run_dates, run_date_overrides, start_weekdays,
+)
+from app.metrics import NULL_CLOCK
+from app.models import ScheduleRequest
+from app.response_cache import response_cache
+from app.schedule_logic import _process_order
+from benchmarks.orders import generate_orders
+
+MON_WED_FRI = start_weekdays(["Monday", "Wednesday", "Friday"])
+
+
+def test_override_moves_effective_run():
+    overrides = run_date_overrides([["2025-06-09", "2025-06-11", ["VIC"]], ["2025-06-09", "2025-06-12", ["vic"]]], "vic")
+    assert overrides == {date(2025, 6, 9): date(2025, 6, 11)}  # first entry wins
+    assert run_date_overrides([["2025-06-09", "2025-06-11", ["nsw"]], ["bad"]], "vic") == {}
+
+    # Sat 7 Jun: next natural run Mon 9 Jun is moved to Wed 11 Jun
+    assert resolve_run_dates(date(2025, 6, 7), False, MON_WED_FRI, overrides) == \
+        (BEFORE_EFFECTIVE_RUN, date(2025, 6, 11), date(2025, 6, 11))
+    # Mon 9 Jun: the moved run is still ahead
+    assert resolve_run_dates(date(2025, 6, 9), False, MON_WED_FRI, overrides).effective_run_date == date(2025, 6, 11)
+    # Wed 11 Jun before and after cutoff
+    assert resolve_run_dates(date(2025, 6, 11), True, MON_WED_FRI, overrides) == \
+        (BEFORE_CUTOFF, date(2025, 6, 11), date(2025, 6, 11))
+    assert resolve_run_dates(date(2025, 6, 11), False, MON_WED_FRI, overrides) == \
+        (AFTER_CUTOFF, date(2025, 6, 11), date(2025, 6, 13))
+    # Tuesday is not a start day: orders wait for Wednesday's run
+    assert resolve_run_dates(date(2025, 6, 10), False, MON_WED_FRI, {}) == \
+        (BEFORE_EFFECTIVE_RUN, date(2025, 6, 11), date(2025, 6, 11))
+
+
+def test_run_moved_into_the_past_is_passed():
+    overrides = {date(2025, 6, 11): date(2025, 6, 10)}
+    assert resolve_run_dates(date(2025, 6, 11), True, MON_WED_FRI, overrides) == \
+        (EFFECTIVE_RUN_PASSED, date(2025, 6, 10), date(2025, 6, 13))
+
+
+def test_no_start_days_is_an_error():
+    with pytest.raises(ValueError):
+        resolve_run_dates(date(2025, 6, 11), True, start_weekdays(["Funday"]), {})
+
+
+def test_table_matches_direct_resolution():
+    closed = ["2025-06-09", "2025-06-20"]
+    calendar = BusinessCalendar(closed, date(2025, 1, 1), date(2026, 1, 1))
+    overrides = {date(2025, 6, 9): date(2025, 6, 11), date(2025, 6, 20): date(2025, 6, 21)}
+    first = date(2025, 6, 1)
+    table = DispatchTable(MON_WED_FRI, overrides, calendar, first, days=40, max_production_days=6)
+    for offset in range(40):
+        today = first + timedelta(days=offset)
+        for before in (True, False):
+            entry = table.entry(today, before)
+            assert entry.run == resolve_run_dates(today, before, MON_WED_FRI, overrides)
+            for days in range(7):
+                assert entry.dispatch[days] == calendar.add_business_days(entry.run.calculated_start_date, days)
+    assert table.entry(first - timedelta(days=1), True) is None
+    assert table.entry(first + timedelta(days=40), True) is None
+
+
+def test_tables_are_shared_by_inputs():
+    snapshot = get_config_snapshot()
+    tables = DispatchTables(snapshot, today=date.today())
+    catalog = tables._catalog
+    by_key = {}
+    for product in catalog:
+        for hub in product.production_hubs:
+            table = tables._tables[(product.product_id, hub)]
+            if table is None:
+                continue
+            key = (frozenset(product.start_days), tuple(sorted(run_date_overrides(product.raw.get("Modified_run_date", []), hub).items())), hub)
+            assert by_key.setdefault(key, table) is table
+    # Rebuilding for the same day reuses every table
+    rebuilt = DispatchTables(snapshot, today=date.today())
+    assert all(rebuilt._tables[key] is table for key, table in tables._tables.items())
+
+
+def test_process_order_matches_fallback(monkeypatch):
+    response_cache.clear()
+    snapshot = get_config_snapshot()
+    tables = get_dispatch_tables(snapshot)
+    now = datetime.now(timezone.utc)
+    orders = generate_orders(300, seed=5)
+
+    def schedule():
+        results = []
+        for hours in (0, 6, 30):
+            for order in orders:
+                req = ScheduleRequest.parse_obj(order)
+                req.timeOffsetHours = hours
+                response = _process_order(req, snapshot, now, NULL_CLOCK)
+                results.append(response and response.dict(exclude={"actualProcessingTime", "simulatedProcessingTime"}))
+        return results
+
+    with_tables = schedule()
+    monkeypatch.setattr(tables, "entry", lambda *args: None)
+    assert schedule() == with_tables
@@ -0,0 +1,80 @@
+import random
+
+from app.config_snapshot import get_config_snapshot
+from app.finishing_engine import FinishingEngine
+from app.models import FinishingRules
+from app.schedule_logic import check_keywords, check_rule_conditions
+from tests.conftest import make_request
+
+
+def reference_days(rules, req, product_obj, chosen_hub):
+    """The per-rule evaluation calculate_finishing_days used before compilation."""
+    days = 0
+    total_qty = req.misOrderQTY * req.kinds
+    for rule in rules.keywordRules:
+        if rule.enabled and check_rule_conditions(rule, req, product_obj, total_qty, chosen_hub) and check_keywords(rule, req.description):
+            base = rule.addDays
+            if rule.conditions and rule.conditions.hubOverrides:
+                override = rule.conditions.hubOverrides.get(req.misCurrentHub.lower())
+                if override is not None:
+                    base = override
+            days += base
+    if req.centerId is not None:
+        for rule in rules.centerRules:
+            if not rule.enabled or req.centerId != rule.centerId:
+                continue
+            desc = req.description if rule.caseSensitive else req.description.lower()
+            excluded = [k if rule.caseSensitive else k.lower() for k in (rule.excludeKeywords or [])]
+            if not any(k in desc for k in excluded):
+                days += rule.addDays
+    return days
+
+
+CUSTOM_RULES = FinishingRules(
+    keywordRules=[
+        {"id": "all", "description": "", "keywords": ["Foil", "Gold"], "matchType": "all", "caseSensitive": True, "addDays": 2},
+        {"id": "no-kw", "description": "", "keywords": [], "excludeKeywords": ["flyer"], "addDays": 1,
+         "conditions": {"productionHubIs": ["VIC"], "hubOverrides": {"nsw": 4}}},
+        {"id": "qty", "description": "", "keywords": ["flyer"], "excludeKeywords": ["Matt"], "addDays": 1,
+         "conditions": {"quantityGreaterOrEqual": 500, "productGroupNotContains": "CARD", "productIdNotEqual": 99}},
+        {"id": "off", "description": "", "keywords": ["flyer"], "addDays": 9, "enabled": False},
+    ],
+    centerRules=[
+        {"id": "c1", "description": "", "centerId": 7, "excludeKeywords": ["Scodix"], "addDays": -1},
+        {"id": "c2", "description": "", "centerId": 7, "excludeKeywords": ["Rush"], "caseSensitive": True, "addDays": 3},
+    ],
+)
+
+
+def test_custom_rules_match_reference():
+    engine = FinishingEngine(CUSTOM_RULES)
+    product = {"Product_ID": 6, "Product_Group": "Flyers"}
+    words = ["Foil", "foil", "Gold", "Flyer", "flyer", "Matt", "scodix", "Rush", "rush", "A5"]
+    rng = random.Random(3)
+    for _ in range(300):
+        req = make_request(
+            description=" ".join(rng.sample(words, k=rng.randint(1, 5))),
+            misOrderQTY=rng.choice([100, 500, 1000]),
+            misCurrentHub=rng.choice(["vic", "NSW", "qld"]),
+            centerId=rng.choice([None, 7, 8]),
+        )
+        hub = rng.choice(["vic", "Vic", "nsw"])
+        assert engine.calculate(req, product, hub) == reference_days(CUSTOM_RULES, req, product, hub)
+
+
+def test_live_rules_match_reference():
+    snapshot = get_config_snapshot()
+    rules = snapshot.index("finishing_rules")
+    engine = snapshot.index("finishing_engine")
+    vocabulary = sorted({k for r in rules.keywordRules for k in (r.keywords or []) + (r.excludeKeywords or [])})
+    center_ids = [r.centerId for r in rules.centerRules] + [None, 1]
+    rng = random.Random(11)
+    for _ in range(300):
+        req = make_request(
+            description=" ".join(rng.sample(vocabulary, k=min(len(vocabulary), rng.randint(0, 4)))) + " Flyer",
+            misOrderQTY=rng.choice([50, 250, 1000, 5000]),
+            centerId=rng.choice(center_ids),
+        )
+        product = {"Product_ID": rng.choice([1, 6, 30, 99]), "Product_Group": rng.choice(["Flyers", "Business Cards"])}
+        hub = rng.choice(["vic", "nsw", "qld", "wa", "nqld"])
+        assert engine.calculate(req, product, hub) == reference_days(rules, req, product, hub)
@@ -0,0 +1,72 @@
+import dataclasses
+from datetime import date
+
+from app.config_snapshot import get_config_snapshot
+from app.hub_rule_engine import DateWindow, HubRuleEngine, HubRuleOrder
+from app.hub_selection import parse_hub_rules, validate_hub_rules
+
+
+def make_engine(rules):
+    return HubRuleEngine(parse_hub_rules({"rules": rules}))
+
+
+def order(**overrides):
+    fields = dict(description="Gloss Flyer", width=210.0, height=297.0, quantity=1000,
+                  product_id=6, product_group="Flyers", print_type=2)
+    fields.update(overrides)
+    return HubRuleOrder(**fields)
+
+
+def test_size_rule_excludes_only_its_hub():
+    engine = make_engine([
+        {"id": "r1", "hubId": "QLD", "sizeConstraints": {"maxWidth": 437, "maxHeight": 310}},
+    ])
+    assert engine.excluding_rule("qld", order(width=500.0)) == ("r1", "Size")
+    assert engine.excluding_rule("qld", order(width=300.0, height=430.0)) is None  # fits rotated
+    assert engine.excluding_rule("vic", order(width=500.0)) is None
+
+
+def test_size_and_order_criteria_must_both_match():
+    engine = make_engine([
+        {"id": "r1", "hubId": "qld", "sizeConstraints": {"maxWidth": 437, "maxHeight": 310},
+         "orderCriteria": {"printTypes": [2], "maxQuantity": 500}},
+    ])
+    assert engine.excluding_rule("qld", order(width=500.0)) == ("r1", "Size AND Order Criteria")
+    assert engine.excluding_rule("qld", order(width=500.0, quantity=400)) is None
+    assert engine.excluding_rule("qld", order(width=500.0, print_type=1)) is None
+    assert engine.excluding_rule("qld", order(width=200.0)) is None
+
+
+def test_order_criteria_keywords_groups_and_overrides():
+    engine = make_engine([
+        {"id": "kw", "hubId": "nsw", "priority": 5,
+         "orderCriteria": {"keywords": ["GLOSS"], "excludeProductGroups": ["cards"], "excludeProductIds": [7]}},
+        {"id": "empty", "hubId": "nsw", "orderCriteria": {"priceLessThan": 10}},
+        {"id": "off", "hubId": "nsw", "enabled": False, "orderCriteria": {"minQuantity": 1}},
+    ])
+    assert engine.excluding_rule("nsw", order()) == ("kw", "Order Criteria")
+    assert engine.excluding_rule("nsw", order(product_group="CARDS")) is None
+    assert engine.excluding_rule("nsw", order(product_id=7)) is None
+    assert engine.excluding_rule("nsw", order(description="Matt Flyer")) is None
+
+
+def test_date_windows_are_parsed_once():
+    window = DateWindow(start=date(2025, 1, 1), end=date(2025, 1, 31), always=False)
+    assert window.is_active(date(2025, 1, 15))
+    assert not window.is_active(date(2025, 2, 1))
+    engine = make_engine([
+        {"id": "bad", "hubId": "wa", "startDate": "not-a-date", "sizeConstraints": {"maxWidth": 1, "maxHeight": 1}},
+    ])
+    assert engine.excluding_rule("wa", order()) is None
+
+
+def test_validate_hub_rules_skips_excluded_candidate():
+    snapshot = get_config_snapshot()
+    rules = {"rules": [{"id": "no-vic", "hubId": "vic", "orderCriteria": {"printTypes": [1, 2, 3]}}], "equipment": {}}
+    custom = dataclasses.replace(snapshot, hub_rules=rules)
+    chosen = validate_hub_rules(
+        initial_hub="vic", available_hubs=["vic", "nsw"], delivers_to_state="vic",
+        description="Gloss Flyer", width=210.0, height=297.0, quantity=1000, product_id=6,
+        product_group="Flyers", print_type=1, cmyk_hubs=snapshot.cmyk_hubs, snapshot=custom,
+    )
+    assert chosen == "nsw"
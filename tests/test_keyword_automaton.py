@@ -0,0 +1,54 @@
+import random
+
+from app.config_snapshot import get_config_snapshot
+from app.keyword_automaton import KeywordAutomaton, KeywordRuleSet
+from app.product_matcher import exclude_all, match_all, match_any
+from app.production_group_mapper import match_production_groups
+
+
+def naive_matches(entries, description):
+    desc_lower = description.lower()
+    return [
+        e for e in entries
+        if match_all(e.get("Match_All", []), desc_lower)
+        and exclude_all(e.get("Exclude_All", []), desc_lower)
+        and match_any(e.get("Match_Any", []), desc_lower)
+    ]
+
+
+def test_scan_finds_overlapping_and_nested_patterns():
+    automaton = KeywordAutomaton(["he", "she", "his", "hers", "", "xyz"])
+    hits = automaton.scan("ushers")
+    assert hits == automaton.mask(["he", "she", "hers", ""])
+
+
+def test_rule_set_matches_naive_semantics_on_live_keywords():
+    snapshot = get_config_snapshot()
+    rules = KeywordRuleSet(snapshot.product_keywords)
+    vocabulary = sorted({kw for e in snapshot.product_keywords for kw in e.get("Match_All", []) + e.get("Exclude_All", [])})
+    rng = random.Random(1234)
+    for _ in range(300):
+        description = " ".join(rng.sample(vocabulary, k=min(len(vocabulary), rng.randint(1, 6))))
+        assert list(rules.matches(description)) == naive_matches(snapshot.product_keywords, description)
+
+
+def test_rule_set_edge_cases():
+    entries = [
+        {"name": "empty-any-group", "Match_All": [], "Exclude_All": [], "Match_Any": [[]]},
+        {"name": "empty-keyword", "Match_All": [""], "Exclude_All": [], "Match_Any": []},
+        {"name": "case", "Match_All": ["GLOSS"], "Exclude_All": ["Matt"], "Match_Any": [["a5", "A4"]]},
+        {"name": "no-rules"},
+    ]
+    assert [e["name"] for e in KeywordRuleSet(entries).matches("Gloss A4 flyer")] == ["empty-keyword", "case", "no-rules"]
+    assert [e["name"] for e in KeywordRuleSet(entries).matches("gloss matt a4")] == ["empty-keyword", "no-rules"]
+    for description in ("Gloss A4 flyer", "gloss matt a4"):
+        assert list(KeywordRuleSet(entries).matches(description)) == naive_matches(entries, description)
+
+
+def test_production_groups_use_snapshot_index():
+    snapshot = get_config_snapshot()
+    groups = [{"id": 1, "name": "Laminating", "Match_All": ["lam"], "Exclude_All": [], "Match_Any": []}]
+    assert match_production_groups("Gloss Laminated BC", groups) == ["Laminating"]
+    assert match_production_groups("Gloss BC", snapshot.production_groups, snapshot=snapshot) == [
+        g["name"] for g in naive_matches(snapshot.production_groups, "Gloss BC")
+    ]
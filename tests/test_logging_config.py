@@ -0,0 +1,70 @@
+import logging
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth import require_admin
+from app.logging_config import get_log_levels, parse_level_overrides, set_log_levels
+from app.models import ScheduleRequest
+from app.response_cache import response_cache
+from app.schedule_logic import process_order
+from tests.conftest import make_request
+
+
+@pytest.fixture
+def restore_levels():
+    saved = {name: logging.getLogger(name).level for name in ("app", "app.schedule_logic")}
+    yield
+    for name, level in saved.items():
+        logging.getLogger(name).setLevel(level)
+
+
+def test_parse_level_overrides():
+    assert parse_level_overrides(" app=info, app.hub_selection=DEBUG ,") == {"app": logging.INFO, "app.hub_selection": logging.DEBUG}
+    with pytest.raises(ValueError):
+        parse_level_overrides("app.hub_selection")
+    with pytest.raises(ValueError):
+        parse_level_overrides("app=LOUD")
+
+
+def test_module_loggers_inherit_and_override(restore_levels):
+    levels = set_log_levels({"app": "WARNING", "app.schedule_logic": "DEBUG"})
+    assert levels["app.hub_selection"] == "WARNING"
+    assert levels["app.schedule_logic"] == "DEBUG"
+
+    levels = set_log_levels({"app.schedule_logic": None})
+    assert levels["app.schedule_logic"] == "WARNING"
+
+
+def test_invalid_level_applies_nothing(restore_levels):
+    set_log_levels({"app": "INFO"})
+    with pytest.raises(ValueError):
+        set_log_levels({"app": "ERROR", "app.schedule_logic": "nope"})
+    assert get_log_levels()["app"] == "INFO"
+
+
+def test_disabled_debug_skips_payload_dump(restore_levels, monkeypatch):
+    set_log_levels({"app": "INFO"})
+
+    def no_dict(self, *args, **kwargs):
+        raise AssertionError("req.dict() called with DEBUG disabled")
+
+    monkeypatch.setattr(ScheduleRequest, "dict", no_dict)
+    assert process_order(make_request(orderId="quiet")).orderId == "quiet"
+
+
+
+def test_schedule_log_is_formatted_lazily(restore_levels, caplog):
+    set_log_levels({"app": "DEBUG"})
+    response_cache.clear()
+    with caplog.at_level(logging.DEBUG, logger="app.schedule_logic"):
+        response = process_order(make_request(orderId="lazy"))
+    records = [r for r in caplog.records if r.msg.startswith("SCHEDULE LOG:")]
+    assert len(records) == 1 and records[0].args  # Arguments, not a pre-built string
+    assert f"DispatchDate={response.dispatchDate}" in records[0].getMessage()
+
+def test_require_admin():
+    assert require_admin({"username": "admin", "role": "admin"})["role"] == "admin"
+    with pytest.raises(HTTPException) as exc:
+        require_admin({"username": "api_key_client", "role": "api"})
+    assert exc.value.status_code == 403
@@ -0,0 +1,57 @@
+import dataclasses
+
+from app import schedule_logic
+from app.config_snapshot import get_config_snapshot
+from app.match_cache import MatchCache, ProductMatch, product_match_cache
+from tests.conftest import make_request
+
+
+def test_lru_eviction_and_counters():
+    snapshot = get_config_snapshot()
+    cache = MatchCache(maxsize=2)
+    cache.put(snapshot, ("a", 1, 1, False), ProductMatch(1, ()))
+    cache.put(snapshot, ("b", 1, 1, False), ProductMatch(2, ()))
+    assert cache.get(snapshot, ("a", 1, 1, False)).product_id == 1
+    cache.put(snapshot, ("c", 1, 1, False), ProductMatch(3, ()))
+
+    assert cache.get(snapshot, ("b", 1, 1, False)) is None  # least recently used
+    assert cache.get(snapshot, ("c", 1, 1, False)).product_id == 3
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (2, 1, 1, 2)
+
+
+def test_negative_results_are_cached():
+    snapshot = get_config_snapshot()
+    cache = MatchCache()
+    cache.put(snapshot, ("nothing matches", 1, 1, False), ProductMatch(None, ()))
+    match = cache.get(snapshot, ("nothing matches", 1, 1, False))
+    assert match is not None and match.product_id is None
+
+
+def test_invalidated_when_matching_data_changes():
+    snapshot = get_config_snapshot()
+    cache = MatchCache()
+    cache.put(snapshot, ("a", 1, 1, False), ProductMatch(1, ()))
+
+    # An unrelated file change keeps the cache
+    other_version = dataclasses.replace(snapshot, version=snapshot.version + 1, hub_rules={"rules": []})
+    assert cache.get(other_version, ("a", 1, 1, False)) is not None
+
+    new_keywords = dataclasses.replace(snapshot, version=snapshot.version + 2, product_keywords=list(snapshot.product_keywords))
+    assert cache.get(new_keywords, ("a", 1, 1, False)) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_process_order_skips_matching_on_hit(monkeypatch):
+    snapshot = get_config_snapshot()
+    product_match_cache.clear()
+    first = schedule_logic.process_order(make_request(), snapshot=snapshot)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("matching re-ran on a cache hit")
+    monkeypatch.setattr(schedule_logic, "match_product_id", fail)
+    monkeypatch.setattr(schedule_logic, "match_production_groups", fail)
+    second = schedule_logic.process_order(make_request(), snapshot=snapshot)
+
+    assert second.productId == first.productId
+    assert second.productionGroups == first.productionGroups
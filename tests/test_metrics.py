@@ -0,0 +1,79 @@
+import asyncio
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app import metrics
+from app.metrics import Counter, Histogram, MetricsMiddleware, register_cache
+from app.response_cache import response_cache
+from app.schedule_logic import process_order
+from tests.conftest import make_request
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("t_seconds", "Test.", ["stage"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "a")
+    lines = histogram.render()
+    assert 't_seconds_bucket{stage="a",le="0.1"} 1' in lines
+    assert 't_seconds_bucket{stage="a",le="1.0"} 3' in lines
+    assert 't_seconds_bucket{stage="a",le="+Inf"} 4' in lines
+    assert 't_seconds_count{stage="a"} 4' in lines
+    assert 't_seconds_sum{stage="a"} 6.05' in lines
+
+
+def test_counter_escapes_label_values():
+    counter = Counter("t_total", "Test.", ["path"])
+    counter.inc('a"b')
+    counter.inc('a"b', amount=2)
+    assert counter.render()[-1] == 't_total{path="a\\"b"} 3'
+
+
+def test_process_order_records_stages_and_outcome():
+    scheduled_before = sum(metrics.schedule_orders_total.value(o) for o in ("scheduled", "unscheduled"))
+    setup_before = metrics.schedule_stage_seconds.count("setup")
+    response_cache.clear()
+    process_order(make_request())
+    assert sum(metrics.schedule_orders_total.value(o) for o in ("scheduled", "unscheduled")) == scheduled_before + 1
+    assert metrics.schedule_stage_seconds.count("setup") == setup_before + 1
+    text = metrics.registry.render()
+    assert 'schedule_stage_seconds_bucket{stage="product_match",le="+Inf"}' in text
+    assert "# TYPE schedule_order_seconds histogram" in text
+
+
+def test_cache_gauges_read_at_scrape_time():
+    stats = [3, 1, 2]
+    register_cache("test_cache", lambda: tuple(stats))
+    text = metrics.registry.render()
+    assert 'cache_hits_total{cache="test_cache"} 3' in text
+    assert 'cache_hit_ratio{cache="test_cache"} 0.75' in text
+    stats[:] = [0, 0, 0]
+    assert 'cache_hit_ratio{cache="test_cache"} 0.0' in metrics.registry.render()
+
+
+def test_middleware_labels_by_route_template():
+    async def item(request):
+        return PlainTextResponse("ok")
+
+    app = MetricsMiddleware(Starlette(routes=[Route("/items/{item_id}", item)]))
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    async def call(path):
+        scope = {"type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "root_path": "",
+                 "query_string": b"", "headers": [], "scheme": "http", "server": ("test", 80)}
+        await app(scope, receive, send)
+
+    before = metrics.http_requests_total.value("/items/{item_id}", "GET", "200")
+    other_before = metrics.http_requests_total.value("other", "GET", "404")
+    asyncio.run(call("/items/1"))
+    asyncio.run(call("/items/2"))
+    asyncio.run(call("/missing"))
+    assert metrics.http_requests_total.value("/items/{item_id}", "GET", "200") == before + 2
+    assert metrics.http_requests_total.value("other", "GET", "404") == other_before + 1
@@ -0,0 +1,39 @@
+from app.config_snapshot import get_config_snapshot
+from app.postcode_index import PostcodeIndex
+from app.schedule_logic import lookup_hub_by_postcode
+
+
+def test_index_matches_linear_scan_for_every_postcode():
+    snapshot = get_config_snapshot()
+    index = snapshot.index("postcode_index")
+    assert index.exact
+    for p in range(10000):
+        postcode = f"{p:04d}"
+        assert index.lookup(postcode) == lookup_hub_by_postcode(postcode, snapshot.hub_data), postcode
+
+
+def test_first_listed_hub_wins_and_overlaps_are_flagged():
+    hub_data = [
+        {"hubName": "vic", "hubId": 1, "postcode": "3000, 3001"},
+        {"hubName": "nsw", "hubId": 2, "postcode": "2000-3005,0800"},
+    ]
+    index = PostcodeIndex(hub_data)
+    assert index.lookup("3000") == {"hubName": "vic", "hubId": 1}
+    assert index.lookup("3002") == {"hubName": "nsw", "hubId": 2}
+    assert index.lookup("0800") == {"hubName": "nsw", "hubId": 2}
+    assert index.lookup("9999") is None
+    assert index.overlaps == {("vic", "nsw"): 2}
+
+
+def test_non_canonical_postcodes_use_linear_scan():
+    snapshot = get_config_snapshot()
+    index = snapshot.index("postcode_index")
+    for postcode in ("", "800", " 4800", "48000", "abcd"):
+        assert not index.handles(postcode)
+    assert lookup_hub_by_postcode(" 4800", snapshot.hub_data, snapshot=snapshot) == lookup_hub_by_postcode(" 4800", snapshot.hub_data)
+
+
+def test_malformed_range_disables_index():
+    index = PostcodeIndex([{"hubName": "vic", "hubId": 1, "postcode": "3000-3001-3002"}])
+    assert not index.exact
+    assert not index.handles("3000")
@@ -0,0 +1,67 @@
+import asyncio
+import dataclasses
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app import process_backend
+from app.batch_scheduler import schedule_batch, schedule_items
+from app.config_snapshot import get_config_snapshot
+from app.process_backend import SchedulingPool
+from app.schedule_stream import stream_schedule
+from tests.conftest import make_request
+
+NOW = datetime(2025, 3, 4, 1, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = SchedulingPool(2)
+    yield pool
+    pool.shutdown()
+
+
+def test_batch_in_pool_matches_in_process(pool, monkeypatch):
+    snapshot = get_config_snapshot()
+    orders = [make_request(orderId=str(i), misOrderQTY=100 * (i + 1)).dict() for i in range(7)] + ["junk"]
+    expected = schedule_batch(orders, snapshot=snapshot, now=NOW)
+
+    monkeypatch.setattr(process_backend, "scheduling_pool", pool)
+    monkeypatch.setattr(process_backend, "SCHEDULE_PROCESS_CHUNK_ITEMS", 3)
+    with pool.lease(snapshot) as lease:
+        chunks = list(lease.map_chunks(schedule_items, orders, NOW, chunk_items=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 2]
+    assert schedule_batch(orders, snapshot=snapshot, now=NOW) == expected
+
+
+def test_stream_in_pool_keeps_input_order(pool, monkeypatch):
+    snapshot = get_config_snapshot()
+    monkeypatch.setattr(process_backend, "scheduling_pool", pool)
+    body = b"".join(json.dumps(make_request(orderId=str(i)).dict()).encode() + b"\n" for i in range(150))
+
+    async def run():
+        async def chunks():
+            for start in range(0, len(body), 4000):
+                yield body[start:start + 4000]
+        return b"".join([chunk async for chunk in stream_schedule(chunks(), snapshot, NOW)])
+
+    results = [json.loads(line) for line in asyncio.run(run()).splitlines()]
+    assert [r["orderId"] for r in results] == [str(i) for i in range(150)]
+    assert [r["index"] for r in results] == list(range(150))
+
+
+def test_pool_recycles_on_newer_config(pool):
+    snapshot = get_config_snapshot()
+    newer = dataclasses.replace(snapshot, version=snapshot.version + 1)
+    with pool.lease(snapshot) as old_lease:
+        with pool.lease(newer) as new_lease:
+            assert new_lease.executor is not old_lease.executor
+            # The retired pool keeps serving requests that still hold it
+            assert old_lease.submit(schedule_items, [], 0, NOW).result() == []
+        with pool.lease(snapshot) as stale:
+            assert stale is None
+    # Once its last lease is released the retired pool is shut down
+    assert (old_lease.version, new_lease.version) == (snapshot.version, newer.version)
+    with pytest.raises(RuntimeError):
+        old_lease.submit(schedule_items, [], 0, NOW)
@@ -0,0 +1,73 @@
+from app.config_snapshot import get_config_snapshot
+from app.product_catalog import FALLBACK_PRODUCT, ProductCatalog, get_product_catalog
+from app.product_matcher import match_product_id
+
+
+PRODUCT_INFO = {
+    "6": {
+        "Product_ID": 6, "Product_Group": "Flyers", "Product_Category": "Offset Flyers",
+        "Production_Hub": ["VIC", "nsw"], "Cutoff": "13", "Days_to_produce": "2",
+        "Start_days": ["Monday", "Wednesday"], "printTypes": [1, 2], "scheduleAppliesTo": [1],
+        "Modified_run_date": [],
+    },
+    "7": {
+        "Product_ID": 7, "Product_Group": "Cards", "Product_Category": "Cards",
+        "Production_Hub": ["qld"], "Cutoff": "noon", "printTypes": [1], "scheduleAppliesTo": [],
+    },
+    "bogus": {"Product_ID": 0},
+}
+
+
+def test_records_are_parsed_once():
+    catalog = ProductCatalog(PRODUCT_INFO)
+    record = catalog.get(6)
+    assert record.cutoff == 13
+    assert record.days_to_produce == 2
+    assert record.production_hubs == ("VIC", "nsw")
+    assert record.production_hubs_lower == ("vic", "nsw")
+    assert record.start_days == ("Monday", "Wednesday")
+    assert record.supports_print_type(2) and not record.supports_print_type(3)
+    assert record.applies_to_hub(1) and not record.applies_to_hub(2)
+
+
+def test_lookup_accepts_int_and_string_ids():
+    catalog = ProductCatalog(PRODUCT_INFO)
+    assert catalog.get(6) is catalog.get("6")
+    assert catalog.get(99) is None
+    assert "bogus" not in catalog
+    assert len(catalog) == 2
+
+
+def test_defaults_and_invalid_values():
+    catalog = ProductCatalog(PRODUCT_INFO)
+    record = catalog.get(7)
+    assert record.cutoff is None
+    assert record.days_to_produce == 1
+    assert record.start_days == ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")
+    # No scheduleAppliesTo restriction means every hub
+    assert record.applies_to_hub(24)
+
+
+def test_fallback_product():
+    assert FALLBACK_PRODUCT.product_id == 99
+    assert FALLBACK_PRODUCT.cutoff == 12
+    assert FALLBACK_PRODUCT.days_to_produce == 3
+
+
+def test_catalog_is_snapshot_index():
+    snapshot = get_config_snapshot()
+    catalog = get_product_catalog(snapshot)
+    assert catalog is get_product_catalog(snapshot)
+    assert len(catalog) == len(snapshot.product_info)
+
+
+def test_matcher_uses_catalog_print_types():
+    snapshot = get_config_snapshot()
+    keywords = [
+        {"Product_ID": 6, "Match_All": ["flyer"], "Exclude_All": [], "Match_Any": []},
+    ]
+    record = get_product_catalog(snapshot).get(6)
+    supported = next(iter(record.print_types))
+    hub_id = next(iter(record.schedule_applies_to), 1)
+    assert match_product_id("A5 Flyer", keywords, supported, hub_id, snapshot=snapshot) == 6
+    assert match_product_id("A5 Flyer", keywords, -1, hub_id, snapshot=snapshot) is None
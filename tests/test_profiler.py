@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.main import run_profile
+from app.profiler import ProfilerBusy, SamplingProfiler, begin_profile, end_profile
+from app.schedule_logic import process_order
+from tests.conftest import make_request
+
+
+@pytest.fixture
+def busy_worker():
+    stop = threading.Event()
+
+    def work():
+        req = make_request()
+        while not stop.is_set():
+            process_order(req)
+
+    thread = threading.Thread(target=work, daemon=True)
+    thread.start()
+    yield
+    stop.set()
+    thread.join()
+
+
+def test_app_scope_keeps_only_application_frames(busy_worker):
+    profiler = SamplingProfiler(interval=0.002)
+    for _ in range(50):
+        profiler.sample()
+    stacks = list(profiler.samples)
+    assert stacks and all(label.startswith("app.") for stack in stacks for label in stack)
+    assert any(stack[0] == "app.schedule_logic.process_order" for stack in stacks)
+
+
+def test_collapsed_and_function_output():
+    profiler = SamplingProfiler()
+    profiler.samples.update({("app.a.outer", "app.b.inner"): 3, ("app.a.outer",): 1})
+    assert profiler.collapsed() == "app.a.outer;app.b.inner 3\napp.a.outer 1\n"
+    lines = profiler.by_function().splitlines()
+    assert lines[1].split() == ["1", "4", "app.a.outer"]
+    assert lines[2].split() == ["3", "3", "app.b.inner"]
+
+
+def test_one_profile_at_a_time():
+    profiler = begin_profile(0.01)
+    try:
+        with pytest.raises(ProfilerBusy):
+            begin_profile(0.01)
+    finally:
+        end_profile(profiler)
+    end_profile(begin_profile(0.01))
+
+
+def test_endpoint_returns_collapsed_stacks(busy_worker):
+    response = asyncio.run(run_profile(seconds=0.3, interval_ms=2, scope="app", output="collapsed",
+                                       user={"username": "admin", "role": "admin"}))
+    assert int(response.headers["X-Profile-Samples"]) > 0
+    lines = response.body.decode().splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("app.schedule_logic.process_order" in line for line in lines)
+
+
+def test_label_without_co_qualname():
+    # Code objects on Python < 3.11 have no co_qualname
+    class Code:
+        co_name = "handler"
+
+    code = Code()
+    frame = SimpleNamespace(f_code=code, f_globals={"__name__": "app.main"}, f_back=None)
+    assert SamplingProfiler()._stack(frame) == ("app.main.handler",)
+
+
+def test_endpoint_reports_sampler_failure(monkeypatch):
+    def broken(self):
+        raise AttributeError("boom")
+
+    monkeypatch.setattr(SamplingProfiler, "sample", broken)
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(run_profile(seconds=0.05, interval_ms=2, scope="app", output="collapsed",
+                                user={"username": "admin", "role": "admin"}))
+    assert excinfo.value.status_code == 500
+    end_profile(begin_profile(0.01))  # The lock was released
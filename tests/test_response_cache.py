@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytz
+
+from app import data_manager, schedule_logic
+from app.config_snapshot import get_config_snapshot
+from app.response_cache import ResponseCache, request_fingerprint, response_cache
+from app.schedule_logic import process_order
+from tests.conftest import make_request
+
+MELBOURNE = pytz.timezone("Australia/Melbourne")
+
+
+def local(hour: int, day: int = 4) -> datetime:
+    """A Tuesday (2025-03-04) in Melbourne at `hour`, as UTC."""
+    return MELBOURNE.localize(datetime(2025, 3, day, hour, 30)).astimezone(timezone.utc)
+
+
+@pytest.fixture
+def cutoff():
+    response_cache.clear()
+    response = process_order(make_request(), now=local(9))
+    response_cache.clear()
+    assert response.chosenProductionHub == "vic"
+    return int(response.productCutoff)
+
+
+@pytest.fixture
+def no_pipeline(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("pipeline ran")
+
+    return lambda: monkeypatch.setattr(schedule_logic, "_process_order", fail)
+
+
+def test_repeat_is_served_from_cache_with_real_time_and_order_id(cutoff, no_pipeline):
+    first = process_order(make_request(orderId="a"), now=local(cutoff - 2))
+    no_pipeline()
+    later = local(cutoff - 2) + timedelta(minutes=20)
+    second = process_order(make_request(orderId="b"), now=later)
+    assert second.orderId == "b"
+    assert second.actualProcessingTime == later.astimezone(MELBOURNE).strftime('%A, %Y-%m-%d %H:%M:%S %Z (%z)')
+    assert second.actualProcessingTime != first.actualProcessingTime
+    assert second.dict(exclude={"orderId", "actualProcessingTime"}) == first.dict(exclude={"orderId", "actualProcessingTime"})
+
+
+def test_cutoff_and_midnight_boundaries_expire_entries(cutoff):
+    expirations = response_cache.stats()["expirations"]
+    before = process_order(make_request(), now=local(cutoff - 1))
+    after = process_order(make_request(), now=local(cutoff + 1))
+    next_day = process_order(make_request(), now=local(cutoff - 1, day=5))
+    assert before.cutoffStatus != after.cutoffStatus
+    assert next_day.startDate != before.startDate
+    assert response_cache.stats()["expirations"] == expirations + 2
+    # Each result matches a fresh computation for its own instant
+    response_cache.clear()
+    assert process_order(make_request(), now=local(cutoff + 1)).dict() == after.dict()
+
+
+def test_fingerprint_covers_inputs_but_not_order_id():
+    base = request_fingerprint(make_request(orderId="x"))
+    assert base == request_fingerprint(make_request(orderId="y"))
+    assert base != request_fingerprint(make_request(timeOffsetHours=3))
+    assert base != request_fingerprint(make_request(orderPrice=10.0))
+
+
+def test_time_offset_is_applied_to_cached_response(cutoff, no_pipeline):
+    first = process_order(make_request(timeOffsetHours=2), now=local(cutoff - 4))
+    no_pipeline()
+    second = process_order(make_request(timeOffsetHours=2), now=local(cutoff - 4) + timedelta(minutes=1))
+    assert first.simulatedProcessingTime is not None
+    assert second.simulatedProcessingTime != first.simulatedProcessingTime
+    assert second.startDate == first.startDate
+
+
+def test_config_change_flushes_cache():
+    cache = ResponseCache(maxsize=10)
+    snapshot = get_config_snapshot()
+    req = make_request()
+    result = process_order(req, snapshot=snapshot, now=local(9))
+    cache.put(snapshot, request_fingerprint(make_request()), local(9), 0, result)
+    assert cache.get(snapshot, request_fingerprint(make_request()), make_request(), local(9)) is not None
+
+    data_manager.invalidate_config_cache("hub_rules.json")
+    newer = get_config_snapshot()
+    assert cache.get(newer, request_fingerprint(make_request()), make_request(), local(9)) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_older_snapshot_bypasses_cache_without_flushing():
+    cache = ResponseCache(maxsize=10)
+    older = get_config_snapshot()
+    data_manager.invalidate_config_cache("hub_rules.json")
+    newer = get_config_snapshot()
+    key = request_fingerprint(make_request())
+    cache.put(newer, key, local(9), 0, process_order(make_request(), snapshot=newer, now=local(9)))
+
+    # A batch still pinned to the older snapshot neither reads, writes nor flushes the cache
+    assert cache.get(older, key, make_request(), local(9)) is None
+    cache.put(older, key, local(9), 0, process_order(make_request(), snapshot=older, now=local(9)))
+    assert cache.stats()["size"] == 1
+    hit = cache.get(newer, key, make_request(), local(9))
+    assert hit is not None and cache.get(newer, key, make_request(), local(9)) is not None
+
+
+def test_hits_do_not_share_lists_with_the_cached_entry():
+    cache = ResponseCache(maxsize=10)
+    snapshot = get_config_snapshot()
+    key = request_fingerprint(make_request())
+    cache.put(snapshot, key, local(9), 0, process_order(make_request(), snapshot=snapshot, now=local(9)))
+    first = cache.get(snapshot, key, make_request(), local(9))
+    first.productionHubs.append("mutated")
+    first.productStartDays.clear()
+    second = cache.get(snapshot, key, make_request(), local(9))
+    assert "mutated" not in second.productionHubs and second.productStartDays
+
+
+def test_lru_bound():
+    cache = ResponseCache(maxsize=2)
+    snapshot = get_config_snapshot()
+    for qty in (100, 200, 300):
+        req = make_request(misOrderQTY=qty)
+        key = request_fingerprint(req)
+        cache.put(snapshot, key, local(9), 0, process_order(req, snapshot=snapshot, now=local(9)))
+    stats = cache.stats()
+    assert stats["size"] == 2 and stats["evictions"] == 1
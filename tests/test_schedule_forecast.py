@@ -0,0 +1,49 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from app.config_snapshot import get_config_snapshot
+from app.main import app
+from app.models import ScheduleRequest
+from app.response_cache import response_cache
+from app.schedule_forecast import SCHEDULE_FORECAST_MAX_HOURS, forecast_order
+from app.schedule_logic import process_order
+from benchmarks.orders import generate_orders
+from tests.conftest import make_request, post
+
+
+def interval_at(intervals, instant):
+    for interval in intervals:
+        if datetime.fromisoformat(interval["placedFrom"]) <= instant < datetime.fromisoformat(interval["placedTo"]):
+            return interval
+    raise AssertionError(f"{instant} not covered")
+
+
+def test_forecast_matches_schedule_at_every_hour():
+    response_cache.clear()
+    snapshot = get_config_snapshot()
+    now = datetime.now(timezone.utc).replace(minute=20, second=0, microsecond=0)
+    for order in generate_orders(25, seed=3) + [json.loads(make_request(timeOffsetHours=5).json())]:
+        forecast = forecast_order(ScheduleRequest.parse_obj(order), 96, snapshot=snapshot, now=now)
+        intervals = forecast["intervals"]
+        start = now + timedelta(hours=order.get("timeOffsetHours") or 0)
+        assert datetime.fromisoformat(intervals[0]["placedFrom"]) == start
+        assert datetime.fromisoformat(intervals[-1]["placedTo"]) == start + timedelta(hours=96)
+        for a, b in zip(intervals, intervals[1:]):
+            assert a["placedTo"] == b["placedFrom"]
+            assert (a["adjustedStartDate"], a["dispatchDate"]) != (b["adjustedStartDate"], b["dispatchDate"])
+        # Hour boundaries fall 40 minutes into each offset, so check both sides of every one
+        for hours in range(96):
+            for minutes in (0, 40):
+                req = ScheduleRequest.parse_obj(dict(order, timeOffsetHours=(order.get("timeOffsetHours") or 0) + hours))
+                expected = process_order(req, snapshot=snapshot, now=now + timedelta(minutes=minutes))
+                interval = interval_at(intervals, start + timedelta(hours=hours, minutes=minutes))
+                assert (interval["adjustedStartDate"], interval["dispatchDate"]) == \
+                    (expected.adjustedStartDate, expected.dispatchDate), (order, hours, minutes)
+
+
+def test_forecast_endpoint():
+    order = json.loads(make_request(orderId="forecast").json())
+    assert post(app, "/schedule/forecast", {"order": order, "horizonHours": 336})["status"] == 200
+    too_long = {"order": order, "horizonHours": SCHEDULE_FORECAST_MAX_HOURS + 1}
+    assert post(app, "/schedule/forecast", too_long)["status"] == 400
+    assert post(app, "/schedule/forecast", {"order": order, "horizonHours": 0})["status"] == 422
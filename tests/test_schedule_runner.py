@@ -0,0 +1,34 @@
+import asyncio
+from datetime import datetime, timezone
+
+from app import data_manager, schedule_runner
+from app.config_snapshot import get_config_snapshot, peek_config_snapshot
+from tests.conftest import make_request
+
+
+def test_modes_produce_identical_results():
+    now = datetime(2025, 3, 4, 1, 30, tzinfo=timezone.utc)
+    req = make_request(orderId="modes")
+    get_config_snapshot()
+    on_loop = asyncio.run(schedule_runner.run_process_order(req, now=now, mode="async"))
+    threaded = asyncio.run(schedule_runner.run_process_order(req, now=now, mode="threadpool"))
+    assert on_loop == threaded
+
+
+def test_async_mode_stays_on_the_loop_while_config_is_fresh(monkeypatch):
+    snapshot = get_config_snapshot()
+    monkeypatch.setattr(data_manager, "_last_version_check", float("inf"))
+
+    async def no_threadpool(*args, **kwargs):
+        raise AssertionError("threadpool used")
+
+    monkeypatch.setattr(schedule_runner, "run_in_threadpool", no_threadpool)
+    assert peek_config_snapshot() is snapshot
+    assert asyncio.run(schedule_runner.run_process_order(make_request(orderId="loop"))).orderId == "loop"
+
+
+def test_due_disk_check_is_offloaded(monkeypatch):
+    get_config_snapshot()
+    monkeypatch.setattr(data_manager, "_last_version_check", 0.0)
+    assert peek_config_snapshot() is None
+    assert asyncio.run(schedule_runner.get_config_snapshot_async()) is get_config_snapshot()
@@ -0,0 +1,83 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+from starlette.requests import Request
+
+from app.config_snapshot import get_config_snapshot
+from app.schedule_stream import NDJSONLineReader, NDJSONStreamingResponse, stream_schedule
+from tests.conftest import make_request
+
+
+def ndjson(*orders) -> bytes:
+    return b"".join(json.dumps(order).encode() + b"\n" for order in orders)
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def collect(body, snapshot, now=None):
+    async def run():
+        return [chunk async for chunk in stream_schedule(body, snapshot, now)]
+    output = b"".join(asyncio.run(run()))
+    return [json.loads(line) for line in output.splitlines()]
+
+
+def test_line_reader_reassembles_split_lines_and_drops_oversized():
+    reader = NDJSONLineReader(max_line_bytes=8)
+    lines = []
+    for chunk in (b'{"a"', b':1}\n\n0123456', b"789abc\n", b"tail"):
+        lines.extend(reader.feed(chunk))
+    lines.extend(reader.close())
+    assert lines == [b'{"a":1}', b"", None, b"tail"]
+
+
+def test_stream_results_match_batch_items_in_order():
+    snapshot = get_config_snapshot()
+    now = datetime(2025, 3, 4, 1, 30, tzinfo=timezone.utc)
+    orders = [make_request(orderId=str(i)).dict() for i in range(5)]
+    # Tiny chunks split every order across several reads
+    results = collect(chunked(ndjson(*orders), 7), snapshot, now)
+
+    assert [r["index"] for r in results] == list(range(5))
+    assert [r["orderId"] for r in results] == [str(i) for i in range(5)]
+    assert all(r["error"] is None for r in results)
+    assert len({r["result"]["actualProcessingTime"] for r in results}) == 1
+
+
+def test_stream_reports_bad_lines_in_place():
+    snapshot = get_config_snapshot()
+    body = ndjson(make_request(orderId="ok").dict()) + b"\n{not json\n" + ndjson({"orderId": "bad"})
+    ok, garbage, bad = collect(chunked(body, 4096), snapshot)
+
+    assert ok["error"] is None and ok["result"]["orderId"] == "ok"
+    assert garbage["index"] == 1 and garbage["error"].startswith("Invalid JSON")
+    assert bad["orderId"] == "bad" and bad["error"].startswith("Invalid order")
+
+
+def test_response_reads_body_while_streaming():
+    snapshot = get_config_snapshot()
+    body = ndjson(*(make_request(orderId=str(i)).dict() for i in range(3)))
+    messages = [{"type": "http.request", "body": body[:50], "more_body": True},
+                {"type": "http.request", "body": body[50:], "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        scope = {"type": "http", "method": "POST", "path": "/schedule/stream", "headers": []}
+        request = Request(scope, receive)
+        response = NDJSONStreamingResponse(stream_schedule(request.stream(), snapshot))
+        await response(scope, receive, send)
+
+    asyncio.run(run())
+    assert sent[0]["type"] == "http.response.start"
+    assert (b"content-type", b"application/x-ndjson") in sent[0]["headers"]
+    lines = b"".join(m.get("body", b"") for m in sent[1:]).splitlines()
+    assert [json.loads(line)["orderId"] for line in lines] == ["0", "1", "2"]
@@ -0,0 +1,64 @@
+import asyncio
+import math
+
+import pytest
+from fastapi.routing import serialize_response
+from starlette.responses import JSONResponse
+
+import app.serialization as serialization
+from app.main import FastJSONResponse, app
+from app.models import ScheduleRequest, ScheduleResponse
+from app.response_cache import response_cache
+from app.schedule_logic import process_order
+from app.serialization import build_schedule_response, dumps, response_content
+from benchmarks.orders import generate_orders
+
+ENCODERS = ["json"] + (["orjson"] if serialization.orjson is not None else [])
+
+
+def fastapi_body(response: ScheduleResponse) -> bytes:
+    """What /schedule sent when it returned the model: response_model validation, then JSONResponse."""
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/schedule")
+    content = asyncio.run(serialize_response(field=route.secure_cloned_response_field,
+                                             response_content=ScheduleResponse(**response.dict()), is_coroutine=True))
+    return JSONResponse(content).body
+
+
+@pytest.mark.parametrize("encoder", ENCODERS)
+def test_schedule_bodies_match_fastapi(monkeypatch, encoder):
+    monkeypatch.setattr(serialization, "JSON_ENCODER", encoder)
+    response_cache.clear()
+    prices = [None, 12.5, 3, 1e-7, 2.5e17]
+    for index, order in enumerate(generate_orders(200, seed=9)):
+        order = dict(order, orderPrice=prices[index % len(prices)], timeOffsetHours=index % 30,
+                     description=order["description"] + (" «Ünïcode»  " if index % 7 == 0 else ""))
+        response = process_order(ScheduleRequest.parse_obj(order))
+        assert FastJSONResponse(response_content(response)).body == fastapi_body(response), order
+
+
+def test_exact_values_skip_validation_and_others_are_validated():
+    response = process_order(ScheduleRequest.parse_obj(generate_orders(1, seed=4)[0]))
+    values = dict(reversed(list(response.__dict__.items())))
+    built = build_schedule_response(values)
+    assert list(built.__dict__) == list(ScheduleResponse.__fields__)  # wire order, not argument order
+    assert built == response and built.__fields_set__ == response.__fields_set__
+
+    # Values pydantic would convert are converted, as before
+    coerced = build_schedule_response(dict(values, hubTransferTo="3", preflightedWidth=210, enableAutoHubTransfer=True))
+    assert (coerced.hubTransferTo, coerced.enableAutoHubTransfer) == (3, 1)
+    assert type(coerced.preflightedWidth) is float
+    with pytest.raises(ValueError):
+        build_schedule_response(dict(values, currentHub=None))
+    with pytest.raises(ValueError):
+        build_schedule_response({k: v for k, v in values.items() if k != "productId"})
+
+
+@pytest.mark.parametrize("encoder", ENCODERS)
+def test_dumps_matches_json_response(monkeypatch, encoder):
+    monkeypatch.setattr(serialization, "JSON_ENCODER", encoder)
+    render = JSONResponse(None).render
+    for content in [1e16, 1e-5, 0.0001, -0.0, 2 ** 64, {1: "a"}, [1.5, {"x": (1, None, True)}], "é \x00"]:
+        assert dumps(content) == render(content), content
+    for content in [math.nan, {"x": [math.inf]}]:
+        with pytest.raises(ValueError):
+            dumps(content)
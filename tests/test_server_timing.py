@@ -0,0 +1,49 @@
+import json
+
+from app.config_snapshot import get_config_snapshot
+from app.main import app
+from app.response_cache import response_cache
+from app.server_timing import RequestTimings, ServerTimingMiddleware
+from tests.conftest import make_request, post
+
+
+def timing_names(header: bytes) -> list:
+    return [entry.split(";")[0] for entry in header.decode().split(", ")]
+
+
+def test_header_lists_phases_in_order_and_sums_repeats():
+    timings = RequestTimings()
+    timings.mark("auth")
+    timings.add_laps([("setup", 0.001), ("dates", 0.002), ("setup", 0.001)])
+    header = timings.header()
+    assert timing_names(header.encode()) == ["auth", "setup", "dates", "total"]
+    assert "setup;dur=2.000" in header and "dates;dur=2.000" in header
+
+
+def test_schedule_reports_request_phases_and_process_order_stages():
+    order = json.loads(make_request(orderId="timing").json())
+    response_cache.clear()
+    response = post(ServerTimingMiddleware(app, enabled=True), "/schedule", order)
+    assert response["status"] == 200
+    names = timing_names(response["headers"][b"server-timing"])
+    assert names[:4] == ["request", "auth", "validate", "config"]
+    assert {"product_match", "hub_selection", "cutoff", "response"} <= set(names)
+    assert names[-2:] == ["serialize", "total"]
+    assert response["headers"][b"x-config-version"] == str(get_config_snapshot().version).encode()
+
+
+def test_batch_sums_stages_over_orders():
+    order = json.loads(make_request().json())
+    response_cache.clear()
+    response = post(ServerTimingMiddleware(app, enabled=True), "/schedule/batch", [order, order])
+    assert response["status"] == 200
+    names = timing_names(response["headers"][b"server-timing"])
+    assert names.count("product_match") == 1 and "validate" in names
+    assert b"x-config-version" in response["headers"]
+
+
+def test_off_by_default_and_outside_listed_paths():
+    order = json.loads(make_request().json())
+    assert b"server-timing" not in post(app, "/schedule", order)["headers"]
+    wrapped = ServerTimingMiddleware(app, paths=["/schedule/batch"], enabled=True)
+    assert b"server-timing" not in post(wrapped, "/schedule", order)["headers"]